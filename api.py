@@ -0,0 +1,257 @@
+"""
+HTTP JSON API for resume analysis, separate from the Streamlit UI
+
+A dependency-free ASGI application. Serve it with any ASGI server, e.g.:
+
+    pip install uvicorn
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+Endpoints:
+
+    GET  /health          liveness check
+    GET  /metrics         request latency per route, plus analysis stage histograms from
+                          the workers when RESUMEFIT_INSTRUMENTATION=1 (Prometheus text format)
+    POST /analyze         {"resume_text": str, "job_description": str, "include_timings": bool}
+    POST /rank            {"job_description": str, "resumes": [str or {"id": ..., "text": str}],
+                           "top_k": int, "include_timings": bool}
+    POST /extract/pdf     raw file body; also /extract/docx and /extract/txt
+                          -> {"text": str, "characters": int, "page_count": int, "problems": [str],
+                              "timings": {...}, ...} (see ExtractionResult.to_dict)
+
+Analysis runs on a pool of worker processes (RESUMEFIT_API_WORKERS,
+default: all CPUs) and extraction on a pool of resource-limited sandbox
+workers (RESUMEFIT_SANDBOX_*), so the event loop only parses requests and
+awaits results; documents the sandbox cuts off are answered with 422.
+Concurrent /analyze requests for the same job description are
+micro-batched over RESUMEFIT_BATCH_WINDOW_MS (default 5).
+Results are cached by content in RESUMEFIT_CACHE_PATH, shared by all workers.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+
+from utils.analysis_result import rank_results
+from utils.batching import MicroBatcher
+from utils.documents import extract_document
+from utils.instrumentation import METRICS
+from utils.parallel import ParallelAnalyzer
+from utils.sandbox import SandboxError, SandboxPool
+
+MAX_BODY_BYTES = int(os.environ.get("RESUMEFIT_API_MAX_BODY_BYTES", 10 * 1024 * 1024))
+
+# /analyze requests for the same job description arriving within this many
+# milliseconds are scored as one batch; 0 scores each request on its own
+BATCH_WINDOW_MS = float(os.environ.get("RESUMEFIT_BATCH_WINDOW_MS", "5"))
+
+EXTRACT_KINDS = ('pdf', 'docx', 'txt')
+
+
+class HttpError(Exception):
+    """Error answered with a JSON body and the given status code"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _require_text(payload, field):
+    value = payload.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise HttpError(422, f"'{field}' must be a non-empty string")
+    return value
+
+
+class ResumeFitApi:
+    """ASGI application serving analysis and extraction from a worker pool"""
+
+    def __init__(self, workers=None, batch_window_ms=BATCH_WINDOW_MS):
+        self.workers = workers or int(os.environ.get("RESUMEFIT_API_WORKERS", "0")) or None
+        self._analyzer = None
+        self._sandbox = None
+        self.batcher = None
+        if batch_window_ms > 0:
+            self.batcher = MicroBatcher(self._run_batch, window_seconds=batch_window_ms / 1000)
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics,
+            ('POST', '/analyze'): self.analyze,
+            ('POST', '/rank'): self.rank,
+        }
+
+    @property
+    def analyzer(self):
+        """Worker pool, started on first use if the server skipped the lifespan startup"""
+        if self._analyzer is None:
+            # Workers start from an executor thread; forking a threaded server is unsafe
+            self._analyzer = ParallelAnalyzer(
+                workers=self.workers, mp_context=multiprocessing.get_context("spawn"), result_cache=True
+            )
+        return self._analyzer
+
+    @property
+    def sandbox(self):
+        """Extraction worker pool, started on first use"""
+        if self._sandbox is None:
+            self._sandbox = SandboxPool.from_env()
+        return self._sandbox
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        start = time.perf_counter()
+        method, path = scope['method'], scope['path']
+        # Unknown paths share one histogram so clients cannot grow the label set
+        route = 'unmatched'
+        try:
+            if path.startswith('/extract/'):
+                handler = self._extract_handler(method, path[len('/extract/'):])
+                route = '/extract'
+            else:
+                handler = self.routes.get((method, path))
+                if handler is None:
+                    allowed = any(route_path == path for _, route_path in self.routes)
+                    raise HttpError(405 if allowed else 404, "Method not allowed" if allowed else "Not found")
+                route = path
+            body = await self._read_body(receive)
+            status, payload = 200, await handler(body)
+        except HttpError as e:
+            status, payload = e.status, {'error': e.message}
+        except Exception as e:
+            print(f"API error on {method} {path}: {e}")
+            status, payload = 500, {'error': "Internal server error"}
+
+        await self._respond(send, status, payload)
+        METRICS.observe_request(route, time.perf_counter() - start)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await asyncio.get_running_loop().run_in_executor(None, self.analyzer.warm_up)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.batcher is not None:
+                    await self.batcher.flush()
+                if self._analyzer is not None:
+                    await asyncio.get_running_loop().run_in_executor(None, self._analyzer.close)
+                    self._analyzer = None
+                if self._sandbox is not None:
+                    await asyncio.get_running_loop().run_in_executor(None, self._sandbox.close)
+                    self._sandbox = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _read_body(self, receive):
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise HttpError(400, "Client disconnected")
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise HttpError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    async def _respond(self, send, status, payload):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), b'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body, content_type = json.dumps(payload).encode('utf-8'), b'application/json'
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    def _json(body):
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError as e:
+            raise HttpError(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Request body must be a JSON object")
+        return payload
+
+    async def health(self, body):
+        return {'status': 'ok'}
+
+    async def metrics(self, body):
+        return METRICS.render_prometheus()
+
+    async def _run_batch(self, job_description, resumes, include_timings):
+        """Score resumes on the worker pool, chunked across workers, in input order"""
+        futures = self.analyzer.submit_batch(job_description, resumes, include_timings=include_timings)
+        return [result for chunk in await asyncio.gather(*map(asyncio.wrap_future, futures)) for result in chunk]
+
+    async def analyze(self, body):
+        payload = self._json(body)
+        resume_text = _require_text(payload, 'resume_text')
+        job_description = _require_text(payload, 'job_description')
+        include_timings = bool(payload.get('include_timings'))
+        if self.batcher is not None:
+            result = await self.batcher.analyze(resume_text, job_description, include_timings=include_timings)
+        else:
+            result = (await self._run_batch(job_description, [resume_text], include_timings))[0]
+        return result.to_dict()
+
+    async def rank(self, body):
+        payload = self._json(body)
+        job_description = _require_text(payload, 'job_description')
+        resumes = payload.get('resumes')
+        if not isinstance(resumes, list) or not resumes:
+            raise HttpError(422, "'resumes' must be a non-empty list")
+        top_k = payload.get('top_k')
+        # bool is an int subclass; reject JSON true/false explicitly
+        if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1):
+            raise HttpError(422, "'top_k' must be a positive integer")
+
+        ids, texts = [], []
+        for index, resume in enumerate(resumes):
+            if isinstance(resume, dict):
+                ids.append(resume.get('id', index))
+                resume = resume.get('text')
+            else:
+                ids.append(index)
+            if not isinstance(resume, str):
+                raise HttpError(422, f"Resume {index} must be a string or an object with a 'text' string")
+            texts.append(resume)
+
+        results = await self._run_batch(job_description, texts, bool(payload.get('include_timings')))
+        ranked = rank_results(results)[:top_k]
+
+        return {'results': [
+            {'id': ids[result['index']], 'index': result['index'], 'rank': result['rank'], **result.to_dict()}
+            for result in ranked
+        ]}
+
+    def _extract_handler(self, method, kind):
+        if kind not in EXTRACT_KINDS:
+            raise HttpError(404, f"Unsupported document type '{kind}', expected one of {', '.join(EXTRACT_KINDS)}")
+        if method != 'POST':
+            raise HttpError(405, "Method not allowed")
+
+        async def extract(body):
+            if not body:
+                raise HttpError(422, "Request body must contain the document")
+            try:
+                result = await asyncio.wrap_future(self.sandbox.submit(extract_document, body, f"upload.{kind}"))
+            except SandboxError as e:
+                raise HttpError(422, f"Document could not be extracted: {e}")
+            # An unreadable document is still a 200 with empty text and its error
+            return {'text': result.text, **result.to_dict()}
+        return extract
+
+
+app = ResumeFitApi()
@@ -1,20 +1,41 @@
 import streamlit as st
-import tempfile
-import os
-from io import StringIO
-from utils.pdf_extractor import extract_text_from_pdf
-from utils.docx_extractor import extract_text_from_docx
+from utils.extraction_cache import EXTRACTION_NAMESPACE, extract_with_cache
+from utils.ingest import ingest_source
+from utils.result_cache import TwoTierCache
+from utils.sandbox import SandboxPool
 from utils.text_processor import preprocess_text
 from utils.resume_analyzer import ResumeAnalyzer
 from utils.database import init_database, save_analysis, get_user_history, update_user_session, get_analytics_data
 from utils.openai_service import get_openai_service
+from utils.profiling import profile_request
 import uuid
 
 # Caching heavy resources
 @st.cache_resource(show_spinner=False)
 def get_analyzer():
     """Return a cached ResumeAnalyzer instance"""
-    return ResumeAnalyzer()
+    return ResumeAnalyzer(result_cache=True)
+
+@st.cache_resource(show_spinner=False)
+def get_extraction_cache():
+    """Return the cache of extracted upload text, shared across reruns and sessions"""
+    return TwoTierCache.from_env(namespace=EXTRACTION_NAMESPACE)
+
+def describe_extraction(extraction):
+    """One-line summary of an extraction for display under the upload"""
+    pages = extraction['page_count']
+    parts = [f"{pages} page{'s' if pages != 1 else ''}"] if pages is not None else []
+    parts.append(f"extracted in {extraction['extraction_seconds'] * 1000:.0f} ms")
+    if extraction['cached']:
+        parts.append("reused from cache")
+        # Fresh extractions report their problems as they happen
+        parts.extend(f"⚠️ {problem}" for problem in extraction['problems'])
+    return " · ".join(parts)
+
+@st.cache_resource(show_spinner=False)
+def get_sandbox():
+    """Return the resource-limited worker pool that parses uploads outside the server process"""
+    return SandboxPool.from_env()
 
 @st.cache_resource(show_spinner=False)
 def get_openai():
@@ -368,6 +389,8 @@ if 'job_description' not in st.session_state:
     st.session_state.job_description = ""
 if 'analysis_results' not in st.session_state:
     st.session_state.analysis_results = None
+if 'bulk_results' not in st.session_state:
+    st.session_state.bulk_results = None
 if 'user_session_id' not in st.session_state:
     st.session_state.user_session_id = str(uuid.uuid4())
 
@@ -424,8 +447,11 @@ def main():
         )
 
         if uploaded_file is not None:
+            # Read the upload once; extraction parses these bytes in memory
+            file_bytes = uploaded_file.getvalue()
+
             # Check file size (5MB limit)
-            file_size = len(uploaded_file.getvalue())
+            file_size = len(file_bytes)
             max_size = 5 * 1024 * 1024  # 5MB in bytes
 
             if file_size > max_size:
@@ -434,20 +460,17 @@ def main():
             uploaded_filename = uploaded_file.name
             try:
                 if uploaded_file.type == "application/pdf":
-                    # Save uploaded file temporarily
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        tmp_file_path = tmp_file.name
-
-                    # Extract text from PDF
-                    resume_text = extract_text_from_pdf(tmp_file_path)
-
-                    # Clean up temporary file
-                    os.unlink(tmp_file_path)
+                    # Extract text from PDF, reusing the cached text of identical uploads
+                    # Sampled profiling captures run inside the sandbox worker
+                    extraction = extract_with_cache(
+                        file_bytes, uploaded_filename, get_extraction_cache(), sandbox=get_sandbox()
+                    )
+                    resume_text = extraction['text']
 
                     if resume_text.strip():
                         st.session_state.resume_text = resume_text
                         st.success("Resume uploaded successfully!")
+                        st.caption(describe_extraction(extraction))
                         with st.expander("View extracted text"):
                             st.text_area("Resume content", resume_text, height=200, disabled=True)
                     else:
@@ -455,28 +478,24 @@ def main():
 
                 elif uploaded_file.type == "text/plain":
                     # Handle text files
-                    string_data = StringIO(uploaded_file.getvalue().decode("utf-8"))
-                    resume_text = string_data.read()
+                    resume_text = file_bytes.decode("utf-8")
                     st.session_state.resume_text = resume_text
                     st.success("Resume uploaded successfully!")
                     with st.expander("View uploaded text"):
                         st.text_area("Resume content", resume_text, height=200, disabled=True)
 
                 elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                    # Handle DOCX files
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        tmp_file_path = tmp_file.name
-
-                    # Extract text from DOCX
-                    resume_text = extract_text_from_docx(tmp_file_path)
-
-                    # Clean up temporary file
-                    os.unlink(tmp_file_path)
+                    # Handle DOCX files, reusing the cached text of identical uploads
+                    # Sampled profiling captures run inside the sandbox worker
+                    extraction = extract_with_cache(
+                        file_bytes, uploaded_filename, get_extraction_cache(), sandbox=get_sandbox()
+                    )
+                    resume_text = extraction['text']
 
                     if resume_text and resume_text.strip():
                         st.session_state.resume_text = resume_text
                         st.success("Resume uploaded successfully!")
+                        st.caption(describe_extraction(extraction))
                         with st.expander("View extracted text"):
                             st.text_area("Resume content", resume_text, height=200, disabled=True)
                     else:
@@ -508,6 +527,8 @@ def main():
 
         st.markdown('</div>', unsafe_allow_html=True)
 
+    bulk_screening_section()
+
     # Enhanced analysis section
     st.markdown("""
     <div style="text-align: center; margin: 2rem 0;">
@@ -542,10 +563,11 @@ def main():
             with st.spinner("Analyzing resume..."):
                 try:
                     analyzer = get_analyzer()
-                    results = analyzer.analyze_resume(
-                        st.session_state.resume_text,
-                        st.session_state.job_description
-                    )
+                    with profile_request("analyze", [st.session_state.resume_text, st.session_state.job_description]):
+                        results = analyzer.analyze_resume(
+                            st.session_state.resume_text,
+                            st.session_state.job_description
+                        )
                     st.session_state.analysis_results = results
 
                     # Save analysis to database
@@ -698,6 +720,59 @@ def main():
         if 'cover_letter' in st.session_state and st.session_state.cover_letter:
             display_cover_letter(st.session_state.cover_letter)
 
+def bulk_screening_section():
+    """Rank every resume of an uploaded ZIP archive against the job description"""
+    with st.expander("📦 Screen a batch of resumes (ZIP)"):
+        st.markdown("*Upload a ZIP of PDF, DOCX and TXT resumes to rank them against the job description*")
+        archive = st.file_uploader("Resume archive", type=['zip'], key="bulk_archive", label_visibility="collapsed")
+
+        if st.button("Rank resumes", disabled=archive is None, use_container_width=True):
+            if not st.session_state.job_description or not st.session_state.job_description.strip():
+                st.error("Please enter a job description.")
+                return
+
+            progress_bar = st.progress(0.0, text="Extracting resumes...")
+
+            def show_progress(state):
+                progress_bar.progress(state.fraction, text=f"Extracted {state.done} of {state.total} resumes")
+
+            try:
+                # Entries are extracted concurrently straight from the upload, in the sandbox
+                documents = list(ingest_source(archive, executor=get_sandbox(), progress=show_progress))
+                extracted = [document for document in documents if document.ok]
+                progress_bar.progress(1.0, text=f"Analyzing {len(extracted)} resumes...")
+                results = get_analyzer().analyze_batch(
+                    st.session_state.job_description, [document.text for document in extracted]
+                )
+            except Exception as e:
+                progress_bar.empty()
+                st.error(f"Error processing archive: {str(e)}")
+                return
+            progress_bar.empty()
+
+            ranking = [
+                {
+                    "Resume": document.name,
+                    "Score": round(result['score'], 1),
+                    "Matching keywords": result['matching_keyword_count'],
+                    "Missing keywords": result['missing_keyword_count'],
+                }
+                for document, result in zip(extracted, results)
+            ]
+            ranking.sort(key=lambda row: row["Score"], reverse=True)
+            failed = [{"Resume": document.name, "Error": document.error} for document in documents if not document.ok]
+            st.session_state.bulk_results = {"ranking": ranking, "failed": failed}
+
+        if st.session_state.bulk_results:
+            ranking = st.session_state.bulk_results["ranking"]
+            failed = st.session_state.bulk_results["failed"]
+            st.success(f"Ranked {len(ranking)} resumes" + (f", {len(failed)} could not be read" if failed else ""))
+            if ranking:
+                st.dataframe(ranking, use_container_width=True, hide_index=True)
+            if failed:
+                st.markdown("**Files that could not be read**")
+                st.dataframe(failed, use_container_width=True, hide_index=True)
+
 def display_results(results):
     """Display analysis results with modern UI"""
 
@@ -758,8 +833,8 @@ def display_results(results):
     with col2:
         keyword_score = results.get('keyword_match_score', 0)
         if st.button(f"🔍 Keyword Match\n{keyword_score:.0f}%", key="keyword_btn", use_container_width=True):
-            matched_keywords = len(results.get('matching_keywords', []))
-            total_keywords = matched_keywords + len(results.get('missing_keywords', []))
+            matched_keywords = results.get('matching_keyword_count', len(results.get('matching_keywords', [])))
+            total_keywords = matched_keywords + results.get('missing_keyword_count', len(results.get('missing_keywords', [])))
             st.info(f"**Keyword Match: {keyword_score:.1f}%**\n\nFound {matched_keywords} out of {total_keywords} relevant keywords from the job posting in your resume.")
 
     with col3:
@@ -0,0 +1,233 @@
+"""
+Load test for the HTTP API: requests per second and latency percentiles
+
+Against a running server:
+    uvicorn api:app --port 8000
+    python -m benchmarks.api_load --url http://127.0.0.1:8000 --endpoint analyze --concurrency 16
+
+Or let the benchmark start uvicorn itself:
+    python -m benchmarks.api_load --spawn --api-workers 4 --duration 20 --output api_load.json
+
+Each client connection sends requests back to back over HTTP/1.1
+keep-alive with payloads from the synthetic corpus.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from benchmarks.corpus import generate_corpus
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class Connection:
+    """Minimal keep-alive HTTP/1.1 client connection"""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode("ascii") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Server closed the connection")
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value.strip())
+        await self.reader.readexactly(length)
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+def build_payloads(endpoint, count, rank_size, jobs, seed):
+    """Encoded request bodies spread evenly over ``jobs`` job descriptions"""
+    per_job = rank_size if endpoint == "rank" else -(-count // jobs)
+    corpora = [
+        generate_corpus(seed + job, n_resumes=per_job, resume_words=(150, 900), keyword_density=(0.2, 0.8))
+        for job in range(jobs)
+    ]
+    payloads = []
+    for i in range(count):
+        corpus = corpora[i % jobs]
+        if endpoint == "rank":
+            body = {"job_description": corpus.job_description, "resumes": corpus.resumes, "top_k": 10}
+        else:
+            body = {"resume_text": corpus.resumes[(i // jobs) % per_job], "job_description": corpus.job_description}
+        payloads.append(json.dumps(body).encode("utf-8"))
+    return payloads
+
+
+async def client(connection, path, payloads, offset, deadline, latencies, statuses):
+    i = offset
+    while time.perf_counter() < deadline:
+        body = payloads[i % len(payloads)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            status = await connection.request("POST", path, body)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError):
+            statuses["connection_error"] = statuses.get("connection_error", 0) + 1
+            await connection.close()
+            connection.writer = None
+            continue
+        latencies.append(time.perf_counter() - start)
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    await connection.close()
+
+
+async def run_load(host, port, path, payloads, concurrency, duration, warmup):
+    # Warm-up requests are not measured: worker start-up, profile caches
+    connection = Connection(host, port)
+    for body in payloads[:warmup]:
+        await connection.request("POST", path, body)
+    await connection.close()
+
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        client(Connection(host, port), path, payloads, i, deadline, latencies, statuses)
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    return latencies, statuses, elapsed
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(api_workers, batch_window_ms=None):
+    """Start uvicorn serving api:app and wait for /health"""
+    port = _free_port()
+    env = dict(os.environ)
+    if api_workers:
+        env["RESUMEFIT_API_WORKERS"] = str(api_workers)
+    if batch_window_ms is not None:
+        env["RESUMEFIT_BATCH_WINDOW_MS"] = str(batch_window_ms)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=REPO_ROOT, env=env
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("uvicorn exited during start-up (is it installed?)")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5) as sock:
+                sock.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                if sock.recv(64).startswith(b"HTTP/1.1 200"):
+                    return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("API server did not become healthy within 60 s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn", action="store_true", help="Start uvicorn with api:app for the test")
+    parser.add_argument("--api-workers", type=int, help="RESUMEFIT_API_WORKERS for --spawn")
+    parser.add_argument("--endpoint", choices=["analyze", "rank"], default="analyze")
+    parser.add_argument("--rank-size", type=int, default=50, help="Resumes per /rank request")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=int, default=8, help="Unmeasured requests sent first")
+    parser.add_argument("--payloads", type=int, default=32, help="Distinct request bodies to cycle through")
+    parser.add_argument("--jobs", type=int, default=4,
+                        help="Distinct job descriptions across the payloads (1 = everyone applies to one posting)")
+    parser.add_argument("--batch-window-ms", type=float,
+                        help="RESUMEFIT_BATCH_WINDOW_MS for --spawn (0 disables micro-batching)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if args.spawn:
+        process, url = spawn_server(args.api_workers, args.batch_window_ms)
+    try:
+        target = urlsplit(url)
+        payloads = build_payloads(args.endpoint, args.payloads, args.rank_size, args.jobs, args.seed)
+        latencies, statuses, elapsed = asyncio.run(run_load(
+            target.hostname, target.port or 80, f"/{args.endpoint}", payloads,
+            args.concurrency, args.duration, args.warmup
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    if not latencies:
+        raise SystemExit(f"No successful requests: {statuses}")
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "endpoint": args.endpoint,
+            "rank_size": args.rank_size if args.endpoint == "rank" else None,
+            "concurrency": args.concurrency,
+            "duration_seconds": elapsed,
+            "api_workers": args.api_workers,
+            "jobs": args.jobs,
+            "batch_window_ms": args.batch_window_ms,
+        },
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_ms": {
+            "mean": 1000 * statistics.fmean(latencies),
+            "p50": 1000 * percentile(latencies, 0.50),
+            "p95": 1000 * percentile(latencies, 0.95),
+            "p99": 1000 * percentile(latencies, 0.99),
+            "max": 1000 * max(latencies),
+        },
+        "statuses": statuses,
+    }
+    print(f"{report['requests']} requests to /{args.endpoint} in {elapsed:.1f} s "
+          f"with {args.concurrency} connections: {report['requests_per_second']:.1f} req/s")
+    print("latency ms: " + ", ".join(f"{name} {value:.1f}" for name, value in report["latency_ms"].items()))
+    print(f"statuses: {statuses}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
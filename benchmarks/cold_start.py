@@ -0,0 +1,120 @@
+"""
+Measure import time and cold-start latency of the utils package
+
+Every measurement runs in a fresh interpreter so module caches, NLTK
+resources and compiled automata are cold.
+
+Usage:
+    python -m benchmarks.cold_start [--repeat 5] [--output cold_start.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "utils.skill_extractor",
+    "utils.keyword_matcher",
+    "utils.job_profile",
+    "utils.text_processor",
+    "utils.resume_analyzer",
+    "utils.pdf_extractor",
+    "utils.docx_extractor",
+]
+
+RESUME = (
+    "Senior Python developer with 6 years of experience building Django and Flask services on AWS. "
+    "Led a team of 5 engineers, implemented CI/CD pipelines with Docker and Kubernetes, "
+    "optimized PostgreSQL queries and reduced infrastructure costs by 20%."
+)
+JOB_DESCRIPTION = (
+    "We are hiring a Python engineer experienced with Django, AWS, Docker and Kubernetes. "
+    "You will own SQL databases, CI/CD pipelines and collaborate in an agile team with strong communication."
+)
+
+IMPORT_SNIPPET = """
+import time, json, importlib
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+COLD_START_SNIPPET = """
+import time, json, contextlib, io
+stages = {{}}
+start = time.perf_counter()
+from utils.resume_analyzer import ResumeAnalyzer
+stages["import"] = time.perf_counter() - start
+mark = time.perf_counter()
+analyzer = ResumeAnalyzer()
+stages["construct"] = time.perf_counter() - mark
+mark = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    analyzer.analyze_resume({resume!r}, {job!r})
+stages["first_analysis"] = time.perf_counter() - mark
+mark = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    analyzer.analyze_resume({resume!r}, {job!r})
+stages["warm_analysis"] = time.perf_counter() - mark
+stages["total"] = time.perf_counter() - start
+print(json.dumps(stages))
+"""
+
+
+def run_snippet(code):
+    """Run code in a fresh interpreter from the repository root and parse its JSON output"""
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    """Median and min of a list of seconds"""
+    return {"median": statistics.median(samples), "min": min(samples), "samples": samples}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    report = {"python": sys.version.split()[0], "repeat": args.repeat, "imports": {}, "cold_start": {}}
+
+    for module in MODULES:
+        runs = [run_snippet(IMPORT_SNIPPET.format(module=module)) for _ in range(args.repeat)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            report["imports"][module] = {"error": errors[0]}
+            print(f"{module:<28} import failed: {errors[0]}")
+            continue
+        report["imports"][module] = summarize([run["seconds"] for run in runs])
+        print(f"{module:<28} import {report['imports'][module]['median'] * 1000:8.1f} ms (median)")
+
+    runs = [run_snippet(COLD_START_SNIPPET.format(resume=RESUME, job=JOB_DESCRIPTION)) for _ in range(args.repeat)]
+    runs = [run for run in runs if "error" not in run]
+    for stage in ("import", "construct", "first_analysis", "warm_analysis", "total"):
+        if runs:
+            report["cold_start"][stage] = summarize([run[stage] for run in runs])
+            print(f"cold start {stage:<17} {report['cold_start'][stage]['median'] * 1000:8.1f} ms (median)")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
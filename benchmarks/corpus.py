@@ -0,0 +1,150 @@
+"""
+Reproducible synthetic resumes and job descriptions
+
+Documents are assembled from sentence templates over fixed word lists and
+the bundled skills taxonomy, so the same seed always produces the same
+corpus. ``keyword_density`` controls the share of resume terms drawn from
+the job description's own keyword pool.
+"""
+import random
+from functools import lru_cache
+
+from utils.skill_extractor import DEFAULT_TAXONOMY_PATH, load_taxonomy
+
+ACTION_VERBS = [
+    "achieved", "implemented", "developed", "created", "designed", "optimized", "improved",
+    "increased", "reduced", "managed", "led", "directed", "coordinated", "executed",
+    "delivered", "established", "initiated", "streamlined", "enhanced", "built", "maintained",
+]
+
+DOMAIN_TERMS = [
+    "pipeline", "platform", "service", "dashboard", "api", "database", "migration", "workflow",
+    "integration", "deployment", "infrastructure", "analytics", "reporting", "automation",
+    "architecture", "microservices", "monitoring", "security", "compliance", "forecasting",
+    "onboarding", "roadmap", "stakeholders", "customers", "revenue", "latency", "throughput",
+    "testing", "documentation", "release", "budget", "vendor", "inventory", "logistics",
+    "campaign", "conversion", "retention", "pricing", "billing", "support", "training",
+]
+
+FILLER_WORDS = [
+    "the", "and", "for", "with", "across", "within", "using", "to", "of", "in", "on", "by",
+    "new", "existing", "multiple", "key", "cross-functional", "internal", "external", "daily",
+]
+
+ROLES = [
+    "software engineer", "data analyst", "product manager", "devops engineer", "data scientist",
+    "project manager", "backend developer", "frontend developer", "business analyst",
+]
+
+METRICS = ["{n}%", "${n}k", "{n}+ users", "{n} people", "{n} months", "{n}x"]
+
+
+class Corpus:
+    """One job description with the resumes to score against it"""
+
+    def __init__(self, job_description, resumes, seed, params):
+        self.job_description = job_description
+        self.resumes = resumes
+        self.seed = seed
+        self.params = params
+
+    def __len__(self):
+        return len(self.resumes)
+
+
+@lru_cache(maxsize=None)
+def _skills():
+    return load_taxonomy(DEFAULT_TAXONOMY_PATH)
+
+
+def _sentence(rng, terms, with_metric):
+    """One bullet-style sentence built around a few terms"""
+    words = [rng.choice(ACTION_VERBS)]
+    for term in rng.sample(terms, k=min(len(terms), rng.randint(2, 4))):
+        words.append(rng.choice(FILLER_WORDS))
+        words.append(term)
+    if with_metric:
+        words.append("by " + rng.choice(METRICS).format(n=rng.randint(2, 95)))
+    return " ".join(words).capitalize() + "."
+
+
+def generate_job_description(rng, n_words=250):
+    """
+    Generate a job description and the keyword pool it is built from
+
+    Args:
+        rng (random.Random): Random source
+        n_words (int): Approximate length in words
+
+    Returns:
+        tuple: (job description text, list of keyword pool terms)
+    """
+    role = rng.choice(ROLES)
+    pool = rng.sample(_skills(), k=min(12, len(_skills()))) + rng.sample(DOMAIN_TERMS, k=15)
+    lines = [f"We are hiring a {role} to join our team.", "Responsibilities:"]
+    length = sum(len(line.split()) for line in lines)
+    while length < n_words:
+        line = "- " + _sentence(rng, pool, with_metric=False)
+        lines.append(line)
+        length += len(line.split())
+    lines.append("Requirements: " + ", ".join(rng.sample(pool, k=min(8, len(pool)))) + ".")
+    return "\n".join(lines), pool
+
+
+def generate_resume(rng, keyword_pool, n_words=400, keyword_density=0.5):
+    """
+    Generate a resume
+
+    Args:
+        rng (random.Random): Random source
+        keyword_pool (list): Job description terms
+        n_words (int): Approximate length in words
+        keyword_density (float): Probability that a sentence uses job
+            description terms rather than unrelated ones
+
+    Returns:
+        str: Resume text
+    """
+    other_terms = [term for term in _skills() + DOMAIN_TERMS if term not in keyword_pool]
+    role = rng.choice(ROLES)
+    lines = [f"{role.title()}", f"Summary: {role} with {rng.randint(1, 15)} years of experience.", "Experience:"]
+    length = sum(len(line.split()) for line in lines)
+    while length < n_words:
+        terms = keyword_pool if rng.random() < keyword_density else other_terms
+        line = "- " + _sentence(rng, terms, with_metric=rng.random() < 0.4)
+        lines.append(line)
+        length += len(line.split())
+    skills = rng.sample(_skills(), k=min(10, len(_skills())))
+    lines.append("Skills: " + ", ".join(skills))
+    return "\n".join(lines)
+
+
+def generate_corpus(seed=0, n_resumes=50, resume_words=400, job_words=250, keyword_density=0.5):
+    """
+    Generate a reproducible job description and resume set
+
+    Args:
+        seed (int): Random seed
+        n_resumes (int): Number of resumes
+        resume_words (int or tuple): Resume length, or a (min, max) range
+        job_words (int): Job description length
+        keyword_density (float or tuple): Keyword density, or a (min, max) range
+
+    Returns:
+        Corpus: Generated corpus
+    """
+    rng = random.Random(seed)
+    job_description, pool = generate_job_description(rng, job_words)
+    resumes = []
+    for _ in range(n_resumes):
+        words = rng.randint(*resume_words) if isinstance(resume_words, tuple) else resume_words
+        density = rng.uniform(*keyword_density) if isinstance(keyword_density, tuple) else keyword_density
+        resumes.append(generate_resume(rng, pool, words, density))
+
+    params = {
+        "n_resumes": n_resumes,
+        "resume_words": resume_words,
+        "job_words": job_words,
+        "keyword_density": keyword_density,
+    }
+    return Corpus(job_description, resumes, seed, params)
@@ -0,0 +1,142 @@
+"""
+Reproducible synthetic resume documents for extraction benchmarks
+
+Document text comes from the same sentence generator as ``benchmarks.corpus``,
+so a seed always produces the same files. DOCX files are written with
+python-docx; ``table_rows`` adds a skills/experience matrix per section,
+which is what makes real-world resumes table-heavy. PDF files are written
+directly (one Helvetica text object per page, optionally Flate-compressed),
+so no PDF library is needed to generate them.
+"""
+import random
+import zlib
+
+from benchmarks.corpus import DOMAIN_TERMS, ROLES, _sentence, _skills
+
+
+def write_docx(path, seed=0, sections=4, bullets=8, table_rows=0, table_columns=4, tab_stops=0):
+    """
+    Write a synthetic resume as a DOCX file
+
+    Args:
+        path (str or Path): Output file
+        seed (int): Random seed
+        sections (int): Experience sections, each a heading plus bullets
+        bullets (int): Bullet paragraphs per section
+        table_rows (int): Rows of the table following each section (0 for none)
+        table_columns (int): Columns of those tables
+        tab_stops (int): Tab stops set on each heading, as used to align dates
+
+    Returns:
+        str: The text written, one line per paragraph and table row
+    """
+    from docx import Document
+    from docx.shared import Inches
+
+    rng = random.Random(seed)
+    terms = _skills() + DOMAIN_TERMS
+    document = Document()
+    lines = []
+
+    def paragraph(text, style=None):
+        document.add_paragraph(text, style=style)
+        lines.append(text)
+
+    def heading(text):
+        tabs = document.add_paragraph(text, style="Heading 2").paragraph_format.tab_stops
+        for stop in range(tab_stops):
+            tabs.add_tab_stop(Inches(stop + 1))
+        lines.append(text)
+
+    role = rng.choice(ROLES)
+    paragraph(role.title(), style="Title")
+    paragraph(f"Summary: {role} with {rng.randint(1, 15)} years of experience.")
+    for section in range(sections):
+        heading(f"{rng.choice(ROLES).title()} at Company {section + 1}")
+        for _ in range(bullets):
+            paragraph(_sentence(rng, terms, with_metric=rng.random() < 0.4), style="List Bullet")
+        if table_rows:
+            table = document.add_table(rows=table_rows, cols=table_columns)
+            for row in table.rows:
+                cells = [" ".join(rng.sample(terms, k=2)) for _ in range(table_columns)]
+                for cell, text in zip(row.cells, cells):
+                    cell.text = text
+                lines.append(" ".join(cells))
+    paragraph("Skills: " + ", ".join(rng.sample(_skills(), k=min(10, len(_skills())))))
+    document.save(str(path))
+    return "\n".join(lines)
+
+
+def _pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def write_pdf(path, seed=0, pages=1, lines_per_page=40, compress=True):
+    """
+    Write a synthetic resume as a PDF file
+
+    Args:
+        path (str or Path): Output file
+        seed (int): Random seed
+        pages (int): Page count
+        lines_per_page (int): Text lines on each page
+        compress (bool): Flate-compress the page content streams
+
+    Returns:
+        str: The text written, one line per text line
+    """
+    rng = random.Random(seed)
+    terms = _skills() + DOMAIN_TERMS
+    lines = []
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>"}
+    font = 3 + 2 * pages
+    kids = " ".join(f"{3 + 2 * page} 0 R" for page in range(pages))
+    objects[2] = f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode()
+    for page in range(pages):
+        page_lines = [_sentence(rng, terms, with_metric=rng.random() < 0.4) for _ in range(lines_per_page)]
+        lines.extend(page_lines)
+        operators = ["BT", "/F1 10 Tf", "12 TL", "50 770 Td"]
+        operators += [f"{_pdf_string(line)} '" for line in page_lines]
+        operators.append("ET")
+        content = "\n".join(operators).encode("latin-1", errors="replace")
+        filters = ""
+        if compress:
+            content, filters = zlib.compress(content), " /Filter /FlateDecode"
+        objects[3 + 2 * page] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * page} 0 R "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> >>"
+        ).encode()
+        objects[4 + 2 * page] = (
+            f"<< /Length {len(content)}{filters} >>\nstream\n".encode() + content + b"\nendstream"
+        )
+    objects[font] = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number in range(1, font + 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + objects[number] + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {font + 1}\n0000000000 65535 f \n".encode()
+    output += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    output += f"trailer << /Size {font + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as file:
+        file.write(output)
+    return "\n".join(lines)
+
+
+def corrupt_file(path, seed=0):
+    """
+    Damage a document in place, as interrupted uploads and broken exports do
+
+    The file is truncated to a random 20-80% of its size, which drops a
+    PDF's cross-reference table or a DOCX's zip central directory.
+
+    Args:
+        path (str or Path): File to damage
+        seed (int): Random seed
+    """
+    rng = random.Random(seed)
+    with open(path, "rb+") as file:
+        data = file.read()
+        file.truncate(int(len(data) * rng.uniform(0.2, 0.8)))
@@ -0,0 +1,127 @@
+"""
+DOCX extraction: streaming document.xml parser vs the python-docx object model
+
+    python -m benchmarks.docx_extraction --repeat 5 --output docx_extraction.json
+
+Each (extractor, document) pair runs in a fresh process. Peak memory is
+reported twice: the growth of the process's peak RSS during one extraction,
+which includes lxml's C allocations (on Linux the peak is reset first
+through /proc/self/clear_refs), and the tracemalloc peak of Python
+allocations. Latency is the median of ``--repeat`` extractions after the
+measured one. Both extractors must produce the same lines, in any order;
+tab stops in paragraph properties, for one, are not text.
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.documents import write_docx
+from benchmarks.memory import current_rss_kb, peak_rss_kb, reset_peak_rss
+
+# name: write_docx parameters
+DOCUMENTS = {
+    "typical": dict(sections=4, bullets=6),
+    "table_heavy": dict(sections=8, bullets=6, table_rows=20),
+    "large_tables": dict(sections=40, bullets=10, table_rows=60, table_columns=5),
+    "tab_stops": dict(sections=8, bullets=6, tab_stops=3),
+}
+
+
+def extract_with_python_docx(path):
+    """The previous extractor: python-docx object model, paragraphs then tables"""
+    from docx import Document
+
+    doc = Document(path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                text += cell.text + " "
+            text += "\n"
+    return text.strip()
+
+
+def extract_streaming(path):
+    from utils.docx_extractor import extract_text_from_docx
+    return extract_text_from_docx(path)
+
+
+EXTRACTORS = {"python_docx": extract_with_python_docx, "streaming": extract_streaming}
+
+
+def _measure(extractor, path, repeat):
+    """Child process: peak RSS growth of one extraction, then timed repeats"""
+    import docx  # noqa: F401  (import cost is not part of either measurement)
+    import utils.docx_extractor  # noqa: F401
+
+    extract = EXTRACTORS[extractor]
+    gc.collect()
+    reset_peak_rss()
+    baseline = current_rss_kb()
+    tracemalloc.start()
+    text = extract(path)
+    python_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    peak_kb = peak_rss_kb() - baseline
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(path)
+        samples.append(time.perf_counter() - start)
+    return {"median_ms": 1000 * statistics.median(samples), "peak_rss_growth_kb": peak_kb,
+            "python_peak_kb": python_peak / 1024, "characters": len(text), "tokens": Counter(text.split()),
+            "lines": Counter(line.rstrip() for line in text.splitlines())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", nargs="+", choices=sorted(DOCUMENTS), default=list(DOCUMENTS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    report = {"repeat": args.repeat, "documents": {}}
+    with tempfile.TemporaryDirectory(prefix="resumefit-docx-") as tmp_dir:
+        for name in args.documents:
+            path = Path(tmp_dir) / f"{name}.docx"
+            write_docx(path, seed=args.seed, **DOCUMENTS[name])
+            entry = {"bytes": path.stat().st_size, "params": DOCUMENTS[name]}
+            tokens, lines = {}, {}
+            for extractor in EXTRACTORS:
+                with context.Pool(1) as pool:
+                    result = pool.apply(_measure, (extractor, str(path), args.repeat))
+                tokens[extractor] = result.pop("tokens")
+                lines[extractor] = result.pop("lines")
+                entry[extractor] = result
+            # Same words, possibly in a different order
+            entry["same_tokens"] = tokens["python_docx"] == tokens["streaming"]
+            entry["same_lines"] = lines["python_docx"] == lines["streaming"]
+            entry["speedup"] = entry["python_docx"]["median_ms"] / entry["streaming"]["median_ms"]
+            report["documents"][name] = entry
+
+            print(f"{name:>13} ({entry['bytes'] / 1024:.0f} KiB): " + ", ".join(
+                f"{extractor} {entry[extractor]['median_ms']:.1f} ms / "
+                f"{entry[extractor]['peak_rss_growth_kb'] / 1024:.1f} MiB RSS / "
+                f"{entry[extractor]['python_peak_kb'] / 1024:.1f} MiB Python" for extractor in EXTRACTORS
+            ) + f", speedup {entry['speedup']:.1f}x, same tokens: {entry['same_tokens']}, "
+              f"same lines: {entry['same_lines']}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
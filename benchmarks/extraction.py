@@ -0,0 +1,279 @@
+"""
+Extraction throughput of the PDF and DOCX extractors on a generated corpus
+
+Run a benchmark and write the report:
+    python -m benchmarks.extraction run --docs 10 --output before.json
+
+Compare two reports; exits with status 1 when a point got slower or more
+memory-hungry than the threshold, so it can gate CI:
+    python -m benchmarks.extraction compare before.json after.json --threshold 0.2
+
+Check that per-page PDF timeouts hold even when the parser catches
+``Exception`` around its work, as PyPDF2 does; exits with status 1 if not:
+    python -m benchmarks.extraction timeouts
+
+Each size point is a set of synthetic resumes (see ``benchmarks.documents``)
+extracted ``--repeat`` times in a fresh process. A point reports pages/s
+(PDF only), MB/s, latency percentiles, the peak RSS growth of that process
+and the failure rate (empty text or an exception) on intact files. A share of
+deliberately truncated files (``--corrupt``) is extracted separately so
+slow or crashing error paths show up too.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.documents import corrupt_file, write_docx, write_pdf
+from benchmarks.memory import current_rss_kb, peak_rss_kb, reset_peak_rss
+from benchmarks.pipeline import _git_revision
+
+# Size points: name -> generator parameters
+PDF_POINTS = {
+    "1_page": dict(pages=1),
+    "4_pages": dict(pages=4),
+    "16_pages": dict(pages=16),
+    "48_pages": dict(pages=48),
+}
+
+DOCX_POINTS = {
+    "2_sections": dict(sections=2, bullets=6),
+    "8_sections": dict(sections=8, bullets=8),
+    "8_sections_tables": dict(sections=8, bullets=8, table_rows=20),
+    "32_sections_tables": dict(sections=32, bullets=8, table_rows=40),
+}
+
+
+def _extract(kind, path, pdf_workers):
+    if kind == "pdf":
+        from utils.pdf_extractor import extract_pdf
+        return extract_pdf(path, workers=pdf_workers)
+    from utils.docx_extractor import extract_docx
+    return extract_docx(path)
+
+
+def measure_point(kind, paths, corrupt_paths, repeat, pdf_workers):
+    """
+    Child process: extract every document of one size point
+
+    Returns:
+        dict: Throughput, latency, memory and failure figures
+    """
+    # Import the extractor first so its import cost is not measured
+    _extract(kind, paths[0], pdf_workers)
+    latencies, pages, failures, total_bytes = [], 0, 0, 0
+    errors = io.StringIO()
+    reset_peak_rss()
+    baseline = current_rss_kb()
+    with contextlib.redirect_stderr(errors):
+        for _ in range(repeat):
+            for path in paths:
+                start = time.perf_counter()
+                try:
+                    text, page_count = _extract(kind, path, pdf_workers)
+                except Exception:
+                    text, page_count = "", None
+                latencies.append(time.perf_counter() - start)
+                total_bytes += Path(path).stat().st_size
+                # DOCX page counts are whatever Word last stored, not a measurement
+                if kind == "pdf":
+                    pages += page_count or 0
+                failures += not text
+
+        corrupt_failures, corrupt_seconds = 0, 0.0
+        for path in corrupt_paths:
+            start = time.perf_counter()
+            try:
+                text, _ = _extract(kind, path, pdf_workers)
+            except Exception:
+                text = ""
+            corrupt_seconds += time.perf_counter() - start
+            corrupt_failures += not text
+
+    seconds = sum(latencies)
+    ordered = sorted(latencies)
+    return {
+        "documents": len(paths),
+        "extractions": len(latencies),
+        "mean_bytes": total_bytes / len(latencies),
+        "pages_per_second": pages / seconds if pages else None,
+        "documents_per_second": len(latencies) / seconds,
+        "mb_per_second": total_bytes / seconds / 1e6,
+        "latency_ms": {
+            "p50": 1000 * statistics.median(ordered),
+            "p95": 1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+            "max": 1000 * ordered[-1],
+        },
+        "peak_rss_growth_kb": peak_rss_kb() - baseline,
+        "failure_rate": failures / len(latencies),
+        "corrupt": {
+            "documents": len(corrupt_paths),
+            "failure_rate": corrupt_failures / len(corrupt_paths) if corrupt_paths else None,
+            "mean_ms": 1000 * corrupt_seconds / len(corrupt_paths) if corrupt_paths else None,
+        },
+    }
+
+
+def generate_point(directory, kind, name, params, docs, corrupt, seed):
+    """Write the intact and truncated documents of one size point"""
+    writer = write_pdf if kind == "pdf" else write_docx
+    paths, corrupt_paths = [], []
+    for i in range(docs):
+        path = Path(directory) / f"{kind}-{name}-{i}.{kind}"
+        writer(path, seed=seed + i, **params)
+        paths.append(str(path))
+    for i in range(corrupt):
+        damaged = Path(directory) / f"{kind}-{name}-corrupt-{i}.{kind}"
+        shutil.copyfile(paths[i % len(paths)], damaged)
+        corrupt_file(damaged, seed=seed + i)
+        corrupt_paths.append(str(damaged))
+    return paths, corrupt_paths
+
+
+def run(args):
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "docs": args.docs,
+            "pdf_workers": args.pdf_workers,
+        },
+        "points": {},
+    }
+    corrupt = max(1, round(args.docs * args.corrupt)) if args.corrupt else 0
+    points = {"pdf": PDF_POINTS, "docx": DOCX_POINTS}
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory(prefix="resumefit-extraction-") as tmp_dir:
+        for kind in args.formats:
+            for name, params in points[kind].items():
+                paths, corrupt_paths = generate_point(tmp_dir, kind, name, params, args.docs, corrupt, args.seed)
+                with context.Pool(1) as pool:
+                    result = pool.apply(measure_point, (kind, paths, corrupt_paths, args.repeat, args.pdf_workers))
+                result["params"] = params
+                report["points"][f"{kind}/{name}"] = result
+                pages = result["pages_per_second"]
+                print(f"{kind}/{name:<20} {result['mean_bytes'] / 1024:7.0f} KiB "
+                      f"{(f'{pages:8.0f} pages/s') if pages else '         n/a':>14} "
+                      f"{result['mb_per_second']:7.2f} MB/s  p95 {result['latency_ms']['p95']:7.1f} ms  "
+                      f"RSS +{result['peak_rss_growth_kb'] / 1024:5.1f} MiB  "
+                      f"failures {100 * result['failure_rate']:.0f}%")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {args.output}")
+
+
+def compare(args):
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+
+    regressions = []
+    print(f"{'point':<28} {'before MB/s':>11} {'after MB/s':>11} {'speedup':>8} {'RSS before':>11} "
+          f"{'RSS after':>10} {'failures':>9}")
+    for point, old in before["points"].items():
+        new = after["points"].get(point)
+        if new is None:
+            continue
+        speedup = new["mb_per_second"] / old["mb_per_second"]
+        old_rss, new_rss = old["peak_rss_growth_kb"] / 1024, new["peak_rss_growth_kb"] / 1024
+        print(f"{point:<28} {old['mb_per_second']:>11.2f} {new['mb_per_second']:>11.2f} {speedup:>7.2f}x "
+              f"{old_rss:>10.1f}M {new_rss:>9.1f}M {100 * new['failure_rate']:>8.0f}%")
+        if speedup < 1 - args.threshold:
+            regressions.append(f"{point}: throughput {speedup:.2f}x")
+        # Growth below 1 MiB is allocator noise
+        if new_rss > max(1.0, old_rss * (1 + args.threshold)):
+            regressions.append(f"{point}: peak RSS {old_rss:.1f} -> {new_rss:.1f} MiB")
+        if new["failure_rate"] > old["failure_rate"]:
+            regressions.append(f"{point}: failure rate {old['failure_rate']:.0%} -> {new['failure_rate']:.0%}")
+
+    if regressions:
+        print("Regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+class _SwallowingPage:
+    """Stand-in PDF page that keeps working inside ``except Exception``, like PyPDF2's parsing loops"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def extract_text(self):
+        end = time.monotonic() + self.seconds
+        while time.monotonic() < end:
+            try:
+                sum(range(10000))
+            except Exception:
+                pass
+        return "text the page budget should have cut off"
+
+
+def timeouts(args):
+    from utils.pdf_extractor import PAGE_TIMEOUT_REPEAT, _extract_pages
+
+    reader = SimpleNamespace(pages=[_SwallowingPage(args.page_seconds) for _ in range(args.pages)])
+    start = time.perf_counter()
+    results = _extract_pages(reader, range(args.pages), args.page_timeout, max_chars=10 ** 6)
+    elapsed = time.perf_counter() - start
+    timed_out = sum(1 for _, problem, _, failed in results if failed and "timed out" in problem)
+    # Every page may overrun its budget by one repeat of the alarm, plus scheduling slack
+    allowed = args.pages * (args.page_timeout + PAGE_TIMEOUT_REPEAT) + 0.5
+    print(f"{args.pages} pages of {args.page_seconds:g} s with a {args.page_timeout:g} s budget: "
+          f"{elapsed:.2f} s (allowed {allowed:.2f} s), {timed_out} timed out")
+    if timed_out != args.pages or elapsed > allowed:
+        print("Per-page timeouts were not enforced")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmark")
+    run_parser.add_argument("--formats", nargs="+", choices=["pdf", "docx"], default=["pdf", "docx"])
+    run_parser.add_argument("--docs", type=int, default=5, help="Documents per size point")
+    run_parser.add_argument("--corrupt", type=float, default=0.2,
+                            help="Truncated documents per point, as a share of --docs (0 for none)")
+    run_parser.add_argument("--pdf-workers", type=int, default=0,
+                            help="Page pool processes for PDFs (0 = in process, the per-core figure)")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", help="Write the report to this JSON file")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="Compare two reports")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="Relative slowdown or memory growth reported as a regression")
+    compare_parser.set_defaults(func=compare)
+
+    timeouts_parser = commands.add_parser("timeouts", help="Check that per-page PDF timeouts are enforced")
+    timeouts_parser.add_argument("--pages", type=int, default=5)
+    timeouts_parser.add_argument("--page-seconds", type=float, default=1.2, help="Work each page would take")
+    timeouts_parser.add_argument("--page-timeout", type=float, default=0.2)
+    timeouts_parser.set_defaults(func=timeouts)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark the indexed keyword matcher against the original pairwise loop
+
+Usage:
+    python -m benchmarks.keyword_matching [--sizes 100 300 1000] [--repeat 3]
+"""
+import argparse
+import random
+import string
+import time
+
+from utils.keyword_matcher import KeywordIndex
+
+
+def naive_find_matching_keywords(resume_keywords, job_keywords):
+    """Reference implementation: compare every job keyword with every resume keyword"""
+    matching = set()
+
+    resume_lower = {kw.lower() for kw in resume_keywords}
+
+    for job_kw in job_keywords:
+        if job_kw.lower() in resume_lower:
+            matching.add(job_kw.lower())
+
+    for job_kw in job_keywords:
+        job_kw_lower = job_kw.lower()
+
+        for resume_kw in resume_keywords:
+            resume_kw_lower = resume_kw.lower()
+
+            if len(job_kw_lower) < 3 or len(resume_kw_lower) < 3:
+                continue
+
+            if job_kw_lower in resume_kw_lower or resume_kw_lower in job_kw_lower:
+                matching.add(job_kw_lower)
+                continue
+
+            job_words = set(job_kw_lower.split())
+            resume_words = set(resume_kw_lower.split())
+
+            if len(job_words) > 1 and len(resume_words) > 1:
+                overlap = len(job_words.intersection(resume_words))
+                if overlap >= len(job_words) * 0.7:
+                    matching.add(job_kw_lower)
+                    continue
+
+            if len(job_kw_lower) >= 5 and len(resume_kw_lower) >= 5:
+                shorter = min(job_kw_lower, resume_kw_lower, key=len)
+                longer = max(job_kw_lower, resume_kw_lower, key=len)
+
+                common_chars = sum(1 for char in shorter if char in longer)
+                overlap_ratio = common_chars / len(shorter)
+
+                if overlap_ratio >= 0.8:
+                    matching.add(job_kw_lower)
+
+    return matching
+
+
+def make_vocabulary(rng, size, alphabet=string.ascii_lowercase, min_length=2, max_length=12):
+    """Random pseudo-words"""
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(min_length, max_length)))
+        for _ in range(size)
+    ]
+
+
+def make_keywords(rng, vocabulary, n_words, max_length=25):
+    """Unigram, bigram and trigram keywords of a random document, as extract_keywords builds them"""
+    words = [rng.choice(vocabulary) for _ in range(n_words)]
+    keywords = set(words)
+    for n in (2, 3):
+        for i in range(len(words) - n + 1):
+            phrase = " ".join(words[i:i + n])
+            if len(phrase) <= max_length:
+                keywords.add(phrase)
+    return {kw for kw in keywords if len(kw) > 2}
+
+
+def check_equivalence(trials=300, seed=0):
+    """Compare both implementations on small random inputs that exercise every rule"""
+    rng = random.Random(seed)
+    for _ in range(trials):
+        # Small alphabets and few lengths force substring, overlap and fuzzy cases
+        vocabulary = make_vocabulary(rng, rng.randint(5, 40), alphabet="abcdef"[:rng.randint(2, 6)],
+                                     min_length=1, max_length=rng.randint(3, 9))
+        resume = make_keywords(rng, vocabulary, rng.randint(1, 30))
+        job = make_keywords(rng, vocabulary, rng.randint(1, 30))
+        expected = naive_find_matching_keywords(resume, job)
+        actual = KeywordIndex(resume).match(job)
+        if expected != actual:
+            raise AssertionError(f"Mismatch for resume={sorted(resume)} job={sorted(job)}")
+    return trials
+
+
+def time_call(func, repeat):
+    """Best wall time of several calls"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000],
+                        help="Document lengths in words")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"Equivalence check: {check_equivalence()} random cases passed")
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, 5000)
+    print(f"{'words':>6} {'resume kw':>10} {'job kw':>8} {'naive s':>10} {'indexed s':>10} {'speedup':>8}")
+    for size in args.sizes:
+        resume = make_keywords(rng, vocabulary, size)
+        job = make_keywords(rng, vocabulary, size)
+        naive_time, expected = time_call(lambda: naive_find_matching_keywords(resume, job), args.repeat)
+        indexed_time, actual = time_call(lambda: KeywordIndex(resume).match(job), args.repeat)
+        assert expected == actual
+        print(f"{size:>6} {len(resume):>10} {len(job):>8} {naive_time:>10.4f} {indexed_time:>10.4f} "
+              f"{naive_time / indexed_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Process memory measurements for benchmarks
+
+Peak RSS includes allocations made by C extensions (lxml, zlib, numpy)
+that tracemalloc cannot see. On Linux the peak can be reset, so a
+measurement covers only the code that runs after ``reset_peak_rss``.
+"""
+import resource
+import sys
+
+
+def _status_kb(field):
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """Reset the peak RSS to the current RSS where the kernel supports it"""
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB"""
+    peak = _status_kb("VmHWM")
+    if peak is not None:
+        return peak
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return usage / 1024 if sys.platform == "darwin" else usage
+
+
+def current_rss_kb():
+    """Current resident set size in KiB, or the peak where it is unavailable"""
+    current = _status_kb("VmRSS")
+    return current if current is not None else peak_rss_kb()
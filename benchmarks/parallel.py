@@ -0,0 +1,69 @@
+"""
+Batch throughput of ParallelAnalyzer by worker count
+
+    python -m benchmarks.parallel --resumes 2000 --workers 1 2 4 8 --output parallel.json
+
+Worker start-up and warm-up are excluded; each point is the median of
+``--repeat`` analyze_batch calls on an already warm pool. The serial
+ResumeAnalyzer is measured too, as the baseline.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.corpus import generate_corpus
+from utils.parallel import ParallelAnalyzer, default_worker_count
+from utils.resume_analyzer import ResumeAnalyzer
+
+
+def time_batches(analyzer, corpus, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = analyzer.analyze_batch(corpus.job_description, corpus.resumes)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, max(1, default_worker_count() // 2), default_worker_count()}))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.seed, n_resumes=args.resumes, resume_words=(150, 900), keyword_density=(0.2, 0.8))
+    report = {"resumes": args.resumes, "cpus": default_worker_count(), "points": []}
+
+    serial = ResumeAnalyzer()
+    serial.analyze_resume(corpus.resumes[0], corpus.job_description)
+    serial_seconds, expected = time_batches(serial, corpus, args.repeat)
+    print(f"serial        {args.resumes / serial_seconds:8.1f} resumes/s")
+    report["serial_resumes_per_second"] = args.resumes / serial_seconds
+
+    for workers in args.workers:
+        with ParallelAnalyzer(workers=workers) as analyzer:
+            analyzer.warm_up()
+            seconds, results = time_batches(analyzer, corpus, args.repeat)
+        if [result.to_compact() for result in results] != [result.to_compact() for result in expected]:
+            raise SystemExit(f"{workers} workers: results differ from the serial analyzer")
+        point = {
+            "workers": workers,
+            "resumes_per_second": args.resumes / seconds,
+            "speedup": serial_seconds / seconds,
+        }
+        report["points"].append(point)
+        print(f"{workers:>3} workers   {point['resumes_per_second']:8.1f} resumes/s  {point['speedup']:5.2f}x")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Per-stage timing and scaling curves for the ResumeAnalyzer pipeline
+
+Run a benchmark and write the report:
+    python -m benchmarks.pipeline run --output before.json
+
+Compare two reports stage by stage:
+    python -m benchmarks.pipeline compare before.json after.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from benchmarks.corpus import generate_corpus
+from utils.resume_analyzer import ResumeAnalyzer
+
+STAGES = [
+    "preprocessing",
+    "keyword_extraction",
+    "keyword_matching",
+    "skills",
+    "similarity",
+    "scoring",
+]
+
+
+def run_batch(corpus, repeat):
+    """
+    Time one analyze_batch call per repeat on a fresh analyzer, with stage
+    times taken from the analyzer's own ``timings`` result section
+
+    Returns:
+        dict: Median total seconds, median per-stage seconds and the job profile build time
+    """
+    totals, profiles = [], []
+    stage_samples = defaultdict(list)
+    for _ in range(repeat):
+        analyzer = ResumeAnalyzer()
+        start = time.perf_counter()
+        profile = analyzer.get_job_profile(corpus.job_description)
+        profiles.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = analyzer.analyze_batch(profile, corpus.resumes, include_timings=True)
+        totals.append(time.perf_counter() - start)
+        for stage in STAGES:
+            stage_samples[stage].append(
+                sum(result["timings"]["stages_ms"].get(stage, 0.0) for result in results) / 1000
+            )
+
+    return {
+        "total_seconds": statistics.median(totals),
+        "job_profile_seconds": statistics.median(profiles),
+        "stage_seconds": {stage: statistics.median(stage_samples[stage]) for stage in STAGES},
+    }
+
+
+def document_size_curve(sizes, n_resumes, repeat, seed):
+    """Per-resume stage times as resume length grows"""
+    points = []
+    for size in sizes:
+        corpus = generate_corpus(seed, n_resumes=n_resumes, resume_words=size)
+        result = run_batch(corpus, repeat)
+        point = {
+            "resume_words": size,
+            "ms_per_resume": 1000 * result["total_seconds"] / n_resumes,
+            "stage_ms_per_resume": {
+                stage: 1000 * seconds / n_resumes for stage, seconds in result["stage_seconds"].items()
+            },
+        }
+        points.append(point)
+        print(f"size {size:>6} words: {point['ms_per_resume']:8.2f} ms/resume")
+    return points
+
+
+def batch_size_curve(batch_sizes, repeat, seed):
+    """Throughput of analyze_batch versus one analyze_resume call per resume"""
+    points = []
+    for batch_size in batch_sizes:
+        corpus = generate_corpus(seed, n_resumes=batch_size)
+        result = run_batch(corpus, repeat)
+
+        analyzer = ResumeAnalyzer()
+        start = time.perf_counter()
+        for resume in corpus.resumes:
+            analyzer.analyze_resume(resume, corpus.job_description)
+        single_seconds = time.perf_counter() - start
+
+        point = {
+            "batch_size": batch_size,
+            "batch_seconds": result["total_seconds"] + result["job_profile_seconds"],
+            "single_calls_seconds": single_seconds,
+        }
+        point["batch_resumes_per_second"] = batch_size / point["batch_seconds"]
+        point["single_resumes_per_second"] = batch_size / single_seconds
+        points.append(point)
+        print(f"batch {batch_size:>5}: {point['batch_resumes_per_second']:8.1f} resumes/s batched, "
+              f"{point['single_resumes_per_second']:8.1f} resumes/s one by one")
+    return points
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+    }
+
+    corpus = generate_corpus(args.seed, n_resumes=args.resumes, resume_words=(150, 900), keyword_density=(0.2, 0.8))
+    result = run_batch(corpus, args.repeat)
+    report["stages"] = {
+        "resumes": args.resumes,
+        "total_seconds": result["total_seconds"],
+        "job_profile_seconds": result["job_profile_seconds"],
+        "stage_seconds": result["stage_seconds"],
+    }
+    print(f"{args.resumes} resumes in {result['total_seconds']:.3f} s")
+    for stage in STAGES:
+        seconds = result["stage_seconds"][stage]
+        print(f"  {stage:<20} {seconds:8.3f} s  {100 * seconds / result['total_seconds']:5.1f}%")
+
+    report["scaling"] = {
+        "document_size": document_size_curve(args.sizes, args.size_resumes, args.repeat, args.seed),
+        "batch_size": batch_size_curve(args.batch_sizes, args.repeat, args.seed),
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {args.output}")
+
+
+def compare(args):
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+
+    print(f"{'stage':<22} {'before s':>10} {'after s':>10} {'speedup':>8}")
+    rows = [("total", before["stages"]["total_seconds"], after["stages"]["total_seconds"])]
+    rows += [
+        (stage, before["stages"]["stage_seconds"].get(stage, 0.0), after["stages"]["stage_seconds"].get(stage, 0.0))
+        for stage in STAGES
+    ]
+    for name, old, new in rows:
+        speedup = f"{old / new:7.2f}x" if new else "    n/a"
+        print(f"{name:<22} {old:>10.3f} {new:>10.3f} {speedup:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmark")
+    run_parser.add_argument("--resumes", type=int, default=100, help="Resumes in the per-stage run")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000, 3000],
+                            help="Resume lengths in words for the document size curve")
+    run_parser.add_argument("--size-resumes", type=int, default=20,
+                            help="Resumes per point of the document size curve")
+    run_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 500])
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", help="Write the report to this JSON file")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="Compare two reports")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Compare similarity modes of ResumeAnalyzer for speed, agreement and memory
+
+Modes: 'pairwise' (per-pair TF-IDF, the reference), 'idf' (corpus IDF model
+fitted on a separate synthetic corpus) and 'hashing' (stateless feature
+hashing). Agreement is measured against 'pairwise' on the same resumes.
+
+Usage:
+    python -m benchmarks.similarity_modes [--resumes 500] [--stream 500 2000] [--output modes.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+import tracemalloc
+from functools import lru_cache
+
+import numpy as np
+
+from utils.idf_model import fit_idf_model
+from utils.resume_analyzer import ResumeAnalyzer
+
+
+@lru_cache(maxsize=None)
+def make_vocabulary(vocabulary_size):
+    """Fixed pseudo-word vocabulary and Zipf weights"""
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+                  for _ in range(vocabulary_size)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+    return vocabulary, weights
+
+
+def make_documents(seed, count, min_words=80, max_words=600, vocabulary_size=4000):
+    """Zipf-distributed pseudo-word documents sharing one vocabulary"""
+    rng = random.Random(seed)
+    vocabulary, weights = make_vocabulary(vocabulary_size)
+    return [" ".join(rng.choices(vocabulary, weights, k=rng.randint(min_words, max_words)))
+            for _ in range(count)]
+
+
+def quiet(func, *args, **kwargs):
+    """Call func with the analyzer's debug output suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def spearman(a, b):
+    """Spearman rank correlation without scipy"""
+    rank_a = np.argsort(np.argsort(a))
+    rank_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def time_mode(analyzer, job, resumes):
+    """Analyze all resumes and return (seconds, similarity scores)"""
+    analyzer.job_profiles.clear()
+    start = time.perf_counter()
+    results = quiet(analyzer.analyze_batch, job, resumes)
+    elapsed = time.perf_counter() - start
+    return elapsed, np.array([result['similarity_score'] for result in results])
+
+
+def time_similarity_stage(analyzer, job, resumes, repeat=3):
+    """Best time of the similarity stage alone, on already preprocessed texts"""
+    processor = analyzer.text_processor
+    processed = quiet(lambda: [processor.preprocess_for_similarity(text) for text in resumes])
+    profile = quiet(analyzer.get_job_profile, job)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        quiet(analyzer._calculate_batch_similarity, processed, profile)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stream_peak_memory(analyzer, job, count, seed):
+    """Peak traced memory while streaming ``count`` generated resumes"""
+    def resumes():
+        for i in range(count):
+            yield make_documents(seed + i, 1)[0]
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in analyzer.iter_analyses(job, resumes(), chunk_size=128):
+            pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--stream", type=int, nargs="+", default=[500, 2000],
+                        help="Resume counts for the streaming memory check")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    job = make_documents(args.seed, 1, 150, 300)[0]
+    resumes = make_documents(args.seed + 1, args.resumes)
+    idf_model = quiet(fit_idf_model, make_documents(args.seed + 2, 1000))
+
+    analyzers = {
+        "pairwise": ResumeAnalyzer(similarity_mode="pairwise"),
+        "idf": ResumeAnalyzer(idf_model=idf_model, similarity_mode="idf"),
+        "hashing": ResumeAnalyzer(similarity_mode="hashing"),
+    }
+
+    report = {"resumes": args.resumes, "modes": {}}
+    reference = None
+    print(f"{'mode':<10} {'total s':>8} {'resumes/s':>10} {'similarity s':>13} {'spearman':>9} "
+          f"{'mean |diff|':>12} {'top-10 overlap':>15}")
+    for mode, analyzer in analyzers.items():
+        elapsed, scores = time_mode(analyzer, job, resumes)
+        if reference is None:
+            reference = scores
+        top_reference = set(np.argsort(-reference, kind="stable")[:10])
+        top_mode = set(np.argsort(-scores, kind="stable")[:10])
+        entry = {
+            "seconds": elapsed,
+            "similarity_stage_seconds": time_similarity_stage(analyzer, job, resumes),
+            "resumes_per_second": args.resumes / elapsed,
+            "spearman_vs_pairwise": spearman(reference, scores),
+            "mean_abs_diff_vs_pairwise": float(np.mean(np.abs(reference - scores))),
+            "top10_overlap_vs_pairwise": len(top_reference & top_mode) / 10,
+        }
+        report["modes"][mode] = entry
+        print(f"{mode:<10} {elapsed:>8.2f} {entry['resumes_per_second']:>10.1f} "
+              f"{entry['similarity_stage_seconds']:>13.3f} {entry['spearman_vs_pairwise']:>9.3f} "
+              f"{entry['mean_abs_diff_vs_pairwise']:>12.2f} {entry['top10_overlap_vs_pairwise']:>15.1f}")
+
+    report["streaming_peak_bytes"] = {}
+    for mode in ("hashing", "pairwise"):
+        report["streaming_peak_bytes"][mode] = {}
+        for count in args.stream:
+            peak = stream_peak_memory(analyzers[mode], job, count, args.seed + 10)
+            report["streaming_peak_bytes"][mode][count] = peak
+            print(f"stream {mode:<9} {count:>6} resumes: peak {peak / 1e6:7.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
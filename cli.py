@@ -0,0 +1,183 @@
+"""
+Headless batch scoring of resumes against job descriptions
+
+Scores every PDF, DOCX and TXT resume in a directory or archive against
+one or more job description files and streams one row per
+(job description, resume) pair as JSON Lines or CSV. Streamlit is never
+imported, so this runs anywhere the analysis dependencies are installed.
+
+    python cli.py resumes/ --jd backend.txt data.pdf --output results.jsonl
+    python cli.py resumes.zip --jd backend.txt --format csv > results.csv
+"""
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import sys
+from pathlib import Path
+
+from utils.documents import extract_text_from_file
+from utils.ingest import ingest_source
+from utils.parallel import ParallelAnalyzer
+from utils.resume_analyzer import ResumeAnalyzer
+
+CSV_FIELDS = [
+    'job_description', 'resume', 'score', 'similarity_score', 'keyword_match_score',
+    'skills_match_score', 'matching_keyword_count', 'missing_keyword_count',
+    'matching_keywords', 'missing_keywords', 'error',
+]
+
+
+class JsonLinesWriter:
+    """Writes one JSON object per row"""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, row):
+        self.file.write(json.dumps(row) + '\n')
+
+
+class CsvWriter:
+    """Writes rows as CSV with keyword lists joined by semicolons"""
+
+    def __init__(self, file):
+        self.writer = csv.DictWriter(file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, row):
+        row = dict(row)
+        for field in ('matching_keywords', 'missing_keywords'):
+            row[field] = ';'.join(row.get(field) or [])
+        self.writer.writerow(row)
+
+
+def load_job_descriptions(paths):
+    """Read job description files into (name, text) pairs, skipping empty ones"""
+    job_descriptions = []
+    for path in paths:
+        text = extract_text_from_file(path)
+        if text.strip():
+            job_descriptions.append((Path(path).name, text))
+        else:
+            print(f"Skipping job description {path}: no text extracted", file=sys.stderr)
+    return job_descriptions
+
+
+def extract_resumes(source, **ingest_kwargs):
+    """
+    Yield (relative name, text, error) for each resume
+
+    Archives are read entry by entry without unpacking them; documents are
+    extracted concurrently (see ``utils.ingest``). Extraction warnings are
+    printed to stderr as they come.
+    """
+    for document in ingest_source(source, **ingest_kwargs):
+        if document.warning:
+            print(f"{document.name}: {document.warning}", file=sys.stderr)
+        yield document.name, document.text, document.error
+
+
+def print_progress(state):
+    """Progress line on stderr every 100 documents and at the end"""
+    if state.done % 100 == 0 or state.done == state.total:
+        total = f"/{state.total}" if state.total is not None else ''
+        print(f"Extracted {state.done}{total} resumes ({state.failed} failed, "
+              f"{state.bytes / state.elapsed / 1e6 if state.elapsed else 0:.1f} MB/s)", file=sys.stderr)
+
+
+def iter_chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_resumes(analyzer, job_descriptions, resumes, chunk_size=64):
+    """
+    Score resumes against each job description
+
+    Resumes are extracted once and scored a chunk at a time against every
+    job description, so memory stays bounded by the chunk size.
+
+    Args:
+        analyzer (ResumeAnalyzer or ParallelAnalyzer): Analyzer to score with
+        job_descriptions (list): (name, text) pairs
+        resumes (iterable): (name, text, error) triples from ``extract_resumes``
+        chunk_size (int): Resumes scored per batch
+
+    Yields:
+        dict: One row per (job description, resume) pair
+    """
+    for chunk in iter_chunks(resumes, chunk_size):
+        scorable = [(name, text) for name, text, error in chunk if error is None]
+        for job_name, job_text in job_descriptions:
+            # Job profiles are cached by the analyzer (or by each worker)
+            results = iter(analyzer.analyze_batch(job_text, [text for _, text in scorable]))
+            for name, _, error in chunk:
+                row = {'job_description': job_name, 'resume': name}
+                if error is None:
+                    row.update(next(results).to_dict())
+                    row['error'] = None
+                else:
+                    row['error'] = error
+                yield row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('resumes', help="Directory, ZIP/tar archive or single resume file")
+    parser.add_argument('--jd', nargs='+', required=True, help="Job description files (TXT, PDF or DOCX)")
+    parser.add_argument('--output', default='-', help="Output file, '-' for stdout (default)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'],
+                        help="Output format (default: from the output suffix, else jsonl)")
+    parser.add_argument('--chunk-size', type=int, default=64,
+                        help="Resumes extracted and scored per batch")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Analysis worker processes; 0 uses every available CPU")
+    parser.add_argument('--cache', action='store_true',
+                        help="Reuse results of earlier runs from the result cache (RESUMEFIT_CACHE_PATH)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    # Library diagnostics go to stderr so they never mix with the rows
+    with contextlib.redirect_stdout(sys.stderr), contextlib.ExitStack() as stack:
+        try:
+            job_descriptions = load_job_descriptions(args.jd)
+            if not job_descriptions:
+                parser.error("no usable job description")
+
+            if args.workers == 1:
+                analyzer = ResumeAnalyzer(result_cache=args.cache)
+            else:
+                # Spawned, since the extraction pool's threads are running
+                # by the time the first chunk starts the workers
+                analyzer = stack.enter_context(ParallelAnalyzer(
+                    workers=args.workers or None, mp_context=multiprocessing.get_context('spawn'),
+                    result_cache=args.cache
+                ))
+            writer = CsvWriter(output) if output_format == 'csv' else JsonLinesWriter(output)
+            # Extraction runs on as many sandboxed workers; a single worker extracts in process
+            resumes = extract_resumes(
+                args.resumes, workers=args.workers or None,
+                max_in_flight=max(args.chunk_size, 2 * (args.workers or 1)), progress=print_progress
+            )
+            rows = 0
+            for rows, row in enumerate(score_resumes(analyzer, job_descriptions, resumes, args.chunk_size), 1):
+                writer.write(row)
+                if rows % args.chunk_size == 0:
+                    output.flush()
+            print(f"Scored {rows // len(job_descriptions)} resumes against {len(job_descriptions)} job descriptions")
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+
+if __name__ == '__main__':
+    main()
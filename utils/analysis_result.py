@@ -0,0 +1,171 @@
+import json
+import sys
+from collections.abc import Mapping
+
+
+class AnalysisResult(Mapping):
+    """
+    Scores, keyword lists and suggestions of one resume analysis
+
+    A slotted replacement for the result dict that stays compatible with
+    dict-style access (``result['score']``, ``result.get(...)``, iteration
+    over keys). Keyword lists are tuples of interned strings capped to a
+    top-k, so results kept in session state or stored in the database do
+    not grow with the job description; the full counts are kept in
+    ``matching_keyword_count`` and ``missing_keyword_count``.
+    """
+
+    __slots__ = (
+        'score', 'similarity_score', 'keyword_match_score', 'skills_match_score',
+        'matching_keywords', 'missing_keywords', 'suggestions',
+        'matching_keyword_count', 'missing_keyword_count',
+        'timings', 'index', 'rank',
+    )
+
+    # Optional fields, only present as keys when set
+    OPTIONAL_FIELDS = ('timings', 'index', 'rank')
+
+    # Field order of the compact form; bump COMPACT_VERSION when it changes
+    COMPACT_VERSION = 1
+    COMPACT_FIELDS = __slots__
+
+    def __init__(self, score, similarity_score, keyword_match_score, skills_match_score,
+                 matching_keywords=(), missing_keywords=(), suggestions=(),
+                 matching_keyword_count=None, missing_keyword_count=None,
+                 timings=None, index=None, rank=None):
+        self.score = float(score)
+        self.similarity_score = float(similarity_score)
+        self.keyword_match_score = float(keyword_match_score)
+        self.skills_match_score = float(skills_match_score)
+        self.matching_keywords = tuple(sys.intern(str(keyword)) for keyword in matching_keywords)
+        self.missing_keywords = tuple(sys.intern(str(keyword)) for keyword in missing_keywords)
+        self.suggestions = tuple(suggestions)
+        self.matching_keyword_count = (
+            len(self.matching_keywords) if matching_keyword_count is None else int(matching_keyword_count)
+        )
+        self.missing_keyword_count = (
+            len(self.missing_keywords) if missing_keyword_count is None else int(missing_keyword_count)
+        )
+        self.timings = timings
+        self.index = index
+        self.rank = rank
+
+    @classmethod
+    def from_keyword_sets(cls, score, similarity_score, keyword_match_score, skills_match_score,
+                          matching_keywords, missing_keywords, suggestions,
+                          max_matching_keywords=None, max_missing_keywords=None):
+        """
+        Build a result from full keyword sets, keeping the top-k of each
+
+        Keywords are kept in sorted order so the same analysis always
+        keeps the same keywords.
+
+        Args:
+            matching_keywords (set): All matched job keywords
+            missing_keywords (set): All job keywords without a match
+            max_matching_keywords (int): Cap on stored matched keywords, None for no cap
+            max_missing_keywords (int): Cap on stored missing keywords, None for no cap
+
+        Returns:
+            AnalysisResult: Result with capped keyword lists and full counts
+        """
+        return cls(
+            score, similarity_score, keyword_match_score, skills_match_score,
+            sorted(matching_keywords)[:max_matching_keywords],
+            sorted(missing_keywords)[:max_missing_keywords],
+            suggestions,
+            matching_keyword_count=len(matching_keywords),
+            missing_keyword_count=len(missing_keywords),
+        )
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None or key not in self.OPTIONAL_FIELDS:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.OPTIONAL_FIELDS:
+            raise KeyError(f"{key!r} cannot be set on an AnalysisResult")
+        setattr(self, key, value)
+
+    def __iter__(self):
+        for key in self.__slots__:
+            if key not in self.OPTIONAL_FIELDS or getattr(self, key) is not None:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, AnalysisResult):
+            return self.to_compact() == other.to_compact()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"AnalysisResult(score={self.score}, keywords={self.matching_keyword_count}/"
+                f"{self.matching_keyword_count + self.missing_keyword_count})")
+
+    def __reduce__(self):
+        return (self.from_compact, (self.to_compact(),))
+
+    def to_dict(self):
+        """Plain dict with list values, for JSON and other dict consumers"""
+        return {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in self.items()
+        }
+
+    def to_compact(self):
+        """
+        Positional list form, smaller than ``to_dict`` when serialized
+
+        Returns:
+            list: Format version followed by the values in ``COMPACT_FIELDS`` order
+        """
+        return [self.COMPACT_VERSION] + [
+            list(value) if isinstance(value, tuple) else value
+            for value in (getattr(self, key) for key in self.COMPACT_FIELDS)
+        ]
+
+    @classmethod
+    def from_compact(cls, compact):
+        """Rebuild a result from ``to_compact`` output"""
+        version, *values = compact
+        if version != cls.COMPACT_VERSION:
+            raise ValueError(f"Unsupported AnalysisResult compact version {version}")
+        return cls(**dict(zip(cls.COMPACT_FIELDS, values)))
+
+    def to_json(self):
+        """Compact JSON encoding of ``to_compact``"""
+        return json.dumps(self.to_compact(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, data):
+        """Rebuild a result from ``to_json`` output"""
+        return cls.from_compact(json.loads(data))
+
+
+def rank_results(results):
+    """
+    Rank analysis results by score
+
+    Args:
+        results (list): Analysis results in input order
+
+    Returns:
+        list: The same results sorted by score (best first), each with
+        ``index`` (position in ``results``) and ``rank`` (1 = best match) set
+    """
+    for index, result in enumerate(results):
+        result['index'] = index
+
+    ranked = sorted(results, key=lambda result: result['score'], reverse=True)
+    for rank, result in enumerate(ranked, 1):
+        result['rank'] = rank
+    return ranked
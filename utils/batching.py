@@ -0,0 +1,119 @@
+"""
+Micro-batching of concurrent analyses that share a job description
+
+Requests arriving within a short window are grouped by job description
+fingerprint and scored as one ``analyze_batch`` call per group, so a burst
+of candidates applying to the same posting pays for the job description
+once and shares one vectorized similarity pass.
+
+    batcher = MicroBatcher(run_batch, window_seconds=0.005)
+    result = await batcher.analyze(resume_text, job_description)
+"""
+import asyncio
+
+from .job_profile import job_fingerprint
+
+
+class MicroBatcher:
+    """Coalesces concurrent asyncio analysis requests into per-job batches"""
+
+    def __init__(self, run_batch, window_seconds=0.005, max_batch_size=256):
+        """
+        Args:
+            run_batch (callable): Coroutine function called as
+                ``run_batch(job_description, resumes, include_timings)`` and
+                returning the results in input order
+            window_seconds (float): How long the first request of a group
+                waits for others to join it
+            max_batch_size (int): Group size that is flushed without waiting
+                for the window to end
+        """
+        self.run_batch = run_batch
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._groups = {}
+        self._tasks = set()
+        self.requests = 0
+        self.batches = 0
+
+    @classmethod
+    def for_analyzer(cls, analyzer, **kwargs):
+        """Batcher running a synchronous ``ResumeAnalyzer`` in the default thread pool"""
+        async def run_batch(job_description, resumes, include_timings):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, lambda: analyzer.analyze_batch(job_description, resumes, include_timings=include_timings)
+            )
+        return cls(run_batch, **kwargs)
+
+    async def analyze(self, resume_text, job_description, include_timings=False):
+        """
+        Analyze one resume, batched with concurrent requests for the same job
+
+        Args:
+            resume_text (str): Resume text
+            job_description (str): Job description text
+            include_timings (bool): Add a ``timings`` section to the result
+
+        Returns:
+            AnalysisResult: Analysis of this resume
+        """
+        self.requests += 1
+        key = (job_fingerprint(job_description), bool(include_timings))
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group(job_description, include_timings)
+            group.timer = asyncio.get_running_loop().call_later(self.window_seconds, self._flush, key)
+
+        future = asyncio.get_running_loop().create_future()
+        group.resumes.append(resume_text)
+        group.futures.append(future)
+        if len(group.resumes) >= self.max_batch_size:
+            self._flush(key)
+        return await future
+
+    @property
+    def average_batch_size(self):
+        return self.requests / self.batches if self.batches else 0.0
+
+    def _flush(self, key):
+        group = self._groups.pop(key, None)
+        if group is None:
+            return
+        group.timer.cancel()
+        self.batches += 1
+        task = asyncio.get_running_loop().create_task(self._run(group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, group):
+        try:
+            results = await self.run_batch(group.job_description, group.resumes, group.include_timings)
+        except Exception as e:
+            for future in group.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(group.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def flush(self):
+        """Run every pending group now and wait for all running batches"""
+        for key in list(self._groups):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class _Group:
+    """Requests waiting to be batched for one job description"""
+
+    __slots__ = ('job_description', 'include_timings', 'resumes', 'futures', 'timer')
+
+    def __init__(self, job_description, include_timings):
+        self.job_description = job_description
+        self.include_timings = include_timings
+        self.resumes = []
+        self.futures = []
+        self.timer = None
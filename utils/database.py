@@ -116,9 +116,9 @@ def save_analysis(session_id, resume_filename, resume_text, job_description, res
             keyword_match_score=keyword_match_score,
             skills_match_score=skills_match_score,
             final_score=final_score,
-            missing_keywords=json.dumps(results.get('missing_keywords', [])),
-            matching_keywords=json.dumps(results.get('matching_keywords', [])),
-            suggestions=json.dumps(results.get('suggestions', []))
+            missing_keywords=json.dumps(list(results.get('missing_keywords', [])), separators=(',', ':')),
+            matching_keywords=json.dumps(list(results.get('matching_keywords', [])), separators=(',', ':')),
+            suggestions=json.dumps(list(results.get('suggestions', [])), separators=(',', ':'))
         )
         
         db.add(analysis)
@@ -0,0 +1,172 @@
+import io
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .extraction_result import ExtractionResult
+from .reporting import report_error
+
+SUPPORTED_SUFFIXES = ('.pdf', '.docx', '.txt')
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+
+class MemoryViewReader(io.RawIOBase):
+    """Seekable read-only binary stream over a buffer, without copying it"""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        chunk = self._view[self._position:self._position + len(target)]
+        target[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+@contextmanager
+def open_binary(source):
+    """
+    Open a document given as a path, in-memory bytes or a binary stream
+
+    Bytes are wrapped without copying. Streams owned by the caller are
+    rewound but not closed.
+
+    Args:
+        source (str, Path, bytes, bytearray, memoryview or binary file object):
+            Document path or contents
+
+    Yields:
+        file object: Seekable binary stream positioned at the start
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield file
+    elif isinstance(source, bytes):
+        # BytesIO shares the buffer of an immutable bytes object
+        with io.BytesIO(source) as file:
+            yield file
+    elif isinstance(source, (bytearray, memoryview)):
+        with MemoryViewReader(source) as file:
+            yield file
+    else:
+        source.seek(0)
+        yield source
+
+
+def extract_text_from_file(path):
+    """
+    Extract text from a PDF, DOCX or TXT file, chosen by its suffix
+
+    Args:
+        path (str or Path): Document path
+
+    Returns:
+        str: Extracted text, empty when nothing could be extracted
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    return extract_document_from_file(path)[0]
+
+
+def extract_document_from_file(path):
+    """
+    Extract text and page count from a PDF, DOCX or TXT file in one parse
+
+    Args:
+        path (str or Path): Document path
+
+    Returns:
+        tuple: (extracted text, page count or None when the format has no
+        pages or it is unknown)
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    result = extract_document(Path(path))
+    report_extraction(result)
+    return result.text, result.page_count
+
+
+def extract_document(source, filename=None, **pdf_options):
+    """
+    Parse a PDF, DOCX or TXT document once into an ``ExtractionResult``
+
+    Validity, text, counts, problems and timings all come from the same
+    parse. Nothing is reported; see ``report_extraction``.
+
+    Args:
+        source (str, Path, bytes, bytearray, memoryview or BytesIO):
+            Document path or contents
+        filename (str): Name whose suffix selects the extractor; defaults
+            to ``source`` when that is a path
+        **pdf_options: Passed to ``extract_pdf_result`` (``max_pages``,
+            ``workers``, ...)
+
+    Returns:
+        ExtractionResult: Outcome of the parse
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    if isinstance(source, os.PathLike):
+        source = os.fspath(source)
+    suffix = Path(filename if filename is not None else source).suffix.lower()
+    if suffix == '.txt':
+        start = time.perf_counter()
+        if isinstance(source, str):
+            text = Path(source).read_text(encoding='utf-8', errors='ignore')
+        else:
+            text = str(source.getbuffer() if isinstance(source, io.BytesIO) else source, 'utf-8', errors='ignore')
+        return ExtractionResult('txt', text.strip(), timings={'total': time.perf_counter() - start})
+    if suffix == '.pdf':
+        from .pdf_extractor import extract_pdf_result
+        return extract_pdf_result(source, **pdf_options)
+    if suffix == '.docx':
+        from .docx_extractor import extract_docx_result
+        return extract_docx_result(source)
+    raise ValueError(f"Unsupported file type: {Path(filename if filename is not None else source).name}")
+
+
+def report_extraction(result):
+    """Report an extraction's error, or what a partial extraction lost, through ``report_error``"""
+    if result.error:
+        report_error(result.error)
+    elif result.problems:
+        report_error(f"{result.format.upper()} extraction incomplete: " + "; ".join(result.problems))
+
+
+def iter_document_paths(directory):
+    """Yield every supported document under a directory in sorted order"""
+    for path in sorted(Path(directory).rglob('*')):
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES and not path.name.startswith('.'):
+            yield path
+
+
+def is_archive(path):
+    """Whether a path names a supported ZIP or tar archive"""
+    name = str(path).lower()
+    return os.path.isfile(path) and name.endswith(ARCHIVE_SUFFIXES)
+
@@ -1,53 +1,215 @@
-from docx import Document
-import streamlit as st
+import time
+import zipfile
+from xml.etree import ElementTree
+from .documents import open_binary, report_extraction
+from .extraction_result import ExtractionResult
 
-def extract_text_from_docx(docx_path):
+EXTENDED_PROPERTIES_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties'
+WORDPROCESSING_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MARKUP_COMPATIBILITY_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+
+_BODY = f'{{{WORDPROCESSING_NS}}}body'
+_PARAGRAPH = f'{{{WORDPROCESSING_NS}}}p'
+_RUN = f'{{{WORDPROCESSING_NS}}}r'
+_TABLE = f'{{{WORDPROCESSING_NS}}}tbl'
+_ROW = f'{{{WORDPROCESSING_NS}}}tr'
+_CELL = f'{{{WORDPROCESSING_NS}}}tc'
+_TEXT = f'{{{WORDPROCESSING_NS}}}t'
+_BREAK = f'{{{WORDPROCESSING_NS}}}br'
+_BREAK_TYPE = f'{{{WORDPROCESSING_NS}}}type'
+_FALLBACK = f'{{{MARKUP_COMPATIBILITY_NS}}}Fallback'
+# DrawingML and legacy VML graphics
+_IMAGES = frozenset([f'{{{WORDPROCESSING_NS}}}drawing', f'{{{WORDPROCESSING_NS}}}pict'])
+
+# Run content rendered as text, as python-docx does for Paragraph.text; the
+# same tags elsewhere (e.g. tab stops under w:pPr) are not text
+_RUN_TEXT = {
+    _TEXT: None,
+    f'{{{WORDPROCESSING_NS}}}tab': '\t',
+    f'{{{WORDPROCESSING_NS}}}cr': '\n',
+    f'{{{WORDPROCESSING_NS}}}noBreakHyphen': '-',
+}
+
+_HANDLED_TAGS = frozenset([_BODY, _PARAGRAPH, _RUN, _TABLE, _ROW, _CELL, _BREAK, _FALLBACK, *_RUN_TEXT, *_IMAGES])
+
+def extract_text_from_docx(source):
     """
     Extract text from a DOCX file
     
     Args:
-        docx_path (str): Path to the DOCX file
+        source (str, bytes, BytesIO or memoryview): Path to the DOCX file or
+            its contents
         
     Returns:
         str: Extracted text from the DOCX
     """
-    try:
-        doc = Document(docx_path)
-        text = ""
+    return extract_docx(source)[0]
+
+def extract_docx(source):
+    """
+    Extract text and page count from a DOCX file
+    
+    Same as ``extract_docx_result``, with errors and problems reported
+    through ``report_extraction``.
+    
+    Args:
+        source (str, bytes, BytesIO or memoryview): Path to the DOCX file or
+            its contents
         
-        # Extract text from all paragraphs
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+    Returns:
+        tuple: (extracted text, page count or None)
+    """
+    result = extract_docx_result(source)
+    report_extraction(result)
+    return result.text, result.page_count
+
+def extract_docx_result(source):
+    """
+    Parse a DOCX file once into its text, counts, problems and timings
+    
+    ``word/document.xml`` is streamed out of the archive with an incremental
+    parser, so paragraphs and tables come out in document order and memory
+    stays flat however large the document is. Each paragraph becomes a
+    line; each table row becomes a line of its cells separated by spaces.
+    
+    DOCX files have no fixed pagination; the page count is the one Word
+    stored in docProps/app.xml when the file was last saved, if any.
+    Nothing is reported; an unreadable file yields a result with ``error``
+    set.
+    
+    Args:
+        source (str, bytes, BytesIO or memoryview): Path to the DOCX file or
+            its contents
         
-        # Extract text from tables if any
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + " "
-                text += "\n"
+    Returns:
+        ExtractionResult: Text, ``page_count``, ``paragraph_count``,
+        ``table_count``, ``problems`` and ``timings``
+    """
+    start = time.perf_counter()
+    timings = {}
+    try:
+        with open_binary(source) as file, zipfile.ZipFile(file) as archive:
+            with archive.open('word/document.xml') as document_xml:
+                timings['open'] = time.perf_counter() - start
+                text, paragraphs, tables, images = _stream_document_text(document_xml)
+            page_count = _stored_page_count(archive)
+    except Exception as e:
+        timings['total'] = time.perf_counter() - start
+        return ExtractionResult('docx', error=f"Error extracting text from DOCX: {str(e)}", timings=timings)
+    
+    text = text.strip()
+    problems = []
+    if images and not text:
+        problems.append(f"document has {images} image{'s' if images > 1 else ''} but no text (scanned?)")
+    timings['total'] = time.perf_counter() - start
+    timings['extract'] = timings['total'] - timings['open']
+    return ExtractionResult(
+        'docx', text, page_count=page_count, paragraph_count=paragraphs, table_count=tables,
+        problems=problems, timings=timings
+    )
+
+def _stream_document_text(document_xml):
+    """
+    Text of a WordprocessingML document body in document order
+    
+    Args:
+        document_xml (file object): ``word/document.xml`` stream
+        
+    Returns:
+        tuple: (text with one line per paragraph and per table row,
+        paragraph count, table count, image count)
+    """
+    lines = []
+    paragraphs = tables = images = 0
+    runs = []       # run texts of each open paragraph (text boxes nest them)
+    open_runs = []  # w:r elements open in each open paragraph
+    cells = []      # lines of each open table cell
+    rows = []       # cell texts of each open table row
+    skipped = 0     # depth inside mc:Fallback, which duplicates mc:Choice
+    body = None
+    
+    for event, element in ElementTree.iterparse(document_xml, events=('start', 'end')):
+        tag = element.tag
+        # Most elements are formatting; reject them with one set lookup
+        if tag not in _HANDLED_TAGS:
+            continue
+        if event == 'start':
+            if tag == _FALLBACK:
+                skipped += 1
+            elif skipped:
+                pass
+            elif tag == _RUN:
+                if open_runs:
+                    open_runs[-1] += 1
+            elif tag == _PARAGRAPH:
+                runs.append([])
+                open_runs.append(0)
+            elif tag == _CELL:
+                cells.append([])
+            elif tag == _ROW:
+                rows.append([])
+            elif tag == _BODY:
+                body = element
+            continue
         
-        return text.strip()
+        if tag == _FALLBACK:
+            skipped -= 1
+        elif skipped:
+            continue
+        elif tag == _RUN:
+            if open_runs:
+                open_runs[-1] -= 1
+        elif tag in _RUN_TEXT:
+            if open_runs and open_runs[-1]:
+                runs[-1].append((element.text or '') if tag == _TEXT else _RUN_TEXT[tag])
+        elif tag == _BREAK:
+            # Page and column breaks end no line of text
+            if open_runs and open_runs[-1] and element.get(_BREAK_TYPE, 'textWrapping') == 'textWrapping':
+                runs[-1].append('\n')
+        elif tag == _PARAGRAPH:
+            open_runs.pop()
+            line = ''.join(runs.pop())
+            (cells[-1] if cells else lines).append(line)
+            paragraphs += 1
+        elif tag == _CELL:
+            cell = '\n'.join(cells.pop())
+            if rows:
+                rows[-1].append(cell)
+        elif tag == _ROW:
+            line = ''.join(cell + ' ' for cell in rows.pop())
+            (cells[-1] if cells else lines).append(line)
+        elif tag == _TABLE:
+            tables += 1
+        elif tag in _IMAGES:
+            images += 1
         
-    except Exception as e:
-        st.error(f"Error extracting text from DOCX: {str(e)}")
-        return ""
+        # Drop finished top-level blocks so the parsed tree never grows
+        if body is not None and tag in (_PARAGRAPH, _TABLE) and not runs and not cells:
+            body.clear()
+    
+    return '\n'.join(lines), paragraphs, tables, images
 
-def validate_docx(docx_path):
+def _stored_page_count(archive):
+    """Page count recorded in docProps/app.xml, or None"""
+    try:
+        root = ElementTree.fromstring(archive.read('docProps/app.xml'))
+        pages = root.find(f'{{{EXTENDED_PROPERTIES_NS}}}Pages')
+        return int(pages.text) if pages is not None and pages.text else None
+    except (KeyError, ValueError, ElementTree.ParseError):
+        return None
+
+def validate_docx(source):
     """
     Validate if the DOCX file is readable
     
+    Callers that also need the text should use ``extract_docx_result`` and
+    check ``valid`` instead of parsing the file twice.
+    
     Args:
-        docx_path (str): Path to the DOCX file
+        source (str, bytes, BytesIO or memoryview): Path to the DOCX file or
+            its contents
         
     Returns:
         bool: True if DOCX is valid, False otherwise
     """
-    try:
-        doc = Document(docx_path)
-        # Try to access the first paragraph
-        if len(doc.paragraphs) > 0:
-            doc.paragraphs[0].text
-            return True
-        return False
-    except:
-        return False
\ No newline at end of file
+    return extract_docx_result(source).valid
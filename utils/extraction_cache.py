@@ -0,0 +1,109 @@
+"""
+Cache of extracted document text keyed by a hash of the file bytes
+
+Re-renders and repeat uploads of the same file reuse the stored text, page
+count and original extraction time instead of parsing the document again.
+Entries live in the ``extraction`` namespace of the result cache (see
+``utils.result_cache`` for the RESUMEFIT_CACHE_* settings).
+
+    cache = TwoTierCache.from_env(namespace=EXTRACTION_NAMESPACE)
+    extraction = extract_with_cache(uploaded_bytes, "resume.pdf", cache)
+    extraction['text'], extraction['page_count'], extraction['cached']
+"""
+import hashlib
+import importlib.metadata
+import io
+import time
+from pathlib import Path
+
+from .documents import extract_document, report_extraction
+from .profiling import call_profiled
+from .reporting import report_error
+from .result_cache import content_hash, source_fingerprint
+
+EXTRACTION_NAMESPACE = 'extraction'
+
+# Modules and parser distributions whose behavior determines extracted text
+EXTRACTION_MODULES = tuple(f"{__package__}.{name}" for name in ('documents', 'pdf_extractor', 'docx_extractor'))
+PARSER_DISTRIBUTIONS = ('PyPDF2',)
+
+_version = None
+
+
+def extraction_version():
+    """
+    Fingerprint of the extraction code and parser library versions
+
+    Returns:
+        str: Hex SHA-256 digest, computed once per process
+    """
+    global _version
+    if _version is None:
+        # Import the lazily loaded extractors so their source is hashed
+        from . import docx_extractor, pdf_extractor  # noqa: F401
+        versions = []
+        for name in PARSER_DISTRIBUTIONS:
+            try:
+                versions.append(f"{name}=={importlib.metadata.version(name)}")
+            except importlib.metadata.PackageNotFoundError:
+                versions.append(f"{name} missing")
+        _version = content_hash(source_fingerprint(EXTRACTION_MODULES), *versions)
+    return _version
+
+
+def extraction_cache_key(data, filename):
+    """Cache key of a document's extraction: file bytes hash, type and extractor version"""
+    if isinstance(data, io.BytesIO):
+        data = data.getbuffer()
+    return content_hash(extraction_version(), Path(filename).suffix.lower(), hashlib.sha256(data).digest())
+
+
+def extract_with_cache(data, filename, cache=None, sandbox=None):
+    """
+    Extract text from an in-memory document, reusing a cached extraction
+
+    Args:
+        data (bytes, bytearray, memoryview or BytesIO): File contents
+        filename (str): Original file name; its suffix selects the extractor
+        cache (TwoTierCache): Extraction cache, or None to always extract
+        sandbox (SandboxPool): Extract in a resource-limited worker instead
+            of this process; documents it cuts off yield empty text
+
+    Extractions (not cache hits) are sampled for profiling as
+    ``extract_<suffix>`` wherever they run (see ``utils.profiling``).
+    Failed extractions and those with failed or timed-out pages are not
+    cached, since a retry (e.g. on a less busy server) may succeed.
+
+    Returns:
+        dict: ``text``, ``page_count`` (None if unknown), ``problems`` (what
+        a partial extraction lost, e.g. image-only pages), ``error`` (why
+        the document could not be parsed, else None),
+        ``extraction_seconds`` of the original extraction and ``cached``
+        (True when served from the cache)
+    """
+    key = extraction_cache_key(data, filename) if cache is not None else None
+    if key is not None:
+        entry = cache.get(key)
+        if entry is not None:
+            return dict(entry, cached=True)
+
+    start = time.perf_counter()
+    profile_name = f"extract_{Path(filename).suffix.lower().lstrip('.')}"
+    if sandbox is None:
+        result = call_profiled(profile_name, extract_document, data, filename)
+    else:
+        from .sandbox import SandboxError
+        if isinstance(data, io.BytesIO):
+            data = data.getbuffer()
+        try:
+            result = sandbox.run(call_profiled, profile_name, extract_document, bytes(data), filename)
+        except SandboxError as e:
+            report_error(f"Could not extract {filename}: {e}")
+            return {'text': '', 'page_count': None, 'problems': [str(e)], 'error': str(e),
+                    'extraction_seconds': time.perf_counter() - start, 'cached': False}
+    report_extraction(result)
+    entry = {'text': result.text, 'page_count': result.page_count, 'problems': result.problems,
+             'error': result.error, 'extraction_seconds': time.perf_counter() - start}
+    if key is not None and result.error is None and not result.failed_pages:
+        cache.set(key, entry)
+    return dict(entry, cached=False)
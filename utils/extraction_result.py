@@ -0,0 +1,69 @@
+class ExtractionResult:
+    """
+    Everything one parse of a document yields
+
+    Extractors fill this in a single pass, so checking that a document is
+    readable, getting its text and describing what went wrong never parse
+    it twice. ``error`` is set when the document could not be parsed at
+    all; ``problems`` lists what was lost from a parsed one (failed or
+    image-only pages, truncation).
+    """
+
+    __slots__ = (
+        'text', 'format', 'page_count', 'pages_extracted', 'paragraph_count', 'table_count',
+        'failed_pages', 'image_only_pages', 'problems', 'error', 'timings',
+    )
+
+    def __init__(self, format, text='', page_count=None, pages_extracted=None, paragraph_count=None,
+                 table_count=None, failed_pages=(), image_only_pages=(), problems=(), error=None, timings=None):
+        self.format = format
+        self.text = text
+        self.page_count = page_count
+        self.pages_extracted = pages_extracted
+        self.paragraph_count = paragraph_count
+        self.table_count = table_count
+        self.failed_pages = list(failed_pages)
+        self.image_only_pages = list(image_only_pages)
+        self.problems = list(problems)
+        self.error = error
+        # Seconds per stage: 'open' (parse of the container), 'extract', 'total'
+        self.timings = timings or {}
+
+    @property
+    def character_count(self):
+        return len(self.text)
+
+    @property
+    def valid(self):
+        """Whether the document parsed and at least one page or paragraph could be read"""
+        if self.error is not None:
+            return False
+        if self.pages_extracted is not None:
+            return len(self.failed_pages) < self.pages_extracted
+        if self.paragraph_count is not None:
+            return self.paragraph_count > 0
+        return True
+
+    @property
+    def has_text(self):
+        return bool(self.text.strip())
+
+    def __repr__(self):
+        status = f"error={self.error!r}" if self.error else f"{len(self.problems)} problems"
+        return f"ExtractionResult({self.format}, {self.character_count} chars, {status})"
+
+    def to_dict(self):
+        """Plain dict for JSON, without the text itself"""
+        return {
+            'format': self.format,
+            'characters': self.character_count,
+            'page_count': self.page_count,
+            'pages_extracted': self.pages_extracted,
+            'paragraph_count': self.paragraph_count,
+            'table_count': self.table_count,
+            'failed_pages': self.failed_pages,
+            'image_only_pages': self.image_only_pages,
+            'problems': self.problems,
+            'error': self.error,
+            'timings': self.timings,
+        }
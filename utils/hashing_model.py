@@ -0,0 +1,42 @@
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashingModel:
+    """
+    Stateless feature-hashing vectors for similarity scoring
+
+    Terms are hashed into a fixed number of columns, so there is no
+    vocabulary to build, store or copy between processes and memory does
+    not grow with the number of documents scored. There is no IDF
+    weighting; term frequencies are sublinear and vectors L2-normalized.
+    """
+
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 2), sublinear_tf=True):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.sublinear_tf = sublinear_tf
+        self._hasher = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=self.ngram_range,
+            alternate_sign=False,
+            norm=None,
+            lowercase=True,
+            dtype=np.float64
+        )
+
+    def transform(self, documents):
+        """
+        Convert preprocessed texts to L2-normalized hashed TF vectors
+
+        Args:
+            documents (list): Preprocessed texts
+
+        Returns:
+            scipy.sparse.csr_matrix: One row per document
+        """
+        counts = self._hasher.transform(documents)
+        if self.sublinear_tf:
+            counts.data = np.log(counts.data) + 1
+        return normalize(counts, norm='l2', copy=False)
@@ -0,0 +1,200 @@
+"""
+Corpus IDF model for similarity scoring
+
+IDF statistics are fitted offline on a corpus of resumes and job
+descriptions and saved as a compact ``.npz`` artifact, so scoring only
+transforms texts and scores stay stable across requests.
+
+Fit a model from a folder of documents or from stored analyses:
+
+    python -m utils.idf_model --from-dir resumes/ --output models/idf_model.npz
+    python -m utils.idf_model --from-db --output models/idf_model.npz
+
+Then set RESUMEFIT_IDF_MODEL=models/idf_model.npz (or pass ``idf_model`` to
+``ResumeAnalyzer``).
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from .documents import extract_text_from_file, iter_document_paths
+from .text_processor import get_text_processor
+
+
+class IdfModel:
+    """Fitted vocabulary and IDF weights applied with transform only"""
+
+    def __init__(self, terms, idf, ngram_range=(1, 2), sublinear_tf=True, document_count=0):
+        self.terms = list(terms)
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.ngram_range = tuple(ngram_range)
+        self.sublinear_tf = sublinear_tf
+        self.document_count = document_count
+        self._counter = CountVectorizer(
+            vocabulary={term: i for i, term in enumerate(self.terms)},
+            ngram_range=self.ngram_range,
+            lowercase=True
+        )
+
+    @classmethod
+    def fit(cls, documents, ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=50000, sublinear_tf=True):
+        """
+        Fit IDF statistics on a corpus
+
+        Args:
+            documents (list): Texts already passed through
+                ``TextProcessor.preprocess_for_similarity``
+            ngram_range (tuple): n-gram range of the vocabulary
+            min_df (int or float): Minimum document frequency of a term
+            max_df (int or float): Maximum document frequency of a term
+            max_features (int): Vocabulary size cap
+            sublinear_tf (bool): Use 1 + log(tf) term weighting
+
+        Returns:
+            IdfModel: Fitted model
+        """
+        documents = [document for document in documents if document and document.strip()]
+        if len(documents) < 2:
+            raise ValueError("At least two non-empty documents are needed to fit an IDF model")
+
+        # min_df larger than the corpus would prune everything on tiny corpora
+        if isinstance(min_df, int):
+            min_df = min(min_df, len(documents))
+
+        vectorizer = TfidfVectorizer(
+            ngram_range=ngram_range,
+            min_df=min_df,
+            max_df=max_df,
+            max_features=max_features,
+            sublinear_tf=sublinear_tf,
+            lowercase=True
+        )
+        vectorizer.fit(documents)
+        terms = vectorizer.get_feature_names_out()
+        return cls(terms, vectorizer.idf_, ngram_range, sublinear_tf, len(documents))
+
+    def transform(self, documents):
+        """
+        Convert preprocessed texts to L2-normalized TF-IDF vectors
+
+        Args:
+            documents (list): Preprocessed texts
+
+        Returns:
+            scipy.sparse.csr_matrix: One row per document
+        """
+        counts = self._counter.transform(documents).astype(np.float64)
+        if self.sublinear_tf:
+            counts.data = np.log(counts.data) + 1
+        return normalize(counts.multiply(self.idf).tocsr(), norm='l2', copy=False)
+
+    def save(self, path):
+        """Save the model as a compressed .npz artifact"""
+        params = {
+            "ngram_range": list(self.ngram_range),
+            "sublinear_tf": self.sublinear_tf,
+            "document_count": self.document_count,
+        }
+        np.savez_compressed(
+            path,
+            terms=np.frombuffer("\n".join(self.terms).encode("utf-8"), dtype=np.uint8),
+            idf=self.idf.astype(np.float32),
+            params=np.frombuffer(json.dumps(params).encode("utf-8"), dtype=np.uint8)
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a model saved with ``save``"""
+        with np.load(path) as artifact:
+            terms_blob = artifact["terms"].tobytes().decode("utf-8")
+            terms = terms_blob.split("\n") if terms_blob else []
+            params = json.loads(artifact["params"].tobytes().decode("utf-8"))
+            idf = artifact["idf"]
+        return cls(terms, idf, **params)
+
+    def __len__(self):
+        return len(self.terms)
+
+
+def load_default_idf_model():
+    """
+    Load the model named by the RESUMEFIT_IDF_MODEL environment variable
+
+    Returns:
+        IdfModel or None: Loaded model, or None when the variable is unset
+        or the file cannot be read
+    """
+    path = os.environ.get("RESUMEFIT_IDF_MODEL")
+    if not path:
+        return None
+    try:
+        return IdfModel.load(path)
+    except Exception as e:
+        print(f"Could not load IDF model from {path}: {e}")
+        return None
+
+
+def iter_directory_documents(directory):
+    """Yield the text of every TXT, PDF and DOCX file under a directory"""
+    for path in iter_document_paths(directory):
+        yield extract_text_from_file(path)
+
+
+def iter_database_documents():
+    """Yield resume and job description texts stored in the resume_analyses table"""
+    from .database import SessionLocal, ResumeAnalysis
+
+    db = SessionLocal()
+    try:
+        query = db.query(ResumeAnalysis.resume_text, ResumeAnalysis.job_description)
+        for resume_text, job_description in query.yield_per(500):
+            if resume_text:
+                yield resume_text
+            if job_description:
+                yield job_description
+    finally:
+        db.close()
+
+
+def fit_idf_model(texts, **params):
+    """
+    Preprocess raw texts and fit an IdfModel on them
+
+    Args:
+        texts (iterable): Raw resume and job description texts
+        **params: Passed to ``IdfModel.fit``
+
+    Returns:
+        IdfModel: Fitted model
+    """
+    processor = get_text_processor()
+    return IdfModel.fit([processor.preprocess_for_similarity(text) for text in texts], **params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit a corpus IDF model for ResumeAnalyzer")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-dir", help="Folder of TXT, PDF and DOCX documents")
+    source.add_argument("--from-db", action="store_true", help="Use texts stored in the resume_analyses table")
+    parser.add_argument("--output", required=True, help="Path of the .npz artifact to write")
+    parser.add_argument("--min-df", type=int, default=2)
+    parser.add_argument("--max-df", type=float, default=0.95)
+    parser.add_argument("--max-features", type=int, default=50000)
+    args = parser.parse_args()
+
+    texts = iter_database_documents() if args.from_db else iter_directory_documents(args.from_dir)
+    model = fit_idf_model(texts, min_df=args.min_df, max_df=args.max_df, max_features=args.max_features)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    model.save(output)
+    print(f"Fitted IDF model on {model.document_count} documents, {len(model)} terms -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Bulk ingestion of resume archives
+
+Entries are streamed out of ZIP and tar archives one at a time (nothing is
+unpacked to disk), extracted concurrently on a pool of sandboxed worker
+processes (see ``utils.sandbox``) with a bounded number of documents in
+flight, and yielded in archive order with a per-file error instead of
+aborting the batch.
+
+    for document in ingest_source("resumes.zip", progress=print_progress):
+        if document.error is None:
+            texts.append(document.text)
+"""
+import contextlib
+import os
+import tarfile
+import time
+import zipfile
+from collections import deque
+from pathlib import Path, PurePosixPath
+
+from .documents import SUPPORTED_SUFFIXES, extract_document, is_archive, iter_document_paths
+
+# Entries larger than this (uncompressed) are reported instead of extracted
+DEFAULT_MAX_FILE_BYTES = 20 * 1024 * 1024
+
+# Supported entries read from one archive at most
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class IngestedDocument:
+    """Outcome of extracting one document of a bulk upload"""
+
+    __slots__ = ('name', 'text', 'error', 'warning', 'size', 'page_count', 'seconds')
+
+    def __init__(self, name, text='', error=None, warning=None, size=0, page_count=None, seconds=0.0):
+        self.name = name
+        self.text = text
+        self.error = error
+        self.warning = warning
+        self.size = size
+        self.page_count = page_count
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = 'ok' if self.ok else f'error={self.error!r}'
+        return f"IngestedDocument({self.name!r}, {len(self.text)} chars, {status})"
+
+
+class IngestProgress:
+    """Running totals passed to the progress callback after every document"""
+
+    __slots__ = ('done', 'total', 'failed', 'bytes', 'elapsed', 'document')
+
+    def __init__(self, total):
+        self.done = 0
+        self.total = total
+        self.failed = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.document = None
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 1.0
+
+
+def _is_wanted(name):
+    path = PurePosixPath(name)
+    return (
+        path.suffix.lower() in SUPPORTED_SUFFIXES
+        and not any(part.startswith('.') or part == '__MACOSX' for part in path.parts)
+    )
+
+
+def _read_limited(file, size, max_file_bytes):
+    """Read an entry, refusing it if it is (or turns out to be) too large"""
+    if size > max_file_bytes:
+        return None
+    # Declared sizes can lie; never read more than the limit
+    data = file.read(max_file_bytes + 1)
+    return data if len(data) <= max_file_bytes else None
+
+
+def iter_archive_entries(source, max_file_bytes=DEFAULT_MAX_FILE_BYTES, max_entries=DEFAULT_MAX_ENTRIES):
+    """
+    Stream the supported documents of a ZIP or tar archive
+
+    Args:
+        source (str, Path or binary file object): Archive
+        max_file_bytes (int): Largest uncompressed entry read
+        max_entries (int): Supported entries read at most
+
+    Yields:
+        tuple: (entry name, contents or None, error or None)
+    """
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            infos = [info for info in archive.infolist() if not info.is_dir() and _is_wanted(info.filename)]
+            for count, info in enumerate(infos):
+                if count >= max_entries:
+                    yield info.filename, None, f"skipped: archive has more than {max_entries} documents"
+                    continue
+                try:
+                    with archive.open(info) as file:
+                        data = _read_limited(file, info.file_size, max_file_bytes)
+                except (zipfile.BadZipFile, RuntimeError, OSError, EOFError) as e:
+                    yield info.filename, None, f"{type(e).__name__}: {e}"
+                    continue
+                error = None if data is not None else f"larger than {max_file_bytes} bytes"
+                yield info.filename, data, error
+        return
+
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    kwargs = {'fileobj': source} if hasattr(source, 'read') else {'name': source}
+    # 'r|*' reads the (possibly compressed) tar stream front to back
+    with tarfile.open(mode='r|*', **kwargs) as archive:
+        count = 0
+        for member in archive:
+            if not member.isfile() or not _is_wanted(member.name):
+                continue
+            count += 1
+            if count > max_entries:
+                yield member.name, None, f"skipped: archive has more than {max_entries} documents"
+                continue
+            data = _read_limited(archive.extractfile(member), member.size, max_file_bytes)
+            yield member.name, data, None if data is not None else f"larger than {max_file_bytes} bytes"
+
+
+def count_archive_entries(source):
+    """Number of supported documents in a ZIP archive, or None for tar streams"""
+    if not zipfile.is_zipfile(source):
+        return None
+    with zipfile.ZipFile(source) as archive:
+        return sum(1 for info in archive.infolist() if not info.is_dir() and _is_wanted(info.filename))
+
+
+def iter_directory_entries(root, paths, max_file_bytes=DEFAULT_MAX_FILE_BYTES):
+    """Read documents from disk as ``iter_archive_entries`` entries named relative to ``root``"""
+    root = Path(root)
+    for path in paths:
+        name = str(path.relative_to(root)) if path != root else path.name
+        try:
+            with open(path, 'rb') as file:
+                data = _read_limited(file, os.fstat(file.fileno()).st_size, max_file_bytes)
+        except OSError as e:
+            yield name, None, f"{type(e).__name__}: {e}"
+            continue
+        yield name, data, None if data is not None else f"larger than {max_file_bytes} bytes"
+
+
+def extract_entry(name, data):
+    """
+    Pool task: extract one document
+
+    PDF pages are extracted in this process; the ingest pool already keeps
+    every CPU busy with whole documents. An unreadable document, or one
+    without text, gets an error; what a partial extraction lost (e.g.
+    image-only pages) becomes the warning.
+
+    Returns:
+        IngestedDocument: Extraction outcome
+    """
+    start = time.perf_counter()
+    try:
+        result = extract_document(data, name, workers=0)
+    except Exception as e:
+        return IngestedDocument(name, error=f"{type(e).__name__}: {e}", size=len(data),
+                                seconds=time.perf_counter() - start)
+    problems = '; '.join(result.problems) or None
+    if result.has_text:
+        error, warning = None, problems
+    else:
+        error, warning = result.error or problems or 'no text extracted', None
+    return IngestedDocument(name, result.text, error, warning, len(data), result.page_count,
+                            time.perf_counter() - start)
+
+
+def ingest(entries, executor=None, workers=None, max_in_flight=None, progress=None, total=None):
+    """
+    Extract documents concurrently, yielding them in input order
+
+    Args:
+        entries (iterable): (name, contents or None, error or None) triples,
+            e.g. from ``iter_archive_entries``
+        executor: Object with a ``submit(fn, *args)`` method returning a
+            future (a ``SandboxPool``, a ``concurrent.futures`` executor or
+            ``ParallelAnalyzer``); by default a ``SandboxPool`` of
+            ``workers`` processes is started and shut down here
+        workers (int): Processes of the default pool; 1 extracts in this process
+        max_in_flight (int): Documents read ahead of the consumer at most
+            (default: twice the worker count), which bounds memory
+        progress (callable): Called with an ``IngestProgress`` after each document
+        total (int): Expected document count, reported through ``progress``
+
+    Yields:
+        IngestedDocument: One per entry, failed ones with ``error`` set
+    """
+    from .parallel import default_worker_count
+    from .sandbox import SandboxPool
+
+    workers = workers or default_worker_count()
+    state = IngestProgress(total)
+    start = time.perf_counter()
+
+    def finished(name, size, pending):
+        if isinstance(pending, IngestedDocument):
+            document = pending
+        else:
+            try:
+                document = pending.result()
+            except Exception as e:
+                # Timed out, crashed or ran out of memory in its worker
+                document = IngestedDocument(name, error=f"{type(e).__name__}: {e}", size=size)
+        state.done += 1
+        state.failed += not document.ok
+        state.bytes += document.size
+        state.elapsed = time.perf_counter() - start
+        state.document = document
+        if progress is not None:
+            progress(state)
+        return document
+
+    with contextlib.ExitStack() as stack:
+        if executor is None and workers > 1:
+            executor = stack.enter_context(SandboxPool.from_env(workers=workers))
+        window = deque()
+        limit = max_in_flight or 2 * workers
+        for name, data, error in entries:
+            if error is not None:
+                pending = IngestedDocument(name, error=error, size=len(data or b''))
+            elif executor is None:
+                pending = extract_entry(name, data)
+            else:
+                pending = executor.submit(extract_entry, name, data)
+            window.append((name, len(data or b''), pending))
+            while len(window) >= limit or (window and isinstance(window[0][2], IngestedDocument)):
+                yield finished(*window.popleft())
+        while window:
+            yield finished(*window.popleft())
+
+
+def ingest_source(source, max_file_bytes=None, max_entries=None, **kwargs):
+    """
+    Ingest a directory, ZIP/tar archive (path or uploaded file object) or single document
+
+    Args:
+        source (str, Path or binary file object): What to ingest
+        max_file_bytes (int): Largest document read
+            (RESUMEFIT_INGEST_MAX_FILE_BYTES, default 20 MiB)
+        max_entries (int): Documents read from an archive at most
+            (RESUMEFIT_INGEST_MAX_ENTRIES, default 10000)
+        **kwargs: Passed to ``ingest``
+
+    Yields:
+        IngestedDocument: One per document, in directory or archive order
+    """
+    if max_file_bytes is None:
+        max_file_bytes = int(os.environ.get('RESUMEFIT_INGEST_MAX_FILE_BYTES') or DEFAULT_MAX_FILE_BYTES)
+    if max_entries is None:
+        max_entries = int(os.environ.get('RESUMEFIT_INGEST_MAX_ENTRIES') or DEFAULT_MAX_ENTRIES)
+    if hasattr(source, 'read') or is_archive(source):
+        total = count_archive_entries(source)
+        entries = iter_archive_entries(source, max_file_bytes, max_entries)
+    else:
+        path = Path(source)
+        if path.is_dir():
+            paths = list(iter_document_paths(path))
+            entries = iter_directory_entries(path, paths, max_file_bytes)
+        elif path.is_file():
+            paths = [path]
+            entries = iter_directory_entries(path.parent, paths, max_file_bytes)
+        else:
+            raise FileNotFoundError(f"No such file or directory: {source}")
+        total = len(paths)
+    kwargs.setdefault('total', total)
+    yield from ingest(entries, **kwargs)
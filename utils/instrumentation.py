@@ -0,0 +1,279 @@
+"""
+Per-stage timing and item counts for the analysis pipeline
+
+``ResumeAnalyzer`` asks its instrumentation hook for one timings object per
+analysis and wraps each stage in ``timings.stage(name)``. The default hook
+is ``NULL_INSTRUMENTATION``, whose stages are a shared no-op context
+manager, so disabled instrumentation costs a few attribute lookups per
+stage. ``Instrumentation`` records wall time and item counts and publishes
+them to process-wide histograms that can be rendered in the Prometheus
+text format:
+
+    from utils.instrumentation import METRICS
+    print(METRICS.render_prometheus())
+
+Set RESUMEFIT_INSTRUMENTATION=1 to enable it for analyzers created without
+an explicit ``instrumentation`` argument.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Histogram upper bounds for stage durations in seconds
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Histogram upper bounds for item counts (keywords, skills, loop iterations)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a running sum and count"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other):
+        """Add another histogram with the same buckets to this one"""
+        self.bucket_counts = [a + b for a, b in zip(self.bucket_counts, other.bucket_counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def as_dict(self):
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.bucket_counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+# Metric name, label name and buckets of every histogram family
+_FAMILIES = (
+    ("stage_seconds", "stage", SECONDS_BUCKETS),
+    ("stage_items", "item", COUNT_BUCKETS),
+    ("http_request_seconds", "route", SECONDS_BUCKETS),
+)
+
+
+class MetricsRegistry:
+    """
+    Thread-safe process-wide histograms
+
+    ``stage_seconds`` and ``stage_items`` hold analysis stage durations and
+    item counts, ``http_request_seconds`` the API's request latency per
+    route. Worker processes ``drain`` their histograms and the parent
+    ``merge``s them, so one registry can cover a whole process pool.
+    """
+
+    def __init__(self, prefix="resumefit"):
+        self.prefix = prefix
+        self._histograms = {metric: {} for metric, _, _ in _FAMILIES}
+        self._lock = threading.Lock()
+
+    def _histogram(self, metric, key, buckets):
+        histograms = self._histograms[metric]
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+    def observe(self, seconds, counts):
+        """
+        Record the stage durations and item counts of one analysis
+
+        Args:
+            seconds (dict): Stage name to wall time in seconds
+            counts (dict): Item name to count
+        """
+        with self._lock:
+            for stage, value in seconds.items():
+                self._histogram("stage_seconds", stage, SECONDS_BUCKETS).observe(value)
+            for item, value in counts.items():
+                self._histogram("stage_items", item, COUNT_BUCKETS).observe(value)
+
+    def observe_request(self, route, seconds):
+        """Record the latency of one HTTP request"""
+        with self._lock:
+            self._histogram("http_request_seconds", route, SECONDS_BUCKETS).observe(seconds)
+
+    def drain(self):
+        """
+        Remove and return everything recorded so far
+
+        Returns:
+            dict or None: Metric name to {label value: Histogram}, for
+            ``merge`` in another process; None when nothing was recorded
+        """
+        with self._lock:
+            if not any(self._histograms.values()):
+                return None
+            drained = self._histograms
+            self._histograms = {metric: {} for metric, _, _ in _FAMILIES}
+        return drained
+
+    def merge(self, drained):
+        """Add histograms returned by another registry's ``drain``"""
+        if not drained:
+            return
+        with self._lock:
+            for metric, histograms in drained.items():
+                for key, histogram in histograms.items():
+                    self._histogram(metric, key, histogram.buckets).merge(histogram)
+
+    def snapshot(self):
+        """Return all histograms as plain dicts"""
+        with self._lock:
+            return {
+                metric: {key: h.as_dict() for key, h in histograms.items()}
+                for metric, histograms in self._histograms.items()
+            }
+
+    def render_prometheus(self):
+        """Render all histograms in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for metric, label, _ in _FAMILIES:
+            name = f"{self.prefix}_{metric}"
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in sorted(snapshot[metric].items()):
+                for bound, count in histogram["buckets"].items():
+                    lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{{label}="{key}"}} {histogram["sum"]}')
+                lines.append(f'{name}_count{{{label}="{key}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop all recorded observations"""
+        with self._lock:
+            for histograms in self._histograms.values():
+                histograms.clear()
+
+
+METRICS = MetricsRegistry()
+
+
+class _Stage:
+    """Context manager adding its wall time to one stage of an AnalysisTimings"""
+
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class AnalysisTimings:
+    """Stage durations and item counts of one analysis"""
+
+    def __init__(self, registry=None):
+        self.registry = registry
+        self.seconds = {}
+        self.counts = {}
+
+    def stage(self, name):
+        """Context manager timing one stage; repeated stages accumulate"""
+        return _Stage(self, name)
+
+    def add_time(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def count(self, name, value):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def publish(self):
+        """Add this analysis to the registry histograms"""
+        if self.registry is not None:
+            self.registry.observe(self.seconds, self.counts)
+
+    def as_dict(self):
+        """
+        Timings section of an analysis result
+
+        Returns:
+            dict: ``total_ms``, per-stage ``stages_ms`` and item ``counts``
+        """
+        return {
+            "total_ms": round(sum(self.seconds.values()) * 1000, 3),
+            "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in self.seconds.items()},
+            "counts": dict(self.counts),
+        }
+
+
+class _NullTimings:
+    """Timings object that records nothing"""
+
+    __slots__ = ()
+
+    _stage = nullcontext()
+
+    def stage(self, name):
+        return self._stage
+
+    def add_time(self, name, seconds):
+        pass
+
+    def count(self, name, value):
+        pass
+
+    def publish(self):
+        pass
+
+    def as_dict(self):
+        return None
+
+
+NULL_TIMINGS = _NullTimings()
+
+
+class Instrumentation:
+    """Hook creating one AnalysisTimings per analysis, published to a registry"""
+
+    enabled = True
+
+    def __init__(self, registry=METRICS):
+        self.registry = registry
+
+    def start(self):
+        return AnalysisTimings(self.registry)
+
+
+class NullInstrumentation:
+    """Disabled hook; every analysis shares the no-op timings object"""
+
+    enabled = False
+
+    def start(self):
+        return NULL_TIMINGS
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+def default_instrumentation():
+    """
+    Instrumentation selected by the RESUMEFIT_INSTRUMENTATION environment variable
+
+    Returns:
+        Instrumentation or NullInstrumentation: Recording hook when the
+        variable is "1", "true" or "yes", otherwise the no-op hook
+    """
+    if os.environ.get("RESUMEFIT_INSTRUMENTATION", "").lower() in ("1", "true", "yes"):
+        return Instrumentation()
+    return NULL_INSTRUMENTATION
@@ -0,0 +1,82 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+
+def job_fingerprint(job_description):
+    """
+    Content hash identifying a job description
+
+    Args:
+        job_description (str): Job description text
+
+    Returns:
+        str: Hex SHA-256 digest of the text
+    """
+    return hashlib.sha256((job_description or "").encode("utf-8")).hexdigest()
+
+
+class JobProfile:
+    """Job description analyzed once and reused for every candidate scored against it"""
+
+    def __init__(self, text, processed_text, keywords, skills, term_counts, fingerprint=None):
+        self.text = text
+        self.fingerprint = fingerprint or job_fingerprint(text)
+        self.processed_text = processed_text
+        # Interned so results built from this profile share the keyword strings
+        self.keywords = frozenset(sys.intern(keyword) for keyword in keywords)
+        self.skills = frozenset(skills)
+        # Unigram term frequencies of processed_text, i.e. the job side of the
+        # TF-IDF vectors used for similarity scoring
+        self.term_counts = dict(term_counts)
+        self.term_count_sq_sum = float(sum(count * count for count in self.term_counts.values()))
+        # Row vector under the analyzer's IDF or hashing model, when one is in use
+        self.similarity_vector = None
+
+    def __repr__(self):
+        return f"JobProfile({self.fingerprint[:12]}, keywords={len(self.keywords)}, skills={len(self.skills)})"
+
+
+class JobProfileCache:
+    """Thread-safe bounded LRU cache of JobProfile objects keyed by content hash"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, job_description, build):
+        """
+        Return the cached profile for a job description, building it on a miss
+
+        Args:
+            job_description (str): Job description text
+            build (callable): Called with (job_description, fingerprint) on a miss
+
+        Returns:
+            JobProfile: Profile for the job description
+        """
+        fingerprint = job_fingerprint(job_description)
+        with self._lock:
+            profile = self._profiles.get(fingerprint)
+            if profile is not None:
+                self._profiles.move_to_end(fingerprint)
+                return profile
+
+        profile = build(job_description, fingerprint)
+
+        with self._lock:
+            self._profiles[fingerprint] = profile
+            self._profiles.move_to_end(fingerprint)
+            while len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def clear(self):
+        """Drop all cached profiles"""
+        with self._lock:
+            self._profiles.clear()
+
+    def __len__(self):
+        return len(self._profiles)
@@ -0,0 +1,135 @@
+from collections import Counter, defaultdict
+
+
+class KeywordIndex:
+    """
+    Precomputed lookup structures over a resume's keywords
+
+    A job keyword matches when some resume keyword is equal to it or, with
+    both at least 3 characters long, when one contains the other, when both
+    are multi-word terms sharing at least 70% of the job keyword's words,
+    or when both are at least 5 characters long and at least 80% of the
+    shorter one's characters occur in the longer one. ``match`` answers
+    each job keyword with index lookups instead of comparing it against
+    every resume keyword.
+    """
+
+    MIN_PARTIAL_LENGTH = 3
+    MIN_FUZZY_LENGTH = 5
+    WORD_OVERLAP_RATIO = 0.7
+    CHAR_OVERLAP_RATIO = 0.8
+
+    def __init__(self, keywords):
+        self.keywords = {kw.lower() for kw in keywords}
+        eligible = {kw for kw in self.keywords if len(kw) >= self.MIN_PARTIAL_LENGTH}
+        self._eligible = eligible
+        # Job keywords that needed the partial and fuzzy rules, for instrumentation
+        self.partial_checks = 0
+        self.fuzzy_checks = 0
+
+        # Containment of a job keyword in any resume keyword is a single
+        # substring search over all keywords joined by a separator that
+        # cannot occur inside a keyword
+        self._joined = "\n".join(kw for kw in eligible if "\n" not in kw)
+        self._lengths = sorted({len(kw) for kw in eligible})
+
+        # Token inverted index over multi-word keywords
+        self._word_index = defaultdict(list)
+        multi_word_count = 0
+        for kw in eligible:
+            words = set(kw.split())
+            if len(words) > 1:
+                for word in words:
+                    self._word_index[word].append(multi_word_count)
+                multi_word_count += 1
+
+        # Character-signature buckets for the fuzzy rule. When the resume
+        # keyword is the longer one only its character set matters; when it
+        # is the shorter one only its character counts matter.
+        self._charsets_by_length = defaultdict(set)
+        self._char_counts_by_length = defaultdict(set)
+        for kw in eligible:
+            if len(kw) >= self.MIN_FUZZY_LENGTH:
+                self._charsets_by_length[len(kw)].add(frozenset(kw))
+                self._char_counts_by_length[len(kw)].add(tuple(Counter(kw).items()))
+
+    def match(self, job_keywords):
+        """
+        Find job keywords matched by the indexed resume keywords
+
+        Args:
+            job_keywords (iterable): Job description keywords
+
+        Returns:
+            set: Lowercased job keywords that have a match
+        """
+        matching = set()
+        for job_kw in job_keywords:
+            job_kw = job_kw.lower()
+            if job_kw in self.keywords:
+                matching.add(job_kw)
+                continue
+            self.partial_checks += 1
+            if self._partial_match(job_kw):
+                matching.add(job_kw)
+        return matching
+
+    def _partial_match(self, job_kw):
+        """Whether any indexed keyword partially matches a job keyword"""
+        length = len(job_kw)
+        if length < self.MIN_PARTIAL_LENGTH or not self._eligible:
+            return False
+
+        # Fuzzy rule with equal lengths always passes: the "shorter" and
+        # "longer" keyword both resolve to the job keyword itself
+        if length >= self.MIN_FUZZY_LENGTH and length in self._charsets_by_length:
+            return True
+
+        # Job keyword contained in a resume keyword
+        if "\n" not in job_kw and job_kw in self._joined:
+            return True
+
+        # Resume keyword contained in the job keyword
+        for sub_length in self._lengths:
+            if sub_length > length:
+                break
+            for start in range(length - sub_length + 1):
+                if job_kw[start:start + sub_length] in self._eligible:
+                    return True
+
+        # Word-level overlap for multi-word terms
+        job_words = set(job_kw.split())
+        if len(job_words) > 1:
+            threshold = len(job_words) * self.WORD_OVERLAP_RATIO
+            overlaps = Counter()
+            for word in job_words:
+                overlaps.update(self._word_index.get(word, ()))
+            if any(overlap >= threshold for overlap in overlaps.values()):
+                return True
+
+        if length >= self.MIN_FUZZY_LENGTH:
+            self.fuzzy_checks += 1
+            return self._fuzzy_match(job_kw)
+        return False
+
+    def _fuzzy_match(self, job_kw):
+        """Character-overlap rule against keywords of a different length"""
+        length = len(job_kw)
+        job_chars = set(job_kw)
+        job_char_counts = Counter(job_kw).items()
+
+        for other_length, charsets in self._charsets_by_length.items():
+            if other_length > length:
+                # Job keyword is the shorter one: count its characters found in the resume keyword
+                for charset in charsets:
+                    common = sum(count for char, count in job_char_counts if char in charset)
+                    if common / length >= self.CHAR_OVERLAP_RATIO:
+                        return True
+            elif other_length < length:
+                # Resume keyword is the shorter one: count its characters found in the job keyword
+                for char_counts in self._char_counts_by_length[other_length]:
+                    common = sum(count for char, count in char_counts if char in job_chars)
+                    if common / other_length >= self.CHAR_OVERLAP_RATIO:
+                        return True
+
+        return False
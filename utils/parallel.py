@@ -0,0 +1,224 @@
+"""
+Parallel resume analysis on a pool of worker processes
+
+Each worker builds its own ``ResumeAnalyzer`` once in the pool initializer
+and warms it up (tokenizer probe, skills automaton, scikit-learn imports)
+before the first task arrives. Resumes are sent in chunks sized to keep
+every worker busy while still benefiting from batched similarity scoring,
+and results are returned in input order. Stage metrics recorded by the
+workers (see ``utils.instrumentation``) are merged into this process's
+``METRICS`` as their chunks complete.
+
+    with ParallelAnalyzer(workers=8) as analyzer:
+        results = analyzer.analyze_batch(job_description, resumes)
+"""
+import math
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from .analysis_result import rank_results
+from .instrumentation import METRICS
+from .job_profile import JobProfile
+
+# Largest chunk sent to one worker; matches ResumeAnalyzer.iter_analyses
+MAX_CHUNK_SIZE = 256
+
+# Chunks per worker for a batch, so uneven chunk costs still balance out
+CHUNKS_PER_WORKER = 4
+
+_WARMUP_RESUME = (
+    "Software engineer with 5 years of experience. Developed and optimized Python services, "
+    "led a team of 4 people and reduced latency by 30% using SQL and AWS."
+)
+_WARMUP_JOB = (
+    "We are hiring a software engineer experienced with Python, SQL and AWS to develop "
+    "and optimize backend services and lead small teams."
+)
+
+# Analyzer of the current worker process, built by _init_worker
+_worker_analyzer = None
+
+
+def default_worker_count():
+    """Number of CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _init_worker(analyzer_kwargs):
+    """Pool initializer: build and warm up this worker's analyzer"""
+    global _worker_analyzer
+    from .resume_analyzer import ResumeAnalyzer
+
+    _worker_analyzer = ResumeAnalyzer(**analyzer_kwargs)
+    # Bypass the result cache so every worker runs the full pipeline once
+    _worker_analyzer._analyze_uncached(_WARMUP_JOB, [_WARMUP_RESUME])
+    _worker_analyzer.job_profiles.clear()
+    METRICS.reset()
+
+
+def _analyze_chunk(job_description, resumes, include_timings):
+    """Pool task: analyze one chunk; returns its results and the worker's metrics since the last chunk"""
+    results = _worker_analyzer.analyze_batch(job_description, resumes, include_timings=include_timings)
+    return results, METRICS.drain()
+
+
+def _merge_chunk_metrics(chunk_future):
+    """Future of a chunk's results, merging the metrics shipped with them into ``METRICS``"""
+    results = Future()
+
+    def done(future):
+        if future.cancelled():
+            results.cancel()
+            return
+        try:
+            chunk, metrics = future.result()
+        except BaseException as e:
+            results.set_exception(e)
+            return
+        METRICS.merge(metrics)
+        results.set_result(chunk)
+
+    chunk_future.add_done_callback(done)
+    return results
+
+
+class ParallelAnalyzer:
+    """
+    Process-pool counterpart of ``ResumeAnalyzer``'s batch methods
+
+    Workers keep their own job profile caches, so repeated chunks for the
+    same job description only ship its text.
+    """
+
+    def __init__(self, workers=None, chunk_size=None, mp_context=None, **analyzer_kwargs):
+        """
+        Args:
+            workers (int): Worker processes; defaults to the usable CPU count
+            chunk_size (int): Fixed resumes per task; by default chosen per
+                batch from its size and the worker count
+            mp_context: multiprocessing context for the pool
+            **analyzer_kwargs: Passed to each worker's ``ResumeAnalyzer``
+        """
+        self.workers = workers or default_worker_count()
+        self.chunk_size = chunk_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(analyzer_kwargs,)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def warm_up(self):
+        """Block until every worker has started and built its analyzer"""
+        futures = [self._executor.submit(os.getpid) for _ in range(self.workers)]
+        return {future.result() for future in futures}
+
+    def _chunk_size_for(self, count):
+        if self.chunk_size:
+            return self.chunk_size
+        return max(1, min(MAX_CHUNK_SIZE, math.ceil(count / (self.workers * CHUNKS_PER_WORKER))))
+
+    def submit(self, fn, *args):
+        """Run a picklable function in a worker; returns a concurrent.futures.Future"""
+        return self._executor.submit(fn, *args)
+
+    def submit_batch(self, job_description, resumes, include_timings=False, chunk_size=None):
+        """
+        Start analyzing resumes without waiting for the results
+
+        Used by asyncio callers, which wrap the returned futures with
+        ``asyncio.wrap_future`` instead of blocking on them.
+
+        Returns:
+            list: One future per chunk, each resolving to that chunk's
+            results; chunks are in input order
+        """
+        if isinstance(job_description, JobProfile):
+            job_description = job_description.text
+        resumes = list(resumes)
+        chunk_size = chunk_size or self._chunk_size_for(len(resumes))
+        return [
+            self._submit_chunk(job_description, resumes[start:start + chunk_size], include_timings)
+            for start in range(0, len(resumes), chunk_size)
+        ]
+
+    def _submit_chunk(self, job_description, resumes, include_timings):
+        return _merge_chunk_metrics(self._executor.submit(_analyze_chunk, job_description, resumes, include_timings))
+
+    def analyze_batch(self, job_description, resumes, include_timings=False):
+        """
+        Analyze many resumes against one job description in parallel
+
+        Args:
+            job_description (str or JobProfile): Job description text or its profile
+            resumes (list): Resume texts
+            include_timings (bool): Add a ``timings`` section to each result
+
+        Returns:
+            list: Analysis results in the same order as ``resumes``
+        """
+        resumes = list(resumes)
+        return list(self.iter_analyses(
+            job_description, resumes, chunk_size=self._chunk_size_for(len(resumes)),
+            include_timings=include_timings
+        ))
+
+    def iter_analyses(self, job_description, resumes, chunk_size=None, include_timings=False):
+        """
+        Stream analyses of many resumes, in input order
+
+        At most two chunks per worker are in flight, so any iterable can be
+        processed with bounded memory.
+
+        Args:
+            job_description (str or JobProfile): Job description text or its profile
+            resumes (iterable): Resume texts
+            chunk_size (int): Resumes per task; defaults to ``chunk_size`` or
+                ``MAX_CHUNK_SIZE``
+            include_timings (bool): Add a ``timings`` section to each result
+
+        Yields:
+            AnalysisResult: Analysis results in the same order as ``resumes``
+        """
+        if isinstance(job_description, JobProfile):
+            job_description = job_description.text
+        chunk_size = chunk_size or self.chunk_size or MAX_CHUNK_SIZE
+        max_in_flight = 2 * self.workers
+        pending = deque()
+
+        chunk = []
+        for resume_text in resumes:
+            chunk.append(resume_text)
+            if len(chunk) >= chunk_size:
+                pending.append(self._submit_chunk(job_description, chunk, include_timings))
+                chunk = []
+                while len(pending) >= max_in_flight:
+                    yield from pending.popleft().result()
+        if chunk:
+            pending.append(self._submit_chunk(job_description, chunk, include_timings))
+        while pending:
+            yield from pending.popleft().result()
+
+    def rank_resumes(self, job_description, resumes, include_timings=False):
+        """
+        Rank many resumes against one job description in parallel
+
+        Returns:
+            list: Results sorted by score (best first) with ``index`` and
+            ``rank`` fields, as from ``ResumeAnalyzer.rank_resumes``
+        """
+        return rank_results(self.analyze_batch(job_description, resumes, include_timings=include_timings))
@@ -1,49 +1,410 @@
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 import PyPDF2
-import streamlit as st
+from .documents import open_binary, report_extraction
+from .extraction_result import ExtractionResult
 
-def extract_text_from_pdf(pdf_path):
+# Limits applied to every PDF; hostile or oversized files are cut off
+# instead of stalling a worker or exhausting memory
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_CHARS = 200000
+DEFAULT_PAGE_TIMEOUT = 10.0
+
+# Documents with at least this many pages are extracted across the page pool
+PARALLEL_MIN_PAGES = 8
+
+# Page pool shared by all extractions in this process, created on first use.
+# A pool that is replaced (broken, stuck or resized) is only shut down once
+# no extraction still uses it
+_pool = None
+_pool_workers = 0
+_pool_users = {}
+_pool_lock = threading.Lock()
+
+# How often the parent checks page range deadlines
+POOL_POLL_INTERVAL = 0.05
+
+# Page ranges still queued after this many range budgets are given up, in
+# case the pool is clogged by workers stuck outside any page budget
+QUEUE_BUDGETS = 4
+
+
+# Once a page's budget is spent, the alarm repeats this often until the page exits
+PAGE_TIMEOUT_REPEAT = 0.05
+
+
+class PageTimeout(BaseException):
+    """
+    Raised inside a page extraction that exceeded its time budget
+    
+    A BaseException, so PyPDF2's many ``except Exception`` blocks cannot
+    swallow it.
+    """
+
+def extract_text_from_pdf(source):
     """
     Extract text from a PDF file
     
     Args:
-        pdf_path (str): Path to the PDF file
+        source (str, bytes, BytesIO or memoryview): Path to the PDF file or
+            its contents
         
     Returns:
         str: Extracted text from the PDF
     """
-    try:
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            # Extract text from all pages
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
-        
-        return text.strip()
+    return extract_pdf(source)[0]
+
+def extract_pdf(source, max_pages=None, max_chars=None, page_timeout=None, workers=None):
+    """
+    Extract text and page count from a PDF file in one parse
+    
+    Same as ``extract_pdf_result`` (see there for the arguments), with
+    errors and problems reported through ``report_extraction``.
         
-    except Exception as e:
-        st.error(f"Error extracting text from PDF: {str(e)}")
-        return ""
+    Returns:
+        tuple: (extracted text, page count); ("", None) if the PDF is unreadable
+    """
+    result = extract_pdf_result(source, max_pages, max_chars, page_timeout, workers)
+    report_extraction(result)
+    return result.text, result.page_count
 
-def validate_pdf(pdf_path):
+def extract_pdf_result(source, max_pages=None, max_chars=None, page_timeout=None, workers=None):
     """
-    Validate if the PDF file is readable
+    Parse a PDF once into its text, counts, problems and timings
+    
+    Pages are collected into a list and joined once. Large documents are
+    split into page ranges extracted on a process pool; each page gets a
+    time budget, and pages that fail or run out of time are skipped and
+    listed in ``problems`` instead of failing the whole document, as are
+    image-only pages (scans without a text layer). Nothing is reported;
+    an unreadable PDF yields a result with ``error`` set.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        source (str, bytes, BytesIO or memoryview): Path to the PDF file or
+            its contents
+        max_pages (int): Pages extracted at most (RESUMEFIT_PDF_MAX_PAGES,
+            default 50)
+        max_chars (int): Characters returned at most (RESUMEFIT_PDF_MAX_CHARS,
+            default 200000)
+        page_timeout (float): Seconds allowed per page, 0 for no limit
+            (RESUMEFIT_PDF_PAGE_TIMEOUT, default 10)
+        workers (int): Page pool processes (RESUMEFIT_PDF_WORKERS, default
+            up to 4 CPUs); 0 always extracts in this process
         
     Returns:
-        bool: True if PDF is valid, False otherwise
+        ExtractionResult: Text, ``page_count``, ``pages_extracted``,
+        ``image_only_pages``, ``problems`` and ``timings``
     """
+    max_pages = _setting(max_pages, "RESUMEFIT_PDF_MAX_PAGES", DEFAULT_MAX_PAGES, int)
+    max_chars = _setting(max_chars, "RESUMEFIT_PDF_MAX_CHARS", DEFAULT_MAX_CHARS, int)
+    page_timeout = _setting(page_timeout, "RESUMEFIT_PDF_PAGE_TIMEOUT", DEFAULT_PAGE_TIMEOUT, float)
+    workers = _setting(workers, "RESUMEFIT_PDF_WORKERS", None, int)
+    if workers is None:
+        from .parallel import default_worker_count
+        workers = min(4, default_worker_count())
+
+    start = time.perf_counter()
+    timings = {}
     try:
-        with open(pdf_path, 'rb') as file:
+        with open_binary(source) as file:
             pdf_reader = PyPDF2.PdfReader(file)
-            # Try to access the first page
-            if len(pdf_reader.pages) > 0:
-                pdf_reader.pages[0].extract_text()
-                return True
+            page_count = len(pdf_reader.pages)
+            pages_to_read = min(page_count, max_pages)
+            timings["open"] = time.perf_counter() - start
+            results = None
+            if not _use_pool(pages_to_read, page_timeout, workers):
+                results = _extract_pages(pdf_reader, range(pages_to_read), page_timeout, max_chars)
+        if results is None:
+            results = _extract_pages_in_pool(source, pages_to_read, page_timeout, max_chars, workers)
+    except PageTimeout:
+        # A page deadline that went off outside its page
+        timings["total"] = time.perf_counter() - start
+        return ExtractionResult("pdf", error="Error extracting text from PDF: timed out", timings=timings)
+    except Exception as e:
+        timings["total"] = time.perf_counter() - start
+        return ExtractionResult("pdf", error=f"Error extracting text from PDF: {str(e)}", timings=timings)
+
+    texts, problems, failed, image_only, remaining = [], [], [], [], max_chars
+    for page_num, (page_text, problem, no_text_layer, page_failed) in enumerate(results, 1):
+        if problem:
+            problems.append(problem)
+        if page_failed:
+            failed.append(page_num)
+        if no_text_layer:
+            image_only.append(page_num)
+        if remaining > 0 and page_text:
+            texts.append(page_text[:remaining])
+            remaining -= len(texts[-1])
+    if image_only:
+        pages = ", ".join(map(str, image_only))
+        problems.append(f"page{'s' if len(image_only) > 1 else ''} {pages} "
+                        f"{'are' if len(image_only) > 1 else 'is'} image-only (no text layer)")
+    if page_count > pages_to_read:
+        problems.append(f"only the first {pages_to_read} of {page_count} pages were extracted")
+    if remaining <= 0:
+        problems.append(f"text reached the {max_chars} character limit")
+    timings["total"] = time.perf_counter() - start
+    timings["extract"] = timings["total"] - timings["open"]
+
+    return ExtractionResult(
+        "pdf", "".join(texts).strip(), page_count=page_count, pages_extracted=len(results),
+        failed_pages=failed, image_only_pages=image_only, problems=problems, timings=timings
+    )
+
+def _setting(value, variable, default, cast):
+    if value is not None:
+        return value
+    configured = os.environ.get(variable)
+    return cast(configured) if configured else default
+
+def _can_alarm():
+    """Whether per-page timeouts can be enforced with SIGALRM in this thread"""
+    return (hasattr(signal, "setitimer") and hasattr(signal, "pthread_sigmask")
+            and threading.current_thread() is threading.main_thread())
+
+def _use_pool(page_count, page_timeout, workers):
+    if workers <= 0 or page_count == 0:
         return False
-    except:
+    if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+        return True
+    # Threads (e.g. Streamlit's script runner) cannot time out a page in
+    # process, so they hand even small documents to the pool
+    return bool(page_timeout) and not _can_alarm()
+
+class _PageDeadline:
+    """
+    Raises PageTimeout in the main thread once the budget runs out
+    
+    The timer keeps firing until the block exits, in case a bare
+    ``except:`` in the parser still swallows the first PageTimeout.
+    Expiries that land in the deadline's own setup and teardown are
+    ignored, so none escapes once the block is left.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds if seconds and _can_alarm() else 0
+
+    def __enter__(self):
+        if self.seconds:
+            self._previous = signal.signal(signal.SIGALRM, self._expire)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds, PAGE_TIMEOUT_REPEAT)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.seconds:
+            blocked = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+            try:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                # Ignoring SIGALRM discards an expiry that is already pending
+                signal.signal(signal.SIGALRM, signal.SIG_IGN)
+                signal.signal(signal.SIGALRM, self._previous)
+            finally:
+                signal.pthread_sigmask(signal.SIG_SETMASK, blocked)
+
+    @staticmethod
+    def _expire(signum, frame):
+        # signal's Python wrappers may be the innermost frames, so look up the stack
+        while frame is not None:
+            if frame.f_code in _DEADLINE_CODE:
+                return
+            frame = frame.f_back
+        raise PageTimeout()
+
+_DEADLINE_CODE = frozenset([_PageDeadline.__enter__.__code__, _PageDeadline.__exit__.__code__])
+
+def _extract_pages(pdf_reader, page_numbers, page_timeout, max_chars):
+    """
+    Extract pages one by one, each within its time budget
+    
+    Returns:
+        list: (page text, problem or None, image-only flag, failed flag)
+        per page, stopping early once ``max_chars`` characters were collected
+    """
+    results, total = [], 0
+    for page_num in page_numbers:
+        try:
+            with _PageDeadline(page_timeout):
+                page = pdf_reader.pages[page_num]
+                page_text = page.extract_text() or ""
+                no_text_layer = not page_text.strip() and _has_images(page)
+        except PageTimeout:
+            results.append(("", f"page {page_num + 1} timed out after {page_timeout:g} s", False, True))
+            continue
+        except Exception as e:
+            results.append(("", f"page {page_num + 1} failed: {e}", False, True))
+            continue
+        page_text = page_text[:max_chars - total]
+        total += len(page_text)
+        results.append((page_text, None, no_text_layer, False))
+        if total >= max_chars:
+            break
+    return results
+
+def _has_images(page):
+    """Whether a page draws image XObjects, i.e. an empty one is a scan rather than blank"""
+    try:
+        resources = page.get("/Resources")
+        xobjects = resources.get_object().get("/XObject") if resources is not None else None
+        if xobjects is None:
+            return False
+        xobjects = xobjects.get_object()
+        return any(xobjects[name].get_object().get("/Subtype") == "/Image" for name in xobjects)
+    except Exception:
         return False
+
+def _extract_page_range(source, start, stop, page_timeout, max_chars):
+    """Pool task: extract pages [start, stop) of a PDF path or contents"""
+    with open_binary(source) as file:
+        return _extract_pages(PyPDF2.PdfReader(file), range(start, stop), page_timeout, max_chars)
+
+def _picklable(source):
+    """Path or bytes form of a source that can be sent to pool workers"""
+    if isinstance(source, (str, bytes)):
+        return source
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "read"):
+        source.seek(0)
+        return source.read()
+    return bytes(source)
+
+def _acquire_pool(workers):
+    """The shared page pool, registered as used by the caller until ``_release_pool``"""
+    global _pool, _pool_workers
+    unused = None
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            previous = _pool
+            # Spawned workers are safe to start from threaded hosts like Streamlit
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+            _pool_users[_pool] = 0
+            if previous is not None and _pool_users[previous] == 0:
+                del _pool_users[previous]
+                unused = previous
+        _pool_users[_pool] += 1
+        pool = _pool
+    if unused is not None:
+        _shutdown_pool(unused)
+    return pool
+
+def _release_pool(pool, broken=False):
+    """
+    Stop using a pool; a broken one (stuck or dead workers) is replaced for
+    new callers and shut down once its last user releases it
+    """
+    global _pool
+    with _pool_lock:
+        _pool_users[pool] -= 1
+        if broken and _pool is pool:
+            _pool = None
+        unused = pool is not _pool and _pool_users[pool] == 0
+        if unused:
+            del _pool_users[pool]
+    if unused:
+        _shutdown_pool(pool)
+
+def _shutdown_pool(pool):
+    """Shut down a pool nobody uses, killing workers still stuck on a page"""
+    # The executor has no public way to stop busy workers
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _extract_pages_in_pool(source, page_count, page_timeout, max_chars, workers):
+    """Extract contiguous page ranges concurrently, one range per worker"""
+    if page_count == 0:
+        return []
+    data = _picklable(source)
+    chunk = math.ceil(page_count / min(workers, page_count))
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    pool = _acquire_pool(workers)
+    broken = False
+    try:
+        futures = [pool.submit(_extract_page_range, data, start, stop, page_timeout, max_chars)
+                   for start, stop in ranges]
+        expired = _wait_for_ranges(futures, page_timeout * (chunk + 1) if page_timeout else None)
+
+        results = []
+        for (start, stop), future in zip(ranges, futures):
+            pages = f"page {start + 1}" if stop - start == 1 else f"pages {start + 1}-{stop}"
+            if future in expired:
+                broken = True
+                problem = f"{pages} timed out"
+            else:
+                try:
+                    results.extend(future.result())
+                    continue
+                except BrokenProcessPool as e:
+                    broken = True
+                    problem = f"{pages} failed: {e}"
+                except Exception as e:
+                    problem = f"{pages} failed: {e}"
+            # One problem for the range, one result per page so numbering holds
+            results.append(("", problem, False, True))
+            results.extend(("", None, False, True) for _ in range(start + 1, stop))
+        return results
+    finally:
+        _release_pool(pool, broken)
+
+def _wait_for_ranges(futures, budget):
+    """
+    Wait for page range futures, giving each ``budget`` seconds from when it
+    starts running rather than from submission, so ranges queued behind
+    other documents' work are not cut short
+    
+    Workers enforce per-page budgets themselves; this only catches a range
+    (parse time included) that overran all of them.
+    
+    Returns:
+        set: Futures that ran past their budget
+    """
+    pending, expired = set(futures), set()
+    if budget is None:
+        wait(pending)
+        return expired
+    # A future is marked running when it enters the pool's call queue, which
+    # holds at most one task more than there are workers; that task may wait
+    # for another range to finish first, so allow for one more budget
+    budget *= 2
+    submitted, started = time.monotonic(), {}
+    while pending:
+        _, pending = wait(pending, timeout=POOL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        now = time.monotonic()
+        for future in list(pending):
+            if future not in started and future.running():
+                started[future] = now
+            if future in started:
+                overdue = now - started[future] > budget
+            else:
+                overdue = now - submitted > QUEUE_BUDGETS * budget
+            if overdue:
+                future.cancel()
+                pending.discard(future)
+                expired.add(future)
+    return expired
+
+def validate_pdf(source):
+    """
+    Validate if the PDF file is readable
+    
+    Only the first page is extracted. Callers that also need the text
+    should use ``extract_pdf_result`` and check ``valid`` instead of
+    parsing the file twice.
+    
+    Args:
+        source (str, bytes, BytesIO or memoryview): Path to the PDF file or
+            its contents
+        
+    Returns:
+        bool: True if PDF is valid, False otherwise
+    """
+    return extract_pdf_result(source, max_pages=1, workers=0).valid
@@ -0,0 +1,154 @@
+"""
+Sampled profiling capture for slow inputs
+
+When RESUMEFIT_PROFILE_SAMPLE_RATE is set to a fraction between 0 and 1,
+that share of requests wrapped in ``profile_request`` is run under cProfile
+and tracemalloc. Each sampled request writes a capture directory holding:
+
+    profile.prof     cProfile stats (load with ``pstats.Stats``)
+    memory.snapshot  tracemalloc snapshot (load with ``tracemalloc.Snapshot.load``)
+    meta.json        input hash and size, elapsed time, peak memory, top allocations
+
+Captures go to RESUMEFIT_PROFILE_DIR (default ``profiles``), and only the
+newest RESUMEFIT_PROFILE_KEEP (default 100) are kept. Unsampled requests
+pay for one random draw.
+
+Work handed to another process (e.g. sandboxed extraction) is profiled
+where it runs by sending ``call_profiled`` as the job.
+"""
+import cProfile
+import datetime
+import hashlib
+import json
+import os
+import random
+import shutil
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_PROFILE_KEEP = 100
+
+# cProfile and tracemalloc are process-wide, so only one capture runs at a time;
+# requests sampled while another capture is running are not profiled
+_capture_lock = threading.Lock()
+
+
+def _sample_rate():
+    try:
+        return float(os.environ.get("RESUMEFIT_PROFILE_SAMPLE_RATE", "0") or 0)
+    except ValueError:
+        return 0.0
+
+
+def _payload_bytes(payload):
+    """Encode a request input for hashing and size accounting"""
+    if payload is None:
+        return b""
+    if isinstance(payload, str):
+        return payload.encode("utf-8")
+    if isinstance(payload, (list, tuple)):
+        return b"\0".join(_payload_bytes(part) for part in payload)
+    if isinstance(payload, (bytes, memoryview)):
+        return payload
+    return bytes(payload)
+
+
+@contextmanager
+def profile_request(name, payload, sample_rate=None, directory=None, keep=None):
+    """
+    Profile a block of work for a sampled fraction of requests
+
+    Args:
+        name (str): Short label of the work, e.g. "extract_pdf" or "analyze"
+        payload (bytes, str or list): Request input, hashed and measured in
+            the capture metadata
+        sample_rate (float): Fraction of requests to profile; defaults to
+            RESUMEFIT_PROFILE_SAMPLE_RATE
+        directory (str): Capture directory; defaults to RESUMEFIT_PROFILE_DIR
+        keep (int): Number of captures to keep; defaults to RESUMEFIT_PROFILE_KEEP
+
+    Yields:
+        bool: Whether this request is being profiled
+    """
+    rate = _sample_rate() if sample_rate is None else sample_rate
+    if rate <= 0 or random.random() >= rate or not _capture_lock.acquire(blocking=False):
+        yield False
+        return
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    error = None
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield True
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            _write_capture(
+                Path(directory or os.environ.get("RESUMEFIT_PROFILE_DIR") or DEFAULT_PROFILE_DIR),
+                name, _payload_bytes(payload), profiler, snapshot,
+                {"elapsed_seconds": elapsed, "peak_memory_bytes": peak, "sample_rate": rate, "error": error},
+                keep if keep is not None else int(os.environ.get("RESUMEFIT_PROFILE_KEEP") or DEFAULT_PROFILE_KEEP)
+            )
+        except Exception as e:
+            print(f"Could not write profiling capture: {e}")
+        finally:
+            _capture_lock.release()
+
+
+def call_profiled(name, fn, *args):
+    """
+    Call ``fn(*args)`` under ``profile_request``, the first argument being the payload
+
+    A module-level function, so worker processes can run it as a job and
+    capture the real work instead of the caller waiting on a pipe.
+    """
+    with profile_request(name, args[0] if args else None):
+        return fn(*args)
+
+
+def _write_capture(directory, name, payload, profiler, snapshot, meta, keep):
+    """Write one capture directory and drop the oldest captures beyond ``keep``"""
+    digest = hashlib.sha256(payload).hexdigest()
+    timestamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    capture = directory / f"{timestamp}-{name}-{digest[:12]}"
+    capture.mkdir(parents=True, exist_ok=True)
+
+    profiler.dump_stats(str(capture / "profile.prof"))
+    snapshot.dump(str(capture / "memory.snapshot"))
+
+    top_allocations = [
+        {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:15]
+    ]
+    meta = {
+        "name": name,
+        "timestamp": timestamp,
+        "input_sha256": digest,
+        "input_size_bytes": len(payload),
+        **meta,
+        "top_allocations": top_allocations,
+    }
+    with open(capture / "meta.json", "w") as file:
+        json.dump(meta, file, indent=2)
+
+    captures = sorted(path for path in directory.iterdir() if path.is_dir())
+    for old in captures[:max(0, len(captures) - keep)]:
+        shutil.rmtree(old, ignore_errors=True)
+    return capture
@@ -0,0 +1,24 @@
+import sys
+
+
+def report_error(message):
+    """
+    Show an error to the user
+
+    Inside the Streamlit app the message is shown with ``st.error``; in
+    scripts and the command line, where Streamlit is never imported, it is
+    printed to stderr instead, keeping stdout free for command output.
+
+    Args:
+        message (str): Error message
+    """
+    st = sys.modules.get("streamlit")
+    if st is not None:
+        try:
+            from streamlit.runtime import exists as streamlit_running
+        except ImportError:
+            streamlit_running = None
+        if streamlit_running is None or streamlit_running():
+            st.error(message)
+            return
+    print(message, file=sys.stderr)
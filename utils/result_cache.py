@@ -0,0 +1,273 @@
+"""
+Content-addressed two-tier cache for analysis and extraction results
+
+Entries live in a per-process in-memory LRU in front of a SQLite table
+shared by every process using the same file. Keys are content hashes, so
+an entry never needs updating: when the inputs or the code producing a
+value change, the key changes and the stale entry simply ages out through
+TTL and size eviction.
+
+Configuration (read by ``TwoTierCache.from_env``):
+
+    RESUMEFIT_CACHE_PATH         SQLite file (default .resumefit_cache/cache.sqlite3, "" for memory only)
+    RESUMEFIT_CACHE_TTL_SECONDS  entry lifetime (default 7 days)
+    RESUMEFIT_CACHE_MAX_ENTRIES  SQLite entries kept per namespace (default 100000)
+    RESUMEFIT_CACHE_MEMORY_SIZE  in-memory entries per process (default 1024)
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = os.path.join('.resumefit_cache', 'cache.sqlite3')
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_MEMORY_SIZE = 1024
+
+# Size eviction runs once per this many writes rather than on every write
+EVICTION_INTERVAL = 100
+
+
+def content_hash(*parts):
+    """Hex SHA-256 over string or bytes parts, separated so parts cannot run together"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def source_fingerprint(module_names):
+    """
+    Hash of the source files of already-imported modules
+
+    Used as the code version in cache keys, so any edit to the code that
+    produces a cached value invalidates it without a manual version bump.
+
+    Args:
+        module_names (iterable): Names of modules in ``sys.modules``
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    parts = []
+    for name in sorted(module_names):
+        path = getattr(sys.modules.get(name), '__file__', None)
+        parts.append(name)
+        parts.append(Path(path).read_bytes() if path and os.path.exists(path) else b'')
+    return content_hash(*parts)
+
+
+def normalize_text(text):
+    """Collapse whitespace runs and strip, which analysis results do not depend on"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+class CacheStats:
+    """Hit, miss and eviction counters of one cache"""
+
+    __slots__ = ('memory_hits', 'disk_hits', 'misses', 'writes', 'expired', 'evicted')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    @property
+    def hits(self):
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+        stats = {name: getattr(self, name) for name in self.__slots__}
+        stats['hit_rate'] = self.hit_rate
+        return stats
+
+
+class TwoTierCache:
+    """In-memory LRU in front of a persistent SQLite table, for JSON-serializable values"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, namespace='default', memory_size=DEFAULT_MEMORY_SIZE,
+                 ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path (str): SQLite file, or None for a memory-only cache
+            namespace (str): Separates unrelated caches sharing one file
+            memory_size (int): Entries kept in the in-memory tier
+            ttl_seconds (float): Entry lifetime in both tiers, None for no expiry
+            max_entries (int): Entries kept in SQLite for this namespace
+        """
+        self.path = path
+        self.namespace = namespace
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self._db = self._connect(path) if path else None
+
+    @classmethod
+    def from_env(cls, namespace='default'):
+        """Cache configured by the RESUMEFIT_CACHE_* environment variables"""
+        return cls(
+            path=os.environ.get('RESUMEFIT_CACHE_PATH', DEFAULT_CACHE_PATH) or None,
+            namespace=namespace,
+            memory_size=int(os.environ.get('RESUMEFIT_CACHE_MEMORY_SIZE', DEFAULT_MEMORY_SIZE)),
+            ttl_seconds=float(os.environ.get('RESUMEFIT_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS)),
+            max_entries=int(os.environ.get('RESUMEFIT_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)),
+        )
+
+    @staticmethod
+    def _connect(path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            ' namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,'
+            ' created_at REAL NOT NULL, accessed_at REAL NOT NULL,'
+            ' PRIMARY KEY (namespace, key))'
+        )
+        db.execute('CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (namespace, accessed_at)')
+        return db
+
+    def _expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key):
+        """
+        Look up a value
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The cached value, or None on a miss. Values are shared with the
+            in-memory tier and must not be mutated.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?',
+                    (self.namespace, key)
+                ).fetchone()
+                if row is not None:
+                    if self._expired(row[1], now):
+                        self._db.execute('DELETE FROM cache_entries WHERE namespace = ? AND key = ?',
+                                         (self.namespace, key))
+                        self.stats.expired += 1
+                    else:
+                        self._db.execute(
+                            'UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?',
+                            (now, self.namespace, key)
+                        )
+                        value = json.loads(row[0])
+                        self._remember(key, value, row[1])
+                        self.stats.disk_hits += 1
+                        return value
+
+            self.stats.misses += 1
+            return None
+
+    def set(self, key, value):
+        """
+        Store a JSON-serializable value
+
+        Args:
+            key (str): Cache key
+            value: Value to store; it must not be mutated afterwards
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self.stats.writes += 1
+            if self._db is None:
+                return
+            self._db.execute(
+                'INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (self.namespace, key, json.dumps(value, separators=(',', ':')), now, now)
+            )
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= EVICTION_INTERVAL:
+                self._writes_since_eviction = 0
+                self._evict(now)
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now):
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        if self.ttl_seconds is not None:
+            deleted = self._db.execute(
+                'DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?',
+                (self.namespace, now - self.ttl_seconds)
+            ).rowcount
+            self.stats.expired += max(deleted, 0)
+        count = self._db.execute(
+            'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+        ).fetchone()[0]
+        if count > self.max_entries:
+            deleted = self._db.execute(
+                'DELETE FROM cache_entries WHERE namespace = ? AND key IN ('
+                ' SELECT key FROM cache_entries WHERE namespace = ? ORDER BY accessed_at LIMIT ?)',
+                (self.namespace, self.namespace, count - self.max_entries)
+            ).rowcount
+            self.stats.evicted += max(deleted, 0)
+
+    def evict(self):
+        """Run TTL and size eviction now"""
+        with self._lock:
+            if self._db is not None:
+                self._evict(time.time())
+
+    def clear(self):
+        """Drop every entry of this namespace from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM cache_entries WHERE namespace = ?', (self.namespace,))
+
+    def __len__(self):
+        with self._lock:
+            if self._db is None:
+                return len(self._memory)
+            return self._db.execute(
+                'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __getstate__(self):
+        raise TypeError("TwoTierCache holds a database connection; create one per process")
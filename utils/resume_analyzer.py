@@ -1,12 +1,71 @@
+import os
+import time
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, ENGLISH_STOP_WORDS
 from sklearn.metrics.pairwise import cosine_similarity
-from .text_processor import TextProcessor
+from .text_processor import TextProcessor, TokenizedDocument, get_word_tokenizer
+from .job_profile import JobProfile, JobProfileCache
+from .keyword_matcher import KeywordIndex
+from .idf_model import load_default_idf_model
+from .hashing_model import HashingModel
+from .instrumentation import Instrumentation, default_instrumentation
+from .analysis_result import AnalysisResult, rank_results
+from .result_cache import TwoTierCache, content_hash, normalize_text, source_fingerprint
+from .job_profile import job_fingerprint
 import re
 
+# Smoothed IDF of a term that occurs in only one of two documents: ln(3/2) + 1.
+# Terms present in both documents get an IDF of exactly 1.
+PAIR_UNIQUE_TERM_IDF = 1 + np.log(1.5)
+
+SIMILARITY_MODES = ('pairwise', 'idf', 'hashing')
+
+# Modules whose source determines analysis results; editing any of them
+# changes the analyzer version and so invalidates cached results
+SCORING_MODULES = tuple(f"{__package__}.{name}" for name in (
+    'resume_analyzer', 'text_processor', 'keyword_matcher', 'skill_extractor',
+    'job_profile', 'analysis_result', 'idf_model', 'hashing_model',
+))
+
 class ResumeAnalyzer:
-    def __init__(self):
-        self.text_processor = TextProcessor()
+    def __init__(self, job_profile_cache_size=128, skill_matcher=None, idf_model=None, similarity_mode=None,
+                 instrumentation=None, max_matching_keywords=50, max_missing_keywords=15, result_cache=None):
+        self.text_processor = TextProcessor(skill_matcher=skill_matcher)
+        # Corpus IDF model fitted offline; without one, similarity falls back
+        # to fitting TF-IDF on each resume/job pair
+        self.idf_model = idf_model if idf_model is not None else load_default_idf_model()
+
+        # 'pairwise': per-pair TF-IDF, 'idf': corpus IDF model,
+        # 'hashing': stateless feature hashing with constant memory
+        self.similarity_mode = (
+            similarity_mode
+            or os.environ.get("RESUMEFIT_SIMILARITY_MODE")
+            or ('idf' if self.idf_model is not None else 'pairwise')
+        )
+        if self.similarity_mode not in SIMILARITY_MODES:
+            raise ValueError(f"Unknown similarity mode {self.similarity_mode!r}, expected one of {SIMILARITY_MODES}")
+        if self.similarity_mode == 'idf' and self.idf_model is None:
+            raise ValueError("Similarity mode 'idf' requires an IDF model (set RESUMEFIT_IDF_MODEL)")
+        self.similarity_model = {
+            'pairwise': None,
+            'idf': self.idf_model,
+            'hashing': HashingModel() if self.similarity_mode == 'hashing' else None,
+        }[self.similarity_mode]
+
+        self.job_profiles = JobProfileCache(maxsize=job_profile_cache_size)
+        # Top-k caps on the keyword lists stored in each result (None = no cap)
+        self.max_matching_keywords = max_matching_keywords
+        self.max_missing_keywords = max_missing_keywords
+        # Per-stage timing hook; the default records nothing unless
+        # RESUMEFIT_INSTRUMENTATION is set
+        self.instrumentation = instrumentation if instrumentation is not None else default_instrumentation()
+        # Content-addressed cache of finished results: None/False disables it,
+        # True builds one from the RESUMEFIT_CACHE_* environment variables
+        if result_cache is True:
+            result_cache = TwoTierCache.from_env(namespace='analysis')
+        self.result_cache = result_cache if result_cache is not False else None
+        self._version = None
+        self._term_analyzer = CountVectorizer(lowercase=True).build_analyzer()
         # Simplified TF-IDF vectorizer for better reliability
         self.vectorizer = TfidfVectorizer(
             max_features=1000,
@@ -17,30 +76,248 @@ class ResumeAnalyzer:
             sublinear_tf=True
         )
 
-    def analyze_resume(self, resume_text, job_description):
+    def analyze_resume(self, resume_text, job_description, include_timings=False):
         """
         Analyze resume against job description with improved accuracy
 
         Args:
             resume_text (str): Resume text
-            job_description (str): Job description text
+            job_description (str or JobProfile): Job description text or its
+                precomputed profile
+            include_timings (bool): Add a ``timings`` section with per-stage
+                wall time and item counts
+
+        Returns:
+            AnalysisResult: Analysis results including score and suggestions
+        """
+        return self.analyze_batch(job_description, [resume_text], include_timings=include_timings)[0]
+
+    def iter_analyses(self, job_description, resumes, chunk_size=256, include_timings=False):
+        """
+        Stream analyses of many resumes against one job description
+
+        Resumes are consumed and scored ``chunk_size`` at a time, so any
+        iterable (including generators over very large collections) can be
+        processed with memory bounded by the chunk size.
+
+        Args:
+            job_description (str or JobProfile): Job description text or its
+                precomputed profile
+            resumes (iterable): Resume texts
+            chunk_size (int): Number of resumes vectorized together
+            include_timings (bool): Add a ``timings`` section to each result
+
+        Yields:
+            AnalysisResult: Analysis results in the same order as ``resumes``
+        """
+        job_profile = self.get_job_profile(job_description)
+        chunk = []
+        for resume_text in resumes:
+            chunk.append(resume_text)
+            if len(chunk) >= chunk_size:
+                yield from self.analyze_batch(job_profile, chunk, include_timings=include_timings)
+                chunk = []
+        if chunk:
+            yield from self.analyze_batch(job_profile, chunk, include_timings=include_timings)
+
+    def analyze_batch(self, job_description, resumes, include_timings=False):
+        """
+        Analyze many resumes against one job description
+
+        The job description is preprocessed once and all similarity scores
+        are computed together, so the per-candidate cost is only the
+        resume-side work. With a result cache, only resumes without a cached
+        result for this job description and analyzer version are analyzed.
+
+        Args:
+            job_description (str or JobProfile): Job description text or its
+                precomputed profile
+            resumes (list): Resume texts
+            include_timings (bool): Add a ``timings`` section to each result.
+                Job profile and similarity time is shared by the batch and
+                split evenly between its resumes. Timed analyses always run
+                and refresh the cache instead of reading it.
+
+        Returns:
+            list: Analysis results in the same order as ``resumes``
+        """
+        cache = self.result_cache
+        if cache is None or not resumes:
+            return self._analyze_uncached(job_description, resumes, include_timings)
+
+        fingerprint = (
+            job_description.fingerprint if isinstance(job_description, JobProfile)
+            else job_fingerprint(job_description)
+        )
+        keys = [self.result_cache_key(fingerprint, text) for text in resumes]
+        results = [None] * len(resumes)
+        if not include_timings:
+            for i, key in enumerate(keys):
+                compact = cache.get(key)
+                if compact is not None:
+                    results[i] = AnalysisResult.from_compact(compact)
+
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            fresh = self._analyze_uncached(job_description, [resumes[i] for i in misses], include_timings)
+            for i, result in zip(misses, fresh):
+                # Timings describe this run only and are not cached
+                timings, result.timings = result.timings, None
+                cache.set(keys[i], result.to_compact())
+                result.timings = timings
+                results[i] = result
+        return results
+
+    @property
+    def version(self):
+        """
+        Fingerprint of everything that determines analysis results
+
+        Covers the scoring source code, skill taxonomy, stopwords, tokenizer,
+        similarity model and keyword caps, so cached results are invalidated
+        automatically when any of them changes.
 
         Returns:
-            dict: Analysis results including score and suggestions
+            str: Hex SHA-256 digest
         """
-        # Preprocess texts
-        resume_processed = self.text_processor.preprocess_for_similarity(resume_text)
-        job_processed = self.text_processor.preprocess_for_similarity(job_description)
+        if self._version is None:
+            tokenizer = get_word_tokenizer()
+            parts = [
+                source_fingerprint(SCORING_MODULES),
+                '\n'.join(self.text_processor.skill_matcher.skills),
+                '\n'.join(sorted(self.text_processor.stop_words)),
+                f"{getattr(tokenizer, '__module__', '')}.{getattr(tokenizer, '__qualname__', '')}",
+                self.similarity_mode,
+                repr((self.max_matching_keywords, self.max_missing_keywords)),
+            ]
+            model = self.similarity_model
+            if model is not None:
+                parts.append(repr(sorted(
+                    (name, value) for name, value in vars(model).items()
+                    if isinstance(value, (int, float, str, tuple))
+                )))
+                if hasattr(model, 'terms'):
+                    parts.append('\n'.join(model.terms))
+                    parts.append(model.idf.tobytes())
+            self._version = content_hash(*parts)
+        return self._version
+
+    def result_cache_key(self, job_fingerprint, resume_text):
+        """Cache key of a resume's result against a job description fingerprint"""
+        return content_hash(self.version, job_fingerprint, normalize_text(resume_text))
+
+    def _analyze_uncached(self, job_description, resumes, include_timings=False):
+        """Analyze a batch without consulting the result cache"""
+        instrumentation = self.instrumentation
+        if include_timings and not instrumentation.enabled:
+            instrumentation = Instrumentation(registry=None)
+
+        start = time.perf_counter()
+        job_profile = self.get_job_profile(job_description)
+        profile_seconds = time.perf_counter() - start
+
+        timings = [instrumentation.start() for _ in resumes]
+        documents, resumes_processed = [], []
+        for text, resume_timings in zip(resumes, timings):
+            with resume_timings.stage('preprocessing'):
+                document = self.text_processor.tokenize(text)
+                documents.append(document)
+                resumes_processed.append(self.text_processor.preprocess_for_similarity(document))
+
+        start = time.perf_counter()
+        similarity_scores = self._calculate_batch_similarity(resumes_processed, job_profile)
+        similarity_seconds = time.perf_counter() - start
+
+        results = []
+        for document, similarity_score, resume_timings in zip(documents, similarity_scores, timings):
+            resume_timings.add_time('job_profile', profile_seconds / len(resumes))
+            resume_timings.add_time('similarity', similarity_seconds / len(resumes))
+            resume_timings.count('batch_size', len(resumes))
+            result = self._build_results(document, job_profile, similarity_score, resume_timings)
+            resume_timings.publish()
+            if include_timings:
+                result['timings'] = resume_timings.as_dict()
+            results.append(result)
+        return results
+
+    def rank_resumes(self, job_description, resumes, include_timings=False):
+        """
+        Rank many resumes against one job description
 
-        # Calculate similarity score with error handling
-        similarity_score = self._calculate_similarity(resume_processed, job_processed)
+        Args:
+            job_description (str or JobProfile): Job description text or its
+                precomputed profile
+            resumes (list): Resume texts
+            include_timings (bool): Add a ``timings`` section to each result
+
+        Returns:
+            list: Analysis results sorted by score (best first). Each result
+            carries the same fields as ``analyze_resume`` plus ``index``
+            (position in ``resumes``) and ``rank`` (1 = best match).
+        """
+        return rank_results(self.analyze_batch(job_description, resumes, include_timings=include_timings))
+
+    def get_job_profile(self, job_description):
+        """
+        Return the JobProfile for a job description, reusing cached profiles
+
+        Args:
+            job_description (str or JobProfile): Job description text or an
+                existing profile, which is returned unchanged
+
+        Returns:
+            JobProfile: Preprocessed text, keywords, skills and term vector
+        """
+        if isinstance(job_description, JobProfile):
+            return job_description
+        return self.job_profiles.get_or_build(job_description, self._build_job_profile)
+
+    def _build_job_profile(self, job_description, fingerprint=None):
+        """Run all job-description-side analysis once"""
+        document = self.text_processor.tokenize(job_description)
+        processed_text = self.text_processor.preprocess_for_similarity(document)
+        term_counts = {}
+        for term in self._term_analyzer(processed_text):
+            term_counts[term] = term_counts.get(term, 0) + 1
+
+        profile = JobProfile(
+            job_description,
+            processed_text,
+            self._extract_keyword_set(document),
+            self._extract_skill_set(document),
+            term_counts,
+            fingerprint=fingerprint
+        )
+        if self.similarity_model is not None:
+            profile.similarity_vector = self.similarity_model.transform([processed_text])
+        return profile
+
+    def _extract_keyword_set(self, text):
+        """Extract the normalized keyword set used for matching"""
+        return set([kw.lower().strip() for kw in self.text_processor.extract_keywords(text) if len(kw.strip()) > 2])
+
+    def _extract_skill_set(self, text):
+        """Extract the normalized skill set used for matching"""
+        return set([skill.lower().strip() for skill in self.text_processor.extract_skills(text)])
+
+    def _build_results(self, resume_document, job_profile, similarity_score, timings):
+        """Score a resume against a job profile given its similarity score"""
+        job_keywords = job_profile.keywords
+        job_skills = job_profile.skills
 
         # Extract keywords with improved matching
-        resume_keywords = set([kw.lower().strip() for kw in self.text_processor.extract_keywords(resume_text) if len(kw.strip()) > 2])
-        job_keywords = set([kw.lower().strip() for kw in self.text_processor.extract_keywords(job_description) if len(kw.strip()) > 2])
+        with timings.stage('keyword_extraction'):
+            resume_keywords = self._extract_keyword_set(resume_document)
 
         # Improved keyword matching
-        matching_keywords = self._find_matching_keywords(resume_keywords, job_keywords)
+        with timings.stage('keyword_matching'):
+            keyword_index = KeywordIndex(resume_keywords)
+            matching_keywords = keyword_index.match(job_keywords)
+        timings.count('resume_keywords', len(resume_keywords))
+        timings.count('job_keywords', len(job_keywords))
+        timings.count('matching_keywords', len(matching_keywords))
+        timings.count('keyword_partial_checks', keyword_index.partial_checks)
+        timings.count('keyword_fuzzy_checks', keyword_index.fuzzy_checks)
 
         # Calculate keyword match score
         if job_keywords:
@@ -51,11 +328,14 @@ class ResumeAnalyzer:
         missing_keywords = job_keywords - matching_keywords
 
         # Extract and match skills with enhanced detection
-        resume_skills = set([skill.lower().strip() for skill in self.text_processor.extract_skills(resume_text)])
-        job_skills = set([skill.lower().strip() for skill in self.text_processor.extract_skills(job_description)])
-        
-        # Enhanced skills matching with partial matching
-        matching_skills = self._find_matching_skills(resume_skills, job_skills)
+        with timings.stage('skills'):
+            resume_skills = self._extract_skill_set(resume_document)
+
+            # Enhanced skills matching with partial matching
+            matching_skills = self._find_matching_skills(resume_skills, job_skills)
+        timings.count('resume_skills', len(resume_skills))
+        timings.count('job_skills', len(job_skills))
+        timings.count('skill_match_iterations', len(resume_skills) * len(job_skills))
 
         # Calculate skills match score with bonus for comprehensive skill coverage
         if job_skills:
@@ -70,30 +350,33 @@ class ResumeAnalyzer:
         else:
             skills_match_score = 0
 
-        # Calculate final score with balanced weighting
-        final_score = self._calculate_final_score(
-            similarity_score, 
-            keyword_match_score, 
-            skills_match_score,
-            len(matching_keywords),
-            len(job_keywords)
-        )
+        with timings.stage('scoring'):
+            # Calculate final score with balanced weighting
+            final_score = self._calculate_final_score(
+                similarity_score,
+                keyword_match_score,
+                skills_match_score,
+                len(matching_keywords),
+                len(job_keywords)
+            )
 
-        # Generate suggestions
-        suggestions = self._generate_suggestions(
-            resume_text, job_description, missing_keywords, 
-            job_skills - resume_skills, final_score
-        )
+            # Generate suggestions
+            suggestions = self._generate_suggestions(
+                resume_document, job_profile.text, missing_keywords,
+                job_skills - resume_skills, final_score
+            )
 
-        return {
-            'score': round(final_score, 1),
-            'similarity_score': round(similarity_score, 1),
-            'keyword_match_score': round(keyword_match_score, 1),
-            'skills_match_score': round(skills_match_score, 1),
-            'matching_keywords': list(matching_keywords),
-            'missing_keywords': list(missing_keywords)[:15],
-            'suggestions': suggestions
-        }
+        return AnalysisResult.from_keyword_sets(
+            round(final_score, 1),
+            round(similarity_score, 1),
+            round(keyword_match_score, 1),
+            round(skills_match_score, 1),
+            matching_keywords,
+            missing_keywords,
+            suggestions,
+            max_matching_keywords=self.max_matching_keywords,
+            max_missing_keywords=self.max_missing_keywords
+        )
 
     def _find_matching_skills(self, resume_skills, job_skills):
         """Enhanced skills matching with partial matching and synonyms"""
@@ -135,58 +418,7 @@ class ResumeAnalyzer:
     
     def _find_matching_keywords(self, resume_keywords, job_keywords):
         """Find matching keywords with enhanced detection logic"""
-        matching = set()
-
-        # Convert to lowercase for comparison
-        resume_lower = {kw.lower() for kw in resume_keywords}
-        job_lower = {kw.lower() for kw in job_keywords}
-
-        # Exact matches (case insensitive)
-        for job_kw in job_keywords:
-            if job_kw.lower() in resume_lower:
-                matching.add(job_kw.lower())
-
-        # Enhanced partial matching
-        for job_kw in job_keywords:
-            job_kw_lower = job_kw.lower()
-            
-            for resume_kw in resume_keywords:
-                resume_kw_lower = resume_kw.lower()
-                
-                # Skip very short keywords for partial matching
-                if len(job_kw_lower) < 3 or len(resume_kw_lower) < 3:
-                    continue
-                
-                # Substring matching for technical terms
-                if job_kw_lower in resume_kw_lower or resume_kw_lower in job_kw_lower:
-                    matching.add(job_kw_lower)
-                    continue
-                
-                # Word-level matching for multi-word terms
-                job_words = set(job_kw_lower.split())
-                resume_words = set(resume_kw_lower.split())
-                
-                if len(job_words) > 1 and len(resume_words) > 1:
-                    overlap = len(job_words.intersection(resume_words))
-                    # Lower threshold for better matching
-                    if overlap >= len(job_words) * 0.7:
-                        matching.add(job_kw_lower)
-                        continue
-                
-                # Fuzzy matching for similar terms (e.g., "analyze" vs "analysis")
-                if len(job_kw_lower) >= 5 and len(resume_kw_lower) >= 5:
-                    # Check if words share significant character overlap
-                    shorter = min(job_kw_lower, resume_kw_lower, key=len)
-                    longer = max(job_kw_lower, resume_kw_lower, key=len)
-                    
-                    # Calculate character overlap ratio
-                    common_chars = sum(1 for char in shorter if char in longer)
-                    overlap_ratio = common_chars / len(shorter)
-                    
-                    if overlap_ratio >= 0.8:  # 80% character overlap
-                        matching.add(job_kw_lower)
-
-        return matching
+        return KeywordIndex(resume_keywords).match(job_keywords)
 
     def _calculate_similarity(self, text1, text2):
         """Calculate cosine similarity with improved error handling"""
@@ -241,27 +473,139 @@ class ResumeAnalyzer:
                 print(f"TF-IDF failed: {e}, using word overlap fallback")
                 similarity = self._calculate_word_overlap(text1, text2) / 100
 
-            # Convert to percentage and ensure realistic range (30-90% typical)
-            similarity_percentage = max(5, min(90, similarity * 100))
-            
-            # Apply realistic scaling - improved algorithm for better content similarity
-            if similarity_percentage > 80:
-                # Cap very high similarities but allow for well-optimized resumes
-                similarity_percentage = 65 + (similarity_percentage - 80) * 0.5
-            elif similarity_percentage > 60:
-                # Moderate scaling for good similarities
-                similarity_percentage = 45 + (similarity_percentage - 60) * 1.0
-            elif similarity_percentage < 15:
-                # Boost very low similarities to realistic minimum
-                similarity_percentage = 15 + similarity_percentage * 0.8
-            
-            print(f"Content similarity - Text1: {len(words1)} words, Text2: {len(words2)} words, Similarity: {similarity_percentage:.1f}%")
-            
-            return similarity_percentage
+            return self._scale_similarity(similarity)
         except Exception as e:
             print(f"Similarity calculation error: {e}")
             return self._calculate_word_overlap(text1, text2)
 
+    def _scale_similarity(self, similarity):
+        """Convert a raw cosine similarity to the realistic percentage range"""
+        # Convert to percentage and ensure realistic range (30-90% typical)
+        similarity_percentage = max(5, min(90, similarity * 100))
+        
+        # Apply realistic scaling - improved algorithm for better content similarity
+        if similarity_percentage > 80:
+            # Cap very high similarities but allow for well-optimized resumes
+            similarity_percentage = 65 + (similarity_percentage - 80) * 0.5
+        elif similarity_percentage > 60:
+            # Moderate scaling for good similarities
+            similarity_percentage = 45 + (similarity_percentage - 60) * 1.0
+        elif similarity_percentage < 15:
+            # Boost very low similarities to realistic minimum
+            similarity_percentage = 15 + similarity_percentage * 0.8
+
+        return similarity_percentage
+
+    def _calculate_batch_similarity(self, resume_texts, job_profile):
+        """
+        Calculate ``_calculate_similarity(resume, job)`` for many resumes at once
+
+        With only two documents, the primary vectorizer in
+        ``_calculate_similarity`` prunes every shared term (max_df=0.8), so
+        its score is always 0 and the result comes from the unigram
+        fallback vectorizer. That vectorizer's IDF only distinguishes terms
+        in both documents (IDF 1) from terms in one (``PAIR_UNIQUE_TERM_IDF``),
+        so every pairwise cosine can be computed from the job profile's term
+        counts and a single resume count matrix. Pairs the shortcut cannot
+        reproduce exactly (short texts, more than 1000 distinct terms,
+        identical primary vocabularies) use the per-pair path. When a corpus
+        IDF model or the hashing mode is in use, that model is used instead.
+        """
+        job_text = job_profile.processed_text
+        scores = np.zeros(len(resume_texts))
+        if not job_text or not job_text.strip():
+            return scores
+
+        if self.similarity_model is not None:
+            return self._calculate_model_similarity(resume_texts, job_profile)
+
+        vectorized = []
+        for i, resume_text in enumerate(resume_texts):
+            if not resume_text or not resume_text.strip():
+                continue
+            if len(resume_text.split()) < 10 or len(job_text.split()) < 10:
+                scores[i] = self._calculate_similarity(resume_text, job_text)
+            else:
+                vectorized.append(i)
+
+        if not vectorized:
+            return scores
+
+        try:
+            counter = CountVectorizer(lowercase=True)
+            resume_counts = counter.fit_transform([resume_texts[i] for i in vectorized]).astype(np.float64).tocsr()
+        except ValueError:
+            for i in vectorized:
+                scores[i] = self._calculate_similarity(resume_texts[i], job_text)
+            return scores
+
+        vocabulary = counter.vocabulary_
+        job_counts = np.zeros(len(vocabulary))
+        for term, count in job_profile.term_counts.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                job_counts[column] = count
+        job_present = (job_counts > 0).astype(np.float64)
+        resume_present = resume_counts.copy()
+        resume_present.data[:] = 1.0
+        resume_counts_sq = resume_counts.multiply(resume_counts)
+
+        # Terms shared with the job description only contribute through IDF 1
+        dot = resume_counts @ job_counts
+        shared_terms = resume_present @ job_present
+        job_shared_sq = resume_present @ (job_counts ** 2)
+        resume_shared_sq = resume_counts_sq @ job_present
+        resume_sq = np.asarray(resume_counts_sq.sum(axis=1)).ravel()
+
+        unique_sq = PAIR_UNIQUE_TERM_IDF ** 2
+        job_norm_sq = unique_sq * job_profile.term_count_sq_sum - (unique_sq - 1) * job_shared_sq
+        resume_norm_sq = unique_sq * resume_sq - (unique_sq - 1) * resume_shared_sq
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarities = np.nan_to_num(dot / np.sqrt(job_norm_sq * resume_norm_sq))
+
+        primary = np.zeros(len(vocabulary))
+        for term, column in vocabulary.items():
+            if self._is_primary_term(term):
+                primary[column] = 1.0
+        job_primary = sum(1 for term in job_profile.term_counts if self._is_primary_term(term))
+        resume_primary = resume_present @ primary
+        shared_primary = resume_present @ (job_present * primary)
+
+        union_terms = np.diff(resume_counts.indptr) + len(job_profile.term_counts) - shared_terms
+        exact = (union_terms <= 1000) & ~(
+            (resume_primary == job_primary) & (shared_primary == job_primary)
+        )
+
+        for row, i in enumerate(vectorized):
+            if exact[row]:
+                scores[i] = self._scale_similarity(similarities[row])
+            else:
+                scores[i] = self._calculate_similarity(resume_texts[i], job_text)
+
+        return scores
+
+    def _calculate_model_similarity(self, resume_texts, job_profile):
+        """Score resumes with the corpus IDF or hashing model (transform only, no fitting)"""
+        scores = np.zeros(len(resume_texts))
+        present = [i for i, text in enumerate(resume_texts) if text and text.strip()]
+        if not present:
+            return scores
+
+        job_vector = job_profile.similarity_vector
+        if job_vector is None:
+            job_vector = self.similarity_model.transform([job_profile.processed_text])
+        resume_vectors = self.similarity_model.transform([resume_texts[i] for i in present])
+        similarities = np.asarray((resume_vectors @ job_vector.T).todense()).ravel()
+
+        for row, i in enumerate(present):
+            scores[i] = self._scale_similarity(similarities[row])
+        return scores
+
+    @staticmethod
+    def _is_primary_term(term):
+        """Whether a unigram is in the primary vectorizer's vocabulary (3+ ASCII letters, not a stop word)"""
+        return len(term) >= 3 and term.isascii() and term.isalpha() and term not in ENGLISH_STOP_WORDS
+
     def _calculate_word_overlap(self, text1, text2):
         """Calculate word overlap as fallback similarity measure"""
         try:
@@ -276,9 +620,7 @@ class ResumeAnalyzer:
             
             # Jaccard similarity
             overlap = (len(intersection) / len(union)) * 100 if union else 0
-            
-            print(f"Word overlap fallback - Intersection: {len(intersection)}, Union: {len(union)}, Overlap: {overlap:.2f}%")
-            
+
             return min(overlap, 100)
         except Exception as e:
             print(f"Word overlap calculation error: {e}")
@@ -341,18 +683,9 @@ class ResumeAnalyzer:
             base_score = 80 + (base_score - 85) * 0.8
 
         # Ensure score is within realistic range (typically 20-95% for optimized resumes)
-        final_score = max(15, min(95, base_score))
-        
-        # Debug output
-        keyword_ratio = matching_count / total_keywords if total_keywords > 0 else 0
-        print(f"Balanced Score Calculation:")
-        print(f"  Component scores - Content: {similarity_score:.1f}%, Keywords: {keyword_score:.1f}%, Skills: {skills_score:.1f}%")
-        print(f"  Keyword metrics - Matched: {matching_count}/{total_keywords} ({keyword_ratio:.1%})")
-        print(f"  Realistic final score: {final_score:.1f}%")
-        
-        return final_score
+        return max(15, min(95, base_score))
 
-    def _generate_suggestions(self, resume_text, job_description, missing_keywords, missing_skills, score):
+    def _generate_suggestions(self, resume_document, job_description, missing_keywords, missing_skills, score):
         """Generate improvement suggestions"""
         suggestions = []
 
@@ -376,25 +709,25 @@ class ResumeAnalyzer:
 
         # Keyword suggestions
         if missing_keywords:
-            top_missing = list(missing_keywords)[:5]
+            top_missing = sorted(missing_keywords)[:5]
             suggestions.append(
                 f"Consider adding these important keywords: {', '.join(top_missing)}"
             )
 
         # Skills suggestions
         if missing_skills:
-            top_missing_skills = list(missing_skills)[:3]
+            top_missing_skills = sorted(missing_skills)[:3]
             suggestions.append(
                 f"Highlight these skills if you have them: {', '.join(top_missing_skills)}"
             )
 
         # Structure suggestions
-        if not self._has_quantified_achievements(resume_text):
+        if not self._has_quantified_achievements(resume_document.text):
             suggestions.append(
                 "Add quantifiable achievements with numbers and percentages to make your impact more concrete."
             )
 
-        if not self._has_strong_action_verbs(resume_text):
+        if not self._has_strong_action_verbs(resume_document):
             suggestions.append(
                 "Use stronger action verbs like 'implemented', 'optimized', 'achieved', or 'led' to describe your experience."
             )
@@ -425,7 +758,7 @@ class ResumeAnalyzer:
             'established', 'initiated', 'streamlined', 'enhanced'
         }
 
-        text_lower = text.lower()
+        text_lower = text.lower if isinstance(text, TokenizedDocument) else text.lower()
         found_verbs = sum(1 for verb in strong_verbs if verb in text_lower)
 
         return found_verbs >= 2
\ No newline at end of file
@@ -0,0 +1,330 @@
+"""
+Sandboxed worker processes for parsing untrusted documents
+
+Malformed or adversarial files can make a parser spin or allocate without
+bound. ``SandboxPool`` runs such jobs in reusable subprocesses, each capped
+in address space (RLIMIT_AS) and CPU time (RLIMIT_CPU), and gives every job
+a wall-clock timeout. A worker that times out, dies or runs out of memory
+is killed and replaced, so a hostile document costs at most one worker for
+a bounded time while the calling process (the Streamlit server, the API
+event loop) keeps serving.
+
+    sandbox = SandboxPool.from_env()
+    result = sandbox.run(extract_document, data, "resume.pdf")
+
+Limits are POSIX-only; elsewhere jobs still run in separate processes with
+the wall-clock timeout.
+"""
+import contextlib
+import io
+import math
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .reporting import report_error
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MEMORY_LIMIT_MB = 1024
+
+# Jobs a worker runs before it is replaced, bounding slow leaks in parsers
+DEFAULT_MAX_JOBS_PER_WORKER = 200
+
+
+class SandboxError(Exception):
+    """A job could not complete inside its sandbox worker"""
+
+
+class SandboxTimeout(SandboxError):
+    """The job exceeded its wall-clock timeout; its worker was killed"""
+
+
+class SandboxMemoryError(SandboxError):
+    """The job exceeded the worker's address-space limit"""
+
+
+class WorkerCrashed(SandboxError):
+    """The worker died while running the job (e.g. killed by its CPU limit)"""
+
+
+def _apply_limits(memory_limit_mb):
+    if resource is None:
+        return
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _set_cpu_budget(seconds):
+    """Let the worker use ``seconds`` more CPU time (None: no limit); past it, SIGXCPU kills it"""
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = hard
+    if seconds:
+        # The limit counts the process's whole lifetime, so budget from now
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(connection, memory_limit_mb):
+    """
+    Worker loop: run jobs received on ``connection`` until told to stop
+
+    Each reply is (status, value, stderr output of the job), status being
+    'ok' or 'error'. After a MemoryError the worker exits, since the
+    interpreter may be left in a bad state.
+    """
+    # The worker is the isolation boundary; it never starts a PDF page pool
+    os.environ['RESUMEFIT_PDF_WORKERS'] = '0'
+    _apply_limits(memory_limit_mb)
+    while True:
+        try:
+            job = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if job is None:
+            return
+        fn, args, cpu_seconds = job
+        _set_cpu_budget(cpu_seconds)
+        messages = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(messages):
+                reply = ('ok', fn(*args))
+        except MemoryError:
+            connection.send(('error', MemoryError(), messages.getvalue()))
+            return
+        except Exception as e:
+            reply = ('error', e)
+        try:
+            connection.send(reply + (messages.getvalue(),))
+        except Exception as e:
+            # Unpicklable result or exception
+            connection.send(('error', RuntimeError(f"{type(e).__name__}: {e}"), messages.getvalue()))
+
+
+class _Worker:
+    """One sandbox subprocess and the parent's end of its pipe"""
+
+    __slots__ = ('process', 'connection', 'jobs')
+
+    def __init__(self, context, memory_limit_mb):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child, memory_limit_mb), name='resumefit-sandbox', daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.jobs = 0
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class SandboxPool:
+    """
+    Reusable pool of resource-limited worker processes
+
+    ``run`` blocks the calling thread until a worker is free and the job is
+    done; ``submit`` returns a ``concurrent.futures.Future`` instead, so the
+    pool can stand in for an executor (e.g. ``utils.ingest.ingest``).
+    Workers are started on first use and replaced as soon as one is killed,
+    crashes or has run ``max_jobs_per_worker`` jobs.
+    """
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                 max_jobs_per_worker=DEFAULT_MAX_JOBS_PER_WORKER):
+        """
+        Args:
+            workers (int): Worker processes (default: up to 2 CPUs)
+            timeout (float): Wall-clock seconds per job, also its CPU-time
+                budget; 0 for no limit
+            memory_limit_mb (int): Address-space cap per worker; 0 for none
+            max_jobs_per_worker (int): Jobs after which a worker is replaced
+        """
+        from .parallel import default_worker_count
+
+        self.workers = workers or min(2, default_worker_count())
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        # Spawned workers are safe to start from threaded hosts like Streamlit
+        self._context = multiprocessing.get_context('spawn')
+        # Free slots: a running worker, or None where one is yet to start
+        self._idle = queue.LifoQueue()
+        for _ in range(self.workers):
+            self._idle.put(None)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """
+        Build a pool from RESUMEFIT_SANDBOX_WORKERS, RESUMEFIT_SANDBOX_TIMEOUT,
+        RESUMEFIT_SANDBOX_MEMORY_MB and RESUMEFIT_SANDBOX_MAX_JOBS
+
+        Args:
+            **overrides: Constructor arguments taking precedence over the
+                environment
+        """
+        def setting(variable, default, cast):
+            value = os.environ.get(variable)
+            return cast(value) if value else default
+
+        settings = dict(
+            workers=setting('RESUMEFIT_SANDBOX_WORKERS', None, int),
+            timeout=setting('RESUMEFIT_SANDBOX_TIMEOUT', DEFAULT_TIMEOUT, float),
+            memory_limit_mb=setting('RESUMEFIT_SANDBOX_MEMORY_MB', DEFAULT_MEMORY_LIMIT_MB, int),
+            max_jobs_per_worker=setting('RESUMEFIT_SANDBOX_MAX_JOBS', DEFAULT_MAX_JOBS_PER_WORKER, int),
+        )
+        settings.update(overrides)
+        return cls(**settings)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        raise TypeError("SandboxPool cannot be pickled; create one per process")
+
+    def run(self, fn, *args, timeout=None):
+        """
+        Run a picklable function in a sandbox worker and return its result
+
+        Text the job writes to stderr (e.g. ``report_error`` output) is
+        reported again in this process.
+
+        Args:
+            fn (callable): Module-level function
+            *args: Picklable arguments
+            timeout (float): Overrides the pool's timeout for this job
+
+        Returns:
+            The function's return value; exceptions it raises are re-raised
+
+        Raises:
+            SandboxTimeout, SandboxMemoryError, WorkerCrashed: The job was
+            cut off; the worker has been replaced
+        """
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._acquire()
+        try:
+            worker.jobs += 1
+            worker.connection.send((fn, args, timeout))
+            if timeout and not worker.connection.poll(timeout):
+                worker.kill()
+                worker = None
+                raise SandboxTimeout(f"job timed out after {timeout:g} s")
+            try:
+                status, value, messages = worker.connection.recv()
+            except (EOFError, OSError):
+                worker.kill()
+                exitcode = worker.process.exitcode
+                worker = None
+                raise WorkerCrashed(f"worker died ({_describe_exit(exitcode)})")
+        except BaseException:
+            # A worker interrupted mid-job could still answer it later
+            if worker is not None:
+                worker.kill()
+            self._release(None)
+            raise
+
+        if isinstance(value, MemoryError):
+            worker.kill()
+            worker = None
+        self._release(worker)
+        for line in messages.splitlines():
+            if line.strip():
+                report_error(line)
+        if status == 'ok':
+            return value
+        if isinstance(value, MemoryError):
+            raise SandboxMemoryError(f"job exceeded the {self.memory_limit_mb} MiB memory limit")
+        raise value
+
+    def submit(self, fn, *args):
+        """Run a picklable function in a worker; returns a concurrent.futures.Future"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='sandbox')
+            return self._executor.submit(self.run, fn, *args)
+
+    def close(self):
+        """Stop every worker; jobs still queued through ``submit`` are cancelled"""
+        self._closed = True
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.stop()
+
+    def _acquire(self):
+        if self._closed:
+            raise RuntimeError("SandboxPool is closed")
+        worker = self._idle.get()
+        if worker is None or not worker.process.is_alive():
+            try:
+                worker = _Worker(self._context, self.memory_limit_mb)
+            except BaseException:
+                # Give the slot back, or every failed start shrinks the pool for good
+                self._idle.put(None)
+                raise
+        return worker
+
+    def _release(self, worker):
+        """Return a worker's slot, replacing killed (None) and worn-out workers right away"""
+        if worker is not None and (worker.jobs >= self.max_jobs_per_worker or self._closed):
+            worker.stop()
+            worker = None
+        if worker is None and not self._closed:
+            try:
+                worker = _Worker(self._context, self.memory_limit_mb)
+            except OSError as e:
+                # Started again on next use
+                report_error(f"Could not restart sandbox worker: {e}")
+        self._idle.put(worker)
+
+
+def _describe_exit(exitcode):
+    if exitcode is None or exitcode >= 0:
+        return f"exit code {exitcode}"
+    try:
+        import signal
+        return f"killed by {signal.Signals(-exitcode).name}"
+    except ValueError:
+        return f"killed by signal {-exitcode}"
@@ -0,0 +1,163 @@
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).parent / "data" / "skills.txt"
+
+
+def normalize_skill_text(text):
+    """Lowercase text and collapse whitespace so phrases match across line breaks"""
+    return re.sub(r'\s+', ' ', text.lower()).strip()
+
+
+def load_taxonomy(path):
+    """
+    Load a skills taxonomy file
+
+    Args:
+        path (str or Path): File with one skill per line; blank lines and
+            lines starting with "#" are ignored
+
+    Returns:
+        list: Normalized skills in file order, without duplicates
+    """
+    skills = []
+    seen = set()
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            skill = normalize_skill_text(line)
+            if skill and not skill.startswith("#") and skill not in seen:
+                skills.append(skill)
+                seen.add(skill)
+    return skills
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skills taxonomy
+
+    All skills are found in a single pass over the text, so extraction time
+    depends on the document length rather than the taxonomy size. Matches
+    must sit on word boundaries, so "r" does not match inside "senior".
+    """
+
+    def __init__(self, skills):
+        self.skills = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [()]
+
+        for skill in skills:
+            skill = normalize_skill_text(skill)
+            if skill:
+                self._add(skill)
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path):
+        """Build a matcher from a taxonomy file"""
+        return cls(load_taxonomy(path))
+
+    def _add(self, skill):
+        """Insert a skill into the trie"""
+        state = 0
+        for char in skill:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            state = next_state
+        if not self._outputs[state]:
+            self._outputs[state] = (len(self.skills),)
+            self.skills.append(skill)
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = link if link != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find_all(self, text):
+        """
+        Find every taxonomy skill in a text
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            list: Matched skills in order of first occurrence
+        """
+        if not text:
+            return []
+        return self.find_all_normalized(normalize_skill_text(text))
+
+    def find_all_normalized(self, text):
+        """
+        Find every taxonomy skill in text already passed through ``normalize_skill_text``
+
+        Args:
+            text (str): Lowercased text with whitespace collapsed
+
+        Returns:
+            list: Matched skills in order of first occurrence
+        """
+        goto, fail, outputs, skills = self._goto, self._fail, self._outputs, self.skills
+        found = []
+        seen = set()
+        state = 0
+
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for skill_id in outputs[state]:
+                if skill_id in seen:
+                    continue
+                skill = skills[skill_id]
+                start = end - len(skill) + 1
+                if _is_word_char(skill[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(skill[-1]) and end + 1 < len(text) and _is_word_char(text[end + 1]):
+                    continue
+                seen.add(skill_id)
+                found.append(skill)
+
+        return found
+
+    def __len__(self):
+        return len(self.skills)
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(path=None):
+    """
+    Return a shared SkillMatcher, compiled once per taxonomy file
+
+    Args:
+        path (str, optional): Taxonomy file. Defaults to the
+            RESUMEFIT_SKILLS_TAXONOMY environment variable, then the
+            bundled utils/data/skills.txt.
+
+    Returns:
+        SkillMatcher: Compiled matcher
+    """
+    path = path or os.environ.get("RESUMEFIT_SKILLS_TAXONOMY") or str(DEFAULT_TAXONOMY_PATH)
+    return SkillMatcher.from_file(path)
@@ -1,13 +1,21 @@
+import os
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import PorterStemmer
 import string
+from functools import lru_cache
+from pathlib import Path
+from .skill_extractor import get_skill_matcher
+
+# NLTK is imported lazily: importing it takes seconds, and its tokenizer data
+# may be missing on offline hosts.
+STOP_WORDS_PATH = Path(__file__).parent / "data" / "stopwords_english.txt"
+
+_REGEX_TOKEN_PATTERN = re.compile(r"\w+(?:[-.]\w+)*|[^\w\s]+")
 
 # Download required NLTK data with better error handling
 def download_nltk_data():
     """Download NLTK data with fallback handling"""
+    import nltk
+
     try:
         nltk.data.find('tokenizers/punkt')
     except LookupError:
@@ -24,21 +32,100 @@ def download_nltk_data():
         except Exception as e:
             print(f"Failed to download punkt_tab: {e}")
 
+def regex_word_tokenize(text):
+    """
+    Tokenize text with a regular expression
+
+    Used when NLTK or its punkt data is not available. Never touches the network.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Tokens
+    """
+    return _REGEX_TOKEN_PATTERN.findall(text)
+
+@lru_cache(maxsize=None)
+def get_word_tokenizer():
+    """
+    Resolve the word tokenizer once per process
+
+    Uses NLTK's ``word_tokenize`` when its punkt data is installed locally,
+    otherwise ``regex_word_tokenize``. Data is only downloaded when the
+    RESUMEFIT_NLTK_DOWNLOAD environment variable is set to 1.
+
+    Returns:
+        callable: Function mapping a string to a list of tokens
+    """
+    if os.environ.get("RESUMEFIT_NLTK_DOWNLOAD") == "1":
+        download_nltk_data()
+
     try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        try:
-            nltk.download('stopwords', quiet=True)
-        except Exception as e:
-            print(f"Failed to download stopwords: {e}")
+        from nltk.tokenize import word_tokenize
+        word_tokenize("Tokenizer probe.")
+        return word_tokenize
+    except Exception as e:
+        print(f"NLTK tokenizer unavailable ({type(e).__name__}), using regex tokenizer")
+        return regex_word_tokenize
+
+@lru_cache(maxsize=None)
+def get_stop_words():
+    """Bundled English stopword list (NLTK's corpus), loaded once per process"""
+    with open(STOP_WORDS_PATH, encoding="utf-8") as file:
+        return frozenset(line.strip() for line in file if line.strip())
+
+class TokenizedDocument:
+    """
+    A text normalized and tokenized once, shared by every analysis stage
+
+    Attributes:
+        text (str): Original text
+        lower (str): Lowercased text with whitespace collapsed
+        cleaned (str): Output of ``TextProcessor.clean_text``
+        tokens (list): Tokens of ``cleaned``
+        words (list): Tokens of at least two characters that are not punctuation
+    """
+
+    def __init__(self, text, lower, cleaned, tokens):
+        self.text = text
+        self.lower = lower
+        self.cleaned = cleaned
+        self.tokens = tokens
+        self.words = [token for token in tokens if len(token) >= 2 and token not in string.punctuation]
+        self._ngrams = {}
+        self._similarity_tokens = None
+
+    def ngrams(self, n):
+        """
+        Consecutive runs of ``n`` words
+
+        Args:
+            n (int): n-gram size
+
+        Returns:
+            list: Tuples of ``n`` words
+        """
+        if n not in self._ngrams:
+            words = self.words
+            self._ngrams[n] = [tuple(words[i:i + n]) for i in range(len(words) - n + 1)]
+        return self._ngrams[n]
+
+    @property
+    def similarity_tokens(self):
+        """Tokens with all punctuation removed, split on the remaining word characters"""
+        if self._similarity_tokens is None:
+            self._similarity_tokens = [
+                piece for token in self.tokens for piece in re.findall(r'\w+', token)
+            ]
+        return self._similarity_tokens
 
-# Initialize NLTK data
-download_nltk_data()
 
 class TextProcessor:
-    def __init__(self):
-        self.stemmer = PorterStemmer()
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, skill_matcher=None):
+        self._stemmer = None
+        self.skill_matcher = skill_matcher or get_skill_matcher()
+        self.stop_words = set(get_stop_words())
         
         # Add common resume/job description stop words
         additional_stop_words = {
@@ -47,26 +134,64 @@ class TextProcessor:
             'excellent', 'good', 'knowledge', 'working', 'including'
         }
         self.stop_words.update(additional_stop_words)
+
+    @property
+    def stemmer(self):
+        """Porter stemmer, created on first use"""
+        if self._stemmer is None:
+            from nltk.stem import PorterStemmer
+            self._stemmer = PorterStemmer()
+        return self._stemmer
+
+    def tokenize(self, text):
+        """
+        Normalize and tokenize a text once for all analysis stages
+        
+        Args:
+            text (str or TokenizedDocument): Raw text, or an already
+                tokenized document which is returned unchanged
+            
+        Returns:
+            TokenizedDocument: Shared tokenized document
+        """
+        if isinstance(text, TokenizedDocument):
+            return text
+
+        text = text or ""
+        lower = re.sub(r'\s+', ' ', text.lower())
+        cleaned = self._clean_lowered(lower)
+
+        # Tokenize with fallback
+        try:
+            tokens = get_word_tokenizer()(cleaned) if cleaned else []
+        except Exception as e:
+            print(f"NLTK tokenization failed: {e}, using simple split")
+            # Fallback to simple split if nltk fails
+            tokens = cleaned.split()
+
+        return TokenizedDocument(text, lower.strip(), cleaned, tokens)
     
     def clean_text(self, text):
         """
         Clean and normalize text
         
         Args:
-            text (str): Raw text to clean
+            text (str or TokenizedDocument): Raw text to clean
             
         Returns:
             str: Cleaned text
         """
+        if isinstance(text, TokenizedDocument):
+            return text.cleaned
+
         if not text:
             return ""
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace and newlines
-        text = re.sub(r'\s+', ' ', text)
-        
+        # Convert to lowercase and remove extra whitespace and newlines
+        return self._clean_lowered(re.sub(r'\s+', ' ', text.lower()))
+
+    def _clean_lowered(self, text):
+        """Clean text that is already lowercased with whitespace collapsed"""
         # Remove special characters but keep letters, numbers, and some punctuation
         text = re.sub(r'[^\w\s\-\.]', ' ', text)
         
@@ -80,7 +205,7 @@ class TextProcessor:
         Extract meaningful keywords from text with enhanced keyword detection
         
         Args:
-            text (str): Text to extract keywords from
+            text (str or TokenizedDocument): Text to extract keywords from
             min_length (int): Minimum keyword length
             max_length (int): Maximum keyword length
             
@@ -90,17 +215,13 @@ class TextProcessor:
         if not text:
             return []
         
-        # Clean text but preserve important technical terms
-        cleaned_text = self.clean_text(text)
-        
-        # Tokenize
-        tokens = word_tokenize(cleaned_text)
+        document = self.tokenize(text)
         
         # Enhanced keyword extraction
         keywords = []
         
         # Single word keywords
-        for token in tokens:
+        for token in document.tokens:
             if (len(token) >= min_length and 
                 len(token) <= max_length and 
                 token not in self.stop_words and
@@ -108,20 +229,12 @@ class TextProcessor:
                 token not in string.punctuation):
                 keywords.append(token)
         
-        # Extract multi-word phrases (bigrams and trigrams)
-        words = [token for token in tokens if len(token) >= 2 and token not in string.punctuation]
-        
-        # Bigrams
-        for i in range(len(words) - 1):
-            bigram = f"{words[i]} {words[i+1]}"
-            if len(bigram) <= max_length and not any(word in self.stop_words for word in words[i:i+2]):
-                keywords.append(bigram)
-        
-        # Trigrams for technical terms
-        for i in range(len(words) - 2):
-            trigram = f"{words[i]} {words[i+1]} {words[i+2]}"
-            if len(trigram) <= max_length and not any(word in self.stop_words for word in words[i:i+3]):
-                keywords.append(trigram)
+        # Extract multi-word phrases (bigrams and trigrams for technical terms)
+        for n in (2, 3):
+            for words in document.ngrams(n):
+                phrase = ' '.join(words)
+                if len(phrase) <= max_length and not any(word in self.stop_words for word in words):
+                    keywords.append(phrase)
         
         # Remove duplicates while preserving order
         unique_keywords = []
@@ -138,85 +251,46 @@ class TextProcessor:
         Extract technical skills and competencies from text
         
         Args:
-            text (str): Text to extract skills from
+            text (str or TokenizedDocument): Text to extract skills from
             
         Returns:
-            list: List of identified skills
+            list: List of identified skills, in order of first occurrence
         """
-        # Common technical skills and tools
-        technical_skills = {
-            'python', 'java', 'javascript', 'html', 'css', 'sql', 'r', 'c++', 'c#',
-            'react', 'angular', 'vue', 'node', 'django', 'flask', 'spring',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'git', 'jenkins',
-            'tableau', 'powerbi', 'excel', 'photoshop', 'illustrator',
-            'machine learning', 'data science', 'artificial intelligence',
-            'project management', 'agile', 'scrum', 'devops', 'ci/cd'
-        }
-        
-        # Soft skills
-        soft_skills = {
-            'leadership', 'communication', 'teamwork', 'problem solving',
-            'analytical', 'creative', 'detail oriented', 'time management',
-            'adaptability', 'collaboration', 'customer service', 'presentations'
-        }
-        
-        all_skills = technical_skills.union(soft_skills)
-        
-        # Clean text for matching
-        cleaned_text = self.clean_text(text)
-        
-        # Find matching skills
-        found_skills = []
-        for skill in all_skills:
-            if skill in cleaned_text:
-                found_skills.append(skill)
-        
-        return found_skills
+        if not text:
+            return []
+
+        if isinstance(text, TokenizedDocument):
+            return self.skill_matcher.find_all_normalized(text.lower)
+        return self.skill_matcher.find_all(text)
     
     def preprocess_for_similarity(self, text):
         """
         Preprocess text for similarity calculation
         
         Args:
-            text (str): Text to preprocess
+            text (str or TokenizedDocument): Text to preprocess
             
         Returns:
             str: Preprocessed text
         """
-        if not text or not text.strip():
+        if not text or not (text.text if isinstance(text, TokenizedDocument) else text).strip():
             return ""
-            
-        # Clean text but preserve more content for similarity
-        text = text.lower()
-        text = re.sub(r'[^\w\s]', ' ', text)  # Remove punctuation but keep spaces
-        text = re.sub(r'\s+', ' ', text).strip()  # Normalize whitespace
-        
-        # Tokenize with fallback
-        try:
-            tokens = word_tokenize(text)
-        except Exception as e:
-            print(f"NLTK tokenization failed: {e}, using simple split")
-            # Fallback to simple split if nltk fails
-            tokens = text.split()
+
+        document = self.tokenize(text)
         
         processed_tokens = []
         
         # Keep more words for better similarity calculation
         basic_stop_words = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being'}
         
-        for token in tokens:
+        for token in document.similarity_tokens:
             # Keep meaningful tokens for similarity
             if (len(token) > 1 and 
                 not token.isdigit() and
                 token not in basic_stop_words):
                 processed_tokens.append(token)
         
-        result = ' '.join(processed_tokens)
-        
-        # Debug output
-        print(f"Text preprocessing - Input length: {len(text)}, Output length: {len(result)}, Tokens: {len(processed_tokens)}")
-        
-        return result
+        return ' '.join(processed_tokens)
 
 def preprocess_text(text):
     """
@@ -228,5 +302,9 @@ def preprocess_text(text):
     Returns:
         str: Preprocessed text
     """
-    processor = TextProcessor()
-    return processor.preprocess_for_similarity(text)
+    return get_text_processor().preprocess_for_similarity(text)
+
+@lru_cache(maxsize=None)
+def get_text_processor():
+    """Return a shared TextProcessor instance"""
+    return TextProcessor()